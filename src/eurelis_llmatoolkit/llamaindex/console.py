@@ -8,6 +8,7 @@ from eurelis_llmatoolkit.llamaindex.search_wrapper import SearchWrapper
 import os
 import logging
 import logging.config
+from typing import Optional
 from dotenv import load_dotenv, find_dotenv
 
 logger = logging.getLogger(__name__)
@@ -114,24 +115,68 @@ def dataset(ctx: click.Context, id: str):
     default=False,
     help="Enable deletion of unmatched documents.",
 )
+@click.option(
+    "--batch_size",
+    type=int,
+    default=None,
+    help="Stream documents and ingest them by batches of this size.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    default=False,
+    help="Resume an interrupted ingestion, skipping the documents already ingested.",
+)
+@click.option(
+    "--write_cache",
+    is_flag=True,
+    default=False,
+    help="Also write the documents read from the reader to the cache.",
+)
 @click.pass_context
-def dataset_ingest(ctx: click.Context, from_cache: bool, delete: bool):
+def dataset_ingest(
+    ctx: click.Context,
+    from_cache: bool,
+    delete: bool,
+    batch_size: Optional[int],
+    resume: bool,
+    write_cache: bool,
+):
     """Launch ingestion"""
     dataset_id = ctx.obj["dataset_id"]
 
     wrapper: IngestionWrapper = ctx.obj["wrapper"]
-    wrapper.run(dataset_id=dataset_id, use_cache=from_cache, delete=delete)
+    wrapper.run(
+        dataset_id=dataset_id,
+        use_cache=from_cache,
+        delete=delete,
+        batch_size=batch_size,
+        resume=resume,
+        write_cache=write_cache,
+    )
     click.echo("End of ingestion!")
 
 
 @dataset.command("cache")
+@click.option(
+    "--resume",
+    is_flag=True,
+    default=False,
+    help="Resume an interrupted cache generation, skipping the documents already cached.",
+)
+@click.option(
+    "--prune",
+    is_flag=True,
+    default=False,
+    help="Remove the cached documents that are no longer returned by the reader.",
+)
 @click.pass_context
-def dataset_cache(ctx: click.Context):
+def dataset_cache(ctx: click.Context, resume: bool, prune: bool):
     """Generate cache for the dataset"""
     dataset_id = ctx.obj["dataset_id"]
 
     wrapper: IngestionWrapper = ctx.obj["wrapper"]
-    wrapper.generate_cache(dataset_id)
+    wrapper.generate_cache(dataset_id, resume=resume, prune=prune)
     click.echo("End of cache generation!")
 
 
@@ -10,4 +10,18 @@ class CacheFactory:
 
             return FSCacheMarshaller(cache_config)
 
+        if provider == "ShardCache":
+            from eurelis_llmatoolkit.llamaindex.scraping_cache.cache_marshaller.shard_cache_marshaller import (
+                ShardCacheMarshaller,
+            )
+
+            return ShardCacheMarshaller(cache_config)
+
+        if provider == "SQLiteCache":
+            from eurelis_llmatoolkit.llamaindex.scraping_cache.cache_marshaller.sqlite_cache_marshaller import (
+                SQLiteCacheMarshaller,
+            )
+
+            return SQLiteCacheMarshaller(cache_config)
+
         raise ValueError(f"Cache provider {provider} is not supported.")
@@ -33,6 +33,11 @@ class ReaderFactory:
 
             return TXTFileReader(config, namespace)
 
+        if provider == "StreamingTXTFileReader":
+            from ..readers.streaming_txt_file_reader import StreamingTXTFileReader
+
+            return StreamingTXTFileReader(config, namespace)
+
         if provider == "PDFFileReader":
             from ..readers.pdf_file_reader import PDFFileReader
 
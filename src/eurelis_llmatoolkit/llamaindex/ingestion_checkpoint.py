@@ -0,0 +1,113 @@
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionCheckpoint:
+    """Progress of a cache generation or ingestion run, persisted after each batch.
+
+    The checkpoint records the doc_ids already written (to the cache or to the stores)
+    and the doc_ids that failed, so that an interrupted run can be resumed without
+    processing the completed documents again. It also records the sources (e.g. the
+    files) whose documents were all written, so that a reader producing several
+    documents per source can skip the whole source.
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+        self.completed: set[str] = set()
+        self.completed_sources: set[str] = set()
+        self.failed: set[str] = set()
+
+    @classmethod
+    def from_config(
+        cls, config: dict, dataset_id: str, operation: str
+    ) -> Optional["IngestionCheckpoint"]:
+        """Create the checkpoint of a dataset operation.
+
+        Checkpoints are stored in the checkpoint_dir directory of the configuration,
+        or in the base_dir of the scraping cache.
+
+        Args:
+            config (dict): The toolkit configuration.
+            dataset_id (str): The dataset ID.
+            operation (str): The checkpointed operation ("cache" or "ingest").
+
+        Returns:
+            Optional[IngestionCheckpoint]: The checkpoint, None if no directory is configured.
+        """
+        checkpoint_dir = config.get("checkpoint_dir") or config.get(
+            "scraping_cache", {}
+        ).get("base_dir")
+        if not checkpoint_dir:
+            return None
+        return cls(Path(checkpoint_dir) / f"{dataset_id}.{operation}.checkpoint.json")
+
+    def load(self) -> bool:
+        """Load the checkpoint from disk.
+
+        Returns:
+            bool: True if a checkpoint was found.
+        """
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except json.JSONDecodeError as e:
+            logger.warning(f"Invalid checkpoint file {self._path}, ignored: {e}")
+            return False
+
+        self.completed = set(data.get("completed", []))
+        self.completed_sources = set(data.get("completed_sources", []))
+        self.failed = set(data.get("failed", []))
+        return True
+
+    def get_skip_doc_ids(self) -> set[str]:
+        """Get the doc_ids and sources a resumed run can skip (failed ones are retried)."""
+        return (self.completed | self.completed_sources) - self.failed
+
+    def mark_completed(self, doc_ids: Iterable[str]):
+        doc_ids = set(doc_ids)
+        self.completed |= doc_ids
+        self.failed -= doc_ids
+
+    def mark_sources_completed(self, sources: Iterable[str]):
+        self.completed_sources |= set(sources)
+
+    def mark_failed(self, doc_ids: Iterable[str]):
+        doc_ids = set(doc_ids) - self.completed
+        self.failed |= doc_ids
+        self.completed_sources -= doc_ids
+
+    def save(self):
+        """Write the checkpoint atomically (temporary file then rename)."""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self._path.parent, prefix=f".{self._path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "completed": sorted(self.completed),
+                        "completed_sources": sorted(self.completed_sources),
+                        "failed": sorted(self.failed),
+                    },
+                    f,
+                    ensure_ascii=False,
+                )
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        logger.debug(f"Checkpoint saved to {self._path}")
+
+    def delete(self):
+        """Remove the checkpoint once the run is complete."""
+        self._path.unlink(missing_ok=True)
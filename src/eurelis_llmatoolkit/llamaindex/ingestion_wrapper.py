@@ -1,5 +1,7 @@
 import logging
-from typing import List, Optional
+import time
+from itertools import islice
+from typing import Iterator, List, Optional
 
 from llama_index.core import Document
 from llama_index.core.ingestion import IngestionPipeline
@@ -11,9 +13,16 @@ from eurelis_llmatoolkit.llamaindex.factories.transformation_factory import (
     TransformationFactory,
 )
 from eurelis_llmatoolkit.llamaindex.factories.callback_factory import CallbackFactory
+from eurelis_llmatoolkit.llamaindex.ingestion_checkpoint import IngestionCheckpoint
+from eurelis_llmatoolkit.llamaindex.readers.abstract_reader_adapter import (
+    LoadDataError,
+)
 
 logger = logging.getLogger(__name__)
 
+# Taille des lots lorsque la reprise est demandée sans batch_size
+DEFAULT_BATCH_SIZE = 100
+
 
 class IngestionWrapper(AbstractWrapper):
     def __init__(self, config: dict):
@@ -31,16 +40,26 @@ class IngestionWrapper(AbstractWrapper):
         dataset_id: Optional[str] = None,
         use_cache: bool = False,
         delete: bool = False,
+        batch_size: Optional[int] = None,
+        resume: bool = False,
+        write_cache: bool = False,
     ):
         logger.info(
             "Running ingestion with filtering dataset_id: %s, use_cache: %s",
             dataset_id,
             use_cache,
         )
-        self._process_datasets(dataset_id, use_cache, delete)
+        self._process_datasets(
+            dataset_id, use_cache, delete, batch_size, resume, write_cache
+        )
         logger.info("Ingestion completed!")
 
-    def generate_cache(self, dataset_id: Optional[str] = None):
+    def generate_cache(
+        self,
+        dataset_id: Optional[str] = None,
+        resume: bool = False,
+        prune: bool = False,
+    ):
         logger.info("Generating cache for dataset_id: %s", dataset_id)
         # Récupérer la configuration des datasets
         datasets = list(
@@ -60,19 +79,138 @@ class IngestionWrapper(AbstractWrapper):
                 continue
 
             # TODO : Ajouter la gestion des pages/documents en erreur
-            documents, _ = self._get_documents(dataset_config, use_cache=False)
+            if self._generate_dataset_cache(dataset_config, resume, prune):
+                logger.info(f"Cache generated for dataset ID: {dataset_id}!")
+
+    def _generate_dataset_cache(
+        self, dataset_config: dict, resume: bool = False, prune: bool = False
+    ) -> bool:
+        """Stream the documents of a dataset into the cache, batch by batch.
+
+        Each batch is written to the cache as soon as it is read, and the checkpoint is
+        updated so that an interrupted run can be resumed. Once the dataset is cached,
+        expired documents and documents beyond the cache size budget are removed.
+
+        Args:
+            dataset_config (dict): The configuration for the dataset.
+            resume (bool): Whether to skip the documents cached by an interrupted run.
+            prune (bool): Whether to also remove the cached documents that were not
+                returned by this crawl.
+
+        Returns:
+            bool: True if the whole dataset was cached.
+        """
+        dataset_id = dataset_config["id"]
+        checkpoint = self._get_checkpoint(dataset_id, "cache", resume)
+        documents, source = self._lazy_load_documents(
+            dataset_config,
+            use_cache=False,
+            skip_doc_ids=checkpoint.get_skip_doc_ids() if checkpoint else None,
+            operation="cache",
+        )
+        batch_size = dataset_config.get("batch_size") or DEFAULT_BATCH_SIZE
+        # A single cache instance keeps its state (e.g. content hashes) between batches
+        cache = CacheFactory.create_cache(self._config.get("scraping_cache", []))
+
+        write_time = 0.0
+        cached_docs = 0
+        crawled_doc_ids = set(checkpoint.completed) if checkpoint else set()
+        try:
+            for batch in self._iter_checkpointed_batches(
+                documents, batch_size, source, checkpoint
+            ):
+                write_time += self._generate_cache(dataset_id, batch, cache)
+                cached_docs += len(batch)
+                if prune:
+                    crawled_doc_ids.update(self._get_doc_ids_from_documents(batch))
+        except LoadDataError:
+            logger.critical(
+                f"Reading the dataset {dataset_id} encountered an error. Cache generation aborted."
+            )
+            return False
+
+        self._log_cache_throughput(dataset_id, cache, cached_docs, write_time)
 
-            # Générer le cache
-            self._generate_cache(dataset_id, documents)
-            logger.info(f"Cache generated for dataset ID: {dataset_id}!")
+        unchanged_docs = source.get_unchanged_docs()
+        keep_doc_ids = None
+        if prune:
+            # Documents skipped by an incremental reader or failed this time are kept
+            keep_doc_ids = crawled_doc_ids.union(
+                unchanged_docs, source.get_unsuccessful_docs()
+            )
+        self._prune_cache(dataset_id, cache, keep_doc_ids, unchanged_docs)
+
+        if checkpoint is not None:
+            checkpoint.delete()
+        return True
+
+    def _get_write_cache(self, dataset_id: str, use_cache: bool, write_cache: bool):
+        """Create the scraping cache that ingested documents are written to, if any."""
+        if not write_cache:
+            return None
+        if use_cache:
+            logger.warning(
+                f"Dataset {dataset_id} is ingested from the cache, write_cache is ignored."
+            )
+            return None
+        cache_config = self._config.get("scraping_cache", None)
+        if not cache_config:
+            logger.warning(
+                f"No scraping_cache is configured, dataset {dataset_id} will not be cached."
+            )
+            return None
+        return CacheFactory.create_cache(cache_config)
+
+    def _prune_cache(
+        self,
+        dataset_id: str,
+        cache,
+        keep_doc_ids: Optional[set],
+        unchanged_docs: Optional[List[str]] = None,
+    ):
+        """Remove expired and evicted documents, and those not in keep_doc_ids, from the cache.
+
+        The documents an incremental reader reported as unchanged were not rewritten:
+        they are touched first, so that the TTL does not expire documents still live.
+        """
+        if unchanged_docs and hasattr(cache, "touch"):
+            cache.touch(dataset_id, unchanged_docs)
+        if hasattr(cache, "prune"):
+            cache.prune(dataset_id, keep_doc_ids)
+        elif keep_doc_ids is not None:
+            logger.warning(
+                f"The {type(cache).__name__} cache of dataset {dataset_id} cannot be pruned"
+            )
+
+    def _log_cache_throughput(
+        self, dataset_id: str, cache, cached_docs: int, write_time: float
+    ):
+        """Log how many documents were cached, and how fast.
+
+        Args:
+            dataset_id (str): The dataset ID.
+            cache: The scraping cache the documents were written to.
+            cached_docs (int): Number of documents passed to the cache.
+            write_time (float): Time spent in the cache writes only, in seconds.
+        """
+        elapsed = max(write_time, 1e-6)
+        stats = cache.get_write_stats()
+        logger.info(
+            f"Cached {cached_docs} documents for dataset {dataset_id} in {write_time:.1f}s "
+            f"({cached_docs / elapsed:.1f} docs/s): {stats['written']} written, "
+            f"{stats['unchanged']} unchanged, {stats['bytes'] / 1024 / 1024:.1f} MB"
+        )
 
     def _load_documents_from_reader(
         self, dataset_config: dict
-    ) -> tuple[List[Document], List[str]]:
+    ) -> tuple[Optional[List[Document]], object]:
         """Load documents using the appropriate reader based on the dataset configuration.
 
+        The unsuccessful Docs (failed to be processed), unchanged Docs (skipped by an
+        incremental reader) and deleted Docs can be retrieved from the returned reader.
+
         Returns:
-            tuple: Tuple containing the list of documents and the list of unsuccessful Docs (failed to be processed).
+            tuple: Tuple containing the list of documents (None if reading failed) and the reader.
         """
         logger.debug(
             "Loading documents from reader for dataset_config: %s", dataset_config
@@ -81,23 +219,22 @@ class IngestionWrapper(AbstractWrapper):
             f"{self._config['project']}/{dataset_config['id']}",
             dataset_config["reader"],
         )
+        self._set_operation(reader_adapter, "ingest")
         documents = reader_adapter.load_data()
+        if documents is None:
+            return None, reader_adapter
 
         # Add project metadata
         documents = self._add_project_metadata(documents, self._config["project"])
-
-        # Get unsuccessful docs from the reader
-        unsuccessful_docs = reader_adapter.get_unsuccessful_docs()
-
-        return documents, unsuccessful_docs
+        return documents, reader_adapter
 
     def _load_documents_from_cache(
         self, dataset_config: dict
-    ) -> tuple[List[Document], List[str]]:
+    ) -> tuple[List[Document], object]:
         """Load documents from cache if the cache is available.
 
         Returns:
-            tuple: Tuple containing the list of documents and an empty list for unsuccessful Docs (failed to be processed).
+            tuple: Tuple containing the list of documents and the cache.
         """
         logger.debug(
             "Loading documents from cache for dataset_config: %s", dataset_config
@@ -108,7 +245,71 @@ class IngestionWrapper(AbstractWrapper):
 
         # Add project metadata
         documents = self._add_project_metadata(documents, self._config["project"])
-        return documents, []
+        return documents, cache
+
+    def _lazy_load_documents(
+        self,
+        dataset_config: dict,
+        use_cache: bool,
+        skip_doc_ids: Optional[set] = None,
+        operation: str = "ingest",
+    ) -> tuple[Iterator[Document], object]:
+        """Get a generator of documents from either cache or reader.
+
+        The unsuccessful and unchanged Docs can be retrieved from the returned source
+        once the generator is exhausted.
+
+        Args:
+            dataset_config (dict): The configuration for the dataset.
+            use_cache (bool): Whether to use cached data or read from source.
+            skip_doc_ids (Optional[set]): doc_ids to leave out, e.g. documents already
+                processed by an interrupted run.
+            operation (str): The operation the documents are read for ("cache" or
+                "ingest"); incremental readers keep a separate state for each.
+
+        Returns:
+            tuple: Tuple containing the generator of documents and the reader or cache producing them.
+        """
+        logger.debug(
+            "Lazy loading documents for dataset_config: %s, use_cache: %s",
+            dataset_config,
+            use_cache,
+        )
+        if use_cache:
+            cache_config = self._config.get("scraping_cache", [])
+            source = CacheFactory.create_cache(cache_config)
+            documents = source.lazy_load_data(dataset_config["id"])
+        else:
+            source = ReaderFactory.create_reader(
+                f"{self._config['project']}/{dataset_config['id']}",
+                dataset_config["reader"],
+            )
+            self._set_operation(source, operation)
+            documents = source.lazy_load_data()
+
+        if skip_doc_ids:
+            # Lets the reader avoid fetching them; the others are filtered below
+            source.set_skip_doc_ids(skip_doc_ids)
+            documents = (doc for doc in documents if doc.doc_id not in skip_doc_ids)
+
+        project = self._config["project"]
+        return (
+            self._add_project_metadata([doc], project)[0] for doc in documents
+        ), source
+
+    def _set_operation(self, reader, operation: str):
+        """Tell an incremental reader which operation ("cache" or "ingest") it reads for."""
+        if hasattr(reader, "set_operation"):
+            reader.set_operation(operation)
+
+    def _commit_docs(self, source, doc_ids: List[str]):
+        """Confirm to the source that documents were cached or ingested.
+
+        Incremental readers only record a document as unchanged once it is confirmed,
+        so that a failed write is retried by the next run.
+        """
+        if hasattr(source, "commit_docs"):
+            source.commit_docs(doc_ids)
 
     def _add_project_metadata(
         self, documents: List[Document], project: str
@@ -122,7 +323,7 @@ class IngestionWrapper(AbstractWrapper):
         Returns:
             List[Document]: List of documents with added project metadata.
         """
-        logger.info("Adding project metadata to documents for project: %s", project)
+        logger.debug("Adding project metadata to documents for project: %s", project)
         for doc in documents:
             if not hasattr(doc, "metadata"):
                 doc.metadata = {}
@@ -134,6 +335,9 @@ class IngestionWrapper(AbstractWrapper):
         dataset_id: Optional[str] = None,
         use_cache: bool = False,
         delete: bool = False,
+        batch_size: Optional[int] = None,
+        resume: bool = False,
+        write_cache: bool = False,
     ):
         """Process all datasets or a specific dataset based on the dataset ID."""
         logger.info(
@@ -142,17 +346,98 @@ class IngestionWrapper(AbstractWrapper):
             use_cache,
         )
         for dataset_config in self._filter_datasets(dataset_id):
-            self._ingest_dataset(dataset_config, use_cache, delete)
+            self._ingest_dataset(
+                dataset_config, use_cache, delete, batch_size, resume, write_cache
+            )
 
-    def _generate_cache(self, dataset_name: str, documents: list):
+    def _get_checkpoint(
+        self, dataset_id: str, operation: str, resume: bool
+    ) -> Optional[IngestionCheckpoint]:
+        """Get the checkpoint of a dataset operation, loaded from disk when resuming.
+
+        Args:
+            dataset_id (str): The dataset ID.
+            operation (str): The checkpointed operation ("cache" or "ingest").
+            resume (bool): Whether to load the checkpoint of an interrupted run.
+
+        Returns:
+            Optional[IngestionCheckpoint]: The checkpoint, None if checkpoints are not configured.
+        """
+        checkpoint = IngestionCheckpoint.from_config(
+            self._config, dataset_id, operation
+        )
+        if checkpoint is None:
+            if resume:
+                logger.warning(
+                    "Neither checkpoint_dir nor a scraping_cache base_dir is configured: "
+                    f"dataset {dataset_id} cannot be resumed."
+                )
+            return None
+
+        if resume and checkpoint.load():
+            logger.info(
+                f"Resuming {operation} of dataset {dataset_id}: "
+                f"{len(checkpoint.completed)} documents already done, "
+                f"{len(checkpoint.failed)} failed documents will be retried."
+            )
+        return checkpoint
+
+    def _iter_checkpointed_batches(
+        self,
+        documents: Iterator[Document],
+        batch_size: int,
+        source,
+        checkpoint: Optional[IngestionCheckpoint],
+    ) -> Iterator[List[Document]]:
+        """Split documents into batches, committing each batch once it is processed.
+
+        The source is told that the batch documents were processed, then the checkpoint
+        is saved. The documents of a source (e.g. the parts of a file) are contiguous, so
+        every source of the batch but the last one is recorded as completed, unless the
+        source reported it as unsuccessful.
+
+        Args:
+            documents (Iterator[Document]): Generator of documents.
+            batch_size (int): Maximum number of documents per batch.
+            source: The reader or cache producing the documents.
+            checkpoint (Optional[IngestionCheckpoint]): The checkpoint to update.
+
+        Returns:
+            Iterator[List[Document]]: Batches of documents.
+        """
+        # Source of the last document, which may continue in the next batch
+        open_source = None
+        while batch := list(islice(documents, batch_size)):
+            yield batch
+
+            # The caller has processed the batch when the generator resumes
+            doc_ids = self._get_doc_ids_from_documents(batch)
+            self._commit_docs(source, doc_ids)
+            if checkpoint is not None:
+                checkpoint.mark_completed(doc_ids)
+                unsuccessful_docs = set(source.get_unsuccessful_docs())
+                checkpoint.mark_failed(unsuccessful_docs)
+                # A source that failed midway is not completed: it is read again
+                sources = [doc.metadata.get("source") for doc in batch]
+                checkpoint.mark_sources_completed(
+                    {open_source, *sources} - {sources[-1], None} - unsuccessful_docs
+                )
+                open_source = sources[-1]
+                checkpoint.save()
+
+    def _generate_cache(self, dataset_name: str, documents: list, cache=None) -> float:
+        """Write documents to the scraping cache and return the write time in seconds."""
         logger.debug("Generating cache for dataset_name: %s", dataset_name)
-        cache_config = self._config.get("scraping_cache", [])
-        cache = CacheFactory.create_cache(cache_config)
+        if cache is None:
+            cache_config = self._config.get("scraping_cache", [])
+            cache = CacheFactory.create_cache(cache_config)
+        start = time.monotonic()
         cache.to_cache(dataset_name, documents)
+        return time.monotonic() - start
 
     def _get_documents(
         self, dataset_config: dict, use_cache: bool
-    ) -> tuple[List[Document], List[str]]:
+    ) -> tuple[Optional[List[Document]], object]:
         """
         Get documents from either cache or reader based on the configuration.
 
@@ -161,7 +446,8 @@ class IngestionWrapper(AbstractWrapper):
             use_cache (bool): Whether to use cached data or read from source.
 
         Returns:
-            tuple: Tuple containing the list of retrieved documents and the list of unsuccessful Docs.
+            tuple: Tuple containing the list of retrieved documents (None if reading
+            failed) and the reader or cache they were read from.
         """
         logger.debug(
             "Getting documents for dataset_config: %s, use_cache: %s",
@@ -215,45 +501,112 @@ class IngestionWrapper(AbstractWrapper):
 
         return transformations
 
-    def _get_doc_ids_from_document_store(self, id_dataset=None) -> List[str]:
-        """Retrieve all doc_ids from the database."""
+    def _get_documents_from_document_store(self, id_dataset=None) -> dict:
+        """Retrieve the documents (doc_id -> document) from the database.
+
+        Returns an empty dict when no document store is configured.
+        """
         document_store = self._get_document_store()
+        if document_store is None:
+            return {}
         documents: dict = document_store.docs
 
         if not documents:
             logger.warning("No documents found in the database.")
-            return []
+            return {}
 
         # Filtrage basé sur id_dataset
         if id_dataset is not None:
             namespace_filter = f"{self._config['project']}/{id_dataset}"
-            doc_ids = {
-                doc.id_
+            return {
+                doc.id_: doc
                 for doc in documents.values()
                 if doc.metadata.get("namespace") == namespace_filter
             }
-        else:
-            # Si id_dataset est None, on ne filtre pas par namespace
-            doc_ids = {doc.id_ for doc in documents.values()}
+        # Si id_dataset est None, on ne filtre pas par namespace
+        return {doc.id_: doc for doc in documents.values()}
 
-        return list(doc_ids)
+    def _get_doc_ids_from_document_store(self, id_dataset=None) -> List[str]:
+        """Retrieve all doc_ids from the database."""
+        return list(self._get_documents_from_document_store(id_dataset))
 
     def _get_doc_ids_from_documents(self, documents: List[Document]) -> List[str]:
         """Create a list of doc_ids from the documents."""
         doc_ids = [str(doc.id_) for doc in documents]
         return doc_ids
 
+    def _get_document_hashes(self, stored_documents: dict) -> Optional[dict]:
+        """Compute the hashes of the documents loaded from the docstore.
+
+        The pipeline stores each document with the hash it compares, so the hash of the
+        stored document is the stored hash. get_all_document_hashes() cannot be used:
+        it maps each hash to a single doc_id, so documents with equal content collapse.
+
+        Args:
+            stored_documents (dict): doc_id -> document, as loaded from the docstore.
+
+        Returns:
+            Optional[dict]: doc_id -> hash, None if no document store is configured.
+        """
+        if self._get_document_store() is None:
+            return None
+        return {doc_id: doc.hash for doc_id, doc in stored_documents.items()}
+
+    def _filter_unchanged_documents(
+        self,
+        documents: List[Document],
+        stored_hashes: Optional[dict],
+        counts: Optional[dict] = None,
+    ) -> List[Document]:
+        """Drop the documents whose hash matches the one stored in the docstore.
+
+        Args:
+            documents (List[Document]): The documents to ingest.
+            stored_hashes (Optional[dict]): Stored hashes (doc_id -> hash), None to keep
+                every document.
+            counts (Optional[dict]): Skipped/changed/new counters to update.
+
+        Returns:
+            List[Document]: The new and changed documents.
+        """
+        if stored_hashes is None:
+            return documents
+
+        to_ingest = []
+        for document in documents:
+            stored_hash = stored_hashes.get(document.doc_id)
+            if stored_hash == document.hash:
+                status = "skipped"
+            else:
+                status = "new" if stored_hash is None else "changed"
+                to_ingest.append(document)
+            if counts is not None:
+                counts[status] += 1
+        return to_ingest
+
     def _remove_unmatched_documents(
         self,
         doc_ids_doc_store: List[str],
         doc_ids_scraping: List[str],
         unsuccessful_docs: List[str],
+        unchanged_docs: Optional[List[str]] = None,
+        deleted_docs: Optional[List[str]] = None,
     ):
-        """Remove documents from the database that do not match any of the provided doc_ids."""
+        """Remove documents from the database that do not match any of the provided doc_ids.
+
+        Unsuccessful and unchanged documents are kept. When the reader tracks deletions
+        (deleted_docs is not None), only the documents it reports as deleted are removed.
+        """
         logger.debug(f"Unsuccessful documents: {unsuccessful_docs}")
-        doc_ids_to_delete = (
-            set(doc_ids_doc_store) - set(doc_ids_scraping) - set(unsuccessful_docs)
-        )
+        if deleted_docs is not None:
+            doc_ids_to_delete = set(deleted_docs) & set(doc_ids_doc_store)
+        else:
+            doc_ids_to_delete = (
+                set(doc_ids_doc_store)
+                - set(doc_ids_scraping)
+                - set(unsuccessful_docs)
+                - set(unchanged_docs or [])
+            )
         document_store = self._get_document_store()
         vector_store = self._get_vector_store()
 
@@ -266,29 +619,109 @@ class IngestionWrapper(AbstractWrapper):
         else:
             logger.info("No URLs to delete.")
 
+    def _run_pipeline_in_batches(
+        self,
+        pipeline: IngestionPipeline,
+        documents: Iterator[Document],
+        batch_size: int,
+        source=None,
+        checkpoint: Optional[IngestionCheckpoint] = None,
+        cache=None,
+        dataset_id: Optional[str] = None,
+        stored_hashes: Optional[dict] = None,
+        counts: Optional[dict] = None,
+        cache_write: Optional[dict] = None,
+    ) -> List[str]:
+        """Run the ingestion pipeline on bounded batches of documents.
+
+        Args:
+            pipeline (IngestionPipeline): The ingestion pipeline.
+            documents (Iterator[Document]): Generator of documents to ingest.
+            batch_size (int): Maximum number of documents held in memory at once.
+            source: The reader or cache producing the documents (required with a checkpoint).
+            checkpoint (Optional[IngestionCheckpoint]): Checkpoint updated after each batch.
+            cache: If set, each batch is also written to this scraping cache.
+            dataset_id (Optional[str]): The dataset ID (required with a cache).
+            stored_hashes (Optional[dict]): Hashes stored in the docstore (doc_id -> hash),
+                used to drop unchanged documents before the transformations.
+            counts (Optional[dict]): Skipped/changed/new counters, updated for each batch.
+            cache_write (Optional[dict]): Time spent writing to the cache ("seconds"),
+                updated for each batch.
+
+        Returns:
+            List[str]: doc_ids of all the ingested documents, unchanged ones included.
+        """
+        doc_ids = []
+        for batch in self._iter_checkpointed_batches(
+            documents, batch_size, source, checkpoint
+        ):
+            if cache is not None:
+                write_time = self._generate_cache(dataset_id, batch, cache)
+                if cache_write is not None:
+                    cache_write["seconds"] += write_time
+            to_ingest = self._filter_unchanged_documents(batch, stored_hashes, counts)
+            if to_ingest:
+                pipeline.run(documents=to_ingest, show_progress=True)
+            doc_ids.extend(self._get_doc_ids_from_documents(batch))
+            logger.info(
+                f"Ingested a batch of {len(batch)} documents ({len(doc_ids)} so far)."
+            )
+        return doc_ids
+
     def _ingest_dataset(
-        self, dataset_config: dict, use_cache: bool = False, delete: bool = False
+        self,
+        dataset_config: dict,
+        use_cache: bool = False,
+        delete: bool = False,
+        batch_size: Optional[int] = None,
+        resume: bool = False,
+        write_cache: bool = False,
     ):
         """
         Ingest the dataset using the provided configuration.
 
         Args:
             dataset_config (dict): Configuration for the dataset.
+            use_cache (bool): Whether to use cached data or read from source.
+            delete (bool): Whether to delete the documents that no longer exist.
+            batch_size (Optional[int]): If set, documents are streamed from the reader and
+                ingested by batches of this size instead of being loaded all at once.
+                A checkpoint is then saved after each batch.
+            resume (bool): Whether to skip the documents ingested by an interrupted run.
+            write_cache (bool): Whether to also write the documents read from the reader
+                to the scraping cache, so that a single crawl populates both. With delete,
+                the documents that no longer exist are also removed from the cache.
         """
         logger.info(
             f"Ingesting dataset {dataset_config['id']} with use_cache: %s", use_cache
         )
+        cache = self._get_write_cache(dataset_config["id"], use_cache, write_cache)
+        # Only the cache writes are timed, not the reader nor the pipeline
+        cache_write = {"seconds": 0.0}
+        batch_size = batch_size or dataset_config.get("batch_size")
+        if resume and not batch_size:
+            batch_size = DEFAULT_BATCH_SIZE
+
         #
         # READER / CACHE
         #
         # Récupérer les documents à partir du cache ou via le reader
-        documents, unsuccessful_docs = self._get_documents(dataset_config, use_cache)
-        if documents is None:
-            logger.critical(
-                f"Reading the dataset {dataset_config['id']} encountered an error. Ingestion aborted."
+        checkpoint = None
+        if batch_size:
+            checkpoint = self._get_checkpoint(dataset_config["id"], "ingest", resume)
+            documents, source = self._lazy_load_documents(
+                dataset_config,
+                use_cache,
+                skip_doc_ids=checkpoint.get_skip_doc_ids() if checkpoint else None,
             )
-            return
-        logger.info(f"Retrieved {len(documents)} documents for ingestion.")
+        else:
+            documents, source = self._get_documents(dataset_config, use_cache)
+            if documents is None:
+                logger.critical(
+                    f"Reading the dataset {dataset_config['id']} encountered an error. Ingestion aborted."
+                )
+                return
+            logger.info(f"Retrieved {len(documents)} documents for ingestion.")
 
         #
         # ACRONYMS & NODE PARSER & EMBEDDINGS
@@ -309,12 +742,13 @@ class IngestionWrapper(AbstractWrapper):
         document_store = self._get_document_store()
 
         # Récupérer les doc_ids en base => doc_ids_doc_store
-        doc_ids_doc_store = self._get_doc_ids_from_document_store(
+        stored_documents = self._get_documents_from_document_store(
             id_dataset=dataset_config["id"]
         )
-
-        # Faire une liste des doc_ids des documents => doc_ids_scraping
-        doc_ids_scraping = self._get_doc_ids_from_documents(documents)
+        doc_ids_doc_store = list(stored_documents)
+        # Hashes en base, pour écarter les documents inchangés avant les transformations
+        stored_hashes = self._get_document_hashes(stored_documents)
+        counts = {"skipped": 0, "changed": 0, "new": 0}
 
         #
         # INGESTION PIPELINE
@@ -325,15 +759,80 @@ class IngestionWrapper(AbstractWrapper):
             vector_store=vector_store,
             docstore=document_store,
         )
-        # TODO: définir le show_progress via une variable d'environnement
-        pipeline.run(documents=documents, show_progress=True)
-        logger.info(f"Ingested {len(documents)} documents into the pipeline.")
+        if batch_size:
+            try:
+                doc_ids_scraping = self._run_pipeline_in_batches(
+                    pipeline,
+                    documents,
+                    batch_size,
+                    source,
+                    checkpoint,
+                    cache,
+                    dataset_config["id"],
+                    stored_hashes,
+                    counts,
+                    cache_write,
+                )
+            except LoadDataError:
+                logger.critical(
+                    f"Reading the dataset {dataset_config['id']} encountered an error. Ingestion aborted."
+                )
+                return
+            ingested_docs = len(doc_ids_scraping)
+            if checkpoint is not None:
+                # Les documents ingérés avant la reprise ne doivent pas être supprimés
+                doc_ids_scraping = list(checkpoint.completed | set(doc_ids_scraping))
+                checkpoint.delete()
+        else:
+            # Faire une liste des doc_ids des documents => doc_ids_scraping
+            doc_ids_scraping = self._get_doc_ids_from_documents(documents)
+            ingested_docs = len(doc_ids_scraping)
+
+            if cache is not None:
+                cache_write["seconds"] += self._generate_cache(
+                    dataset_config["id"], documents, cache
+                )
+            documents = self._filter_unchanged_documents(
+                documents, stored_hashes, counts
+            )
+            # TODO: définir le show_progress via une variable d'environnement
+            if documents:
+                pipeline.run(documents=documents, show_progress=True)
+            self._commit_docs(source, doc_ids_scraping)
+
+        unsuccessful_docs = source.get_unsuccessful_docs()
+        unchanged_docs = source.get_unchanged_docs()
+        deleted_docs = source.get_deleted_docs()
+        logger.info(f"Ingested {len(doc_ids_scraping)} documents into the pipeline.")
+        if stored_hashes is not None:
+            logger.info(
+                f"{counts['skipped']} unchanged documents skipped, "
+                f"{counts['changed']} changed and {counts['new']} new documents ingested."
+            )
+        if cache is not None:
+            self._log_cache_throughput(
+                dataset_config["id"], cache, ingested_docs, cache_write["seconds"]
+            )
+            keep_doc_ids = None
+            if delete:
+                # The cache follows the crawl: documents deleted from the stores are
+                # removed from it too, so that --from_cache does not ingest them again
+                keep_doc_ids = set(doc_ids_scraping).union(
+                    unsuccessful_docs, unchanged_docs
+                )
+            self._prune_cache(dataset_config["id"], cache, keep_doc_ids, unchanged_docs)
+        if unchanged_docs:
+            logger.info(f"{len(unchanged_docs)} unchanged documents will be kept.")
 
         # Supprimer les documents du document_store qui ne sont pas dans doc_ids_scraping
         if delete:
             logger.info("Deleting old documents...")
             self._remove_unmatched_documents(
-                doc_ids_doc_store, doc_ids_scraping, unsuccessful_docs
+                doc_ids_doc_store,
+                doc_ids_scraping,
+                unsuccessful_docs,
+                unchanged_docs,
+                deleted_docs,
             )
         else:
             logger.info(
@@ -12,6 +12,9 @@ from eurelis_llmatoolkit.llamaindex.readers.community_sitemap_reader import (
     CommunitySitemapReader,
 )
 from eurelis_llmatoolkit.llamaindex.readers.pdf_file_reader import PDFFileReader
+from eurelis_llmatoolkit.llamaindex.readers.streaming_txt_file_reader import (
+    StreamingTXTFileReader,
+)
 from eurelis_llmatoolkit.llamaindex.readers.txt_file_reader import TXTFileReader
 
 __all__ = [
@@ -19,6 +22,7 @@ __all__ = [
     "AdvancedSitemapReader",
     "AbstractReaderAdapter",
     "TXTFileReader",
+    "StreamingTXTFileReader",
     "PDFFileReader",
     "CommunitySimpleWebPageReader",
     "CommunitySitemapReader",
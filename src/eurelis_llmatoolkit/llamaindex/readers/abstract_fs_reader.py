@@ -1,14 +1,60 @@
+import inspect
+import logging
+import multiprocessing
+import os
 from abc import abstractmethod
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Generator
+from typing import Any, Generator, Iterable, Iterator, Optional, Tuple, Union
 
 from llama_index.core import Document
 from llama_index.core.readers.base import BaseReader
 
+from eurelis_llmatoolkit.llamaindex.readers.abstract_reader_adapter import (
+    get_operation_path,
+)
+from eurelis_llmatoolkit.llamaindex.readers.fs_manifest import FSManifest
+from eurelis_llmatoolkit.llamaindex.readers.fs_walker import FSWalker
+
+logger = logging.getLogger(__name__)
+
+WORKER_TYPES = ("thread", "process")
+
+_file_worker_reader: Optional["AbstractFSReader"] = None
+
+
+def _init_file_worker(reader_class: type, config: dict, namespace: str):
+    """Crée le reader utilisé par un processus de traitement des fichiers."""
+    global _file_worker_reader
+    init_params = inspect.signature(reader_class.__init__).parameters
+    if "namespace" in init_params:
+        _file_worker_reader = reader_class(config, namespace)
+    else:
+        _file_worker_reader = reader_class(config)
+
+
+def _process_file_in_worker(
+    path: Path, stat: Optional[os.stat_result]
+) -> Tuple[list[Document], list[str]]:
+    return _file_worker_reader._process_file_list(path, stat)
+
 
 class AbstractFSReader(BaseReader):
-    """Classe abstraite pour les readers de fichiers sur le système de fichiers."""
+    """Classe abstraite pour les readers de fichiers sur le système de fichiers.
+
+    Avec l'option workers, les fichiers sont traités en parallèle dans un pool de
+    threads ou de processus (worker_type, default_worker_type par défaut) ; les
+    documents sont renvoyés dans l'ordre des fichiers.
+    """
+
+    # Pool utilisé par défaut : "thread" pour les readers limités par les E/S,
+    # "process" pour les readers limités par le CPU
+    default_worker_type = "thread"
+    # Options à retirer de la configuration des readers créés dans les processus
+    worker_excluded_options = ("manifest_path",)
 
     def __init__(self, config: dict, namespace: str = None):
         self._namespace = namespace
@@ -17,32 +63,71 @@ class AbstractFSReader(BaseReader):
         self._unsuccessful_docs: list[str] = (
             []
         )  # Liste des docs non récupérés(ex:pages en timeout ou fichiers non trouvés)
+        self._unchanged_docs: list[str] = (
+            []
+        )  # Liste des docs inchangés depuis le dernier chargement (non renvoyés)
+        self._skip_doc_ids: set[str] = (
+            set()
+        )  # Docs déjà traités lors d'un chargement interrompu (reprise)
+        self._file_stats: dict[str, os.stat_result] = (
+            {}
+        )  # stat() obtenus lors du parcours, réutilisés pour les métadonnées
+        self._deleted_docs: Optional[list[str]] = (
+            None  # Fichiers supprimés depuis le dernier chargement (mode incrémental)
+        )
+        self._workers = config.get("workers", 0)
+        self._worker_type = config.get("worker_type", self.default_worker_type)
+        if self._worker_type not in WORKER_TYPES:
+            raise ValueError(
+                f"Invalid worker_type {self._worker_type}, expected one of {WORKER_TYPES}"
+            )
+        self._operation: Optional[str] = None
+        self._manifest: Optional[FSManifest] = self._open_manifest()
+
+    def _open_manifest(self) -> Optional[FSManifest]:
+        """Ouvre le manifeste propre à l'opération en cours (None sans manifest_path)."""
+        manifest_path = self._config.get("manifest_path", None)
+        if not manifest_path:
+            return None
+        return FSManifest(get_operation_path(manifest_path, self._operation))
+
+    def _get_files(self, path: str, glob: Union[str, list[str]]) -> Generator:
+        """Récupère les fichiers à partir du path et du ou des motifs glob.
 
-    def _get_files(self, path: str, glob: str) -> Generator:
-        """Récupère les fichiers à partir du path et du glob.
+        Le parcours (os.scandir) applique aussi les options exclude et walk_workers ;
+        le stat() de chaque fichier est conservé pour _get_metadatas.
 
         Args:
             path (str): Le chemin vers le répertoire
-            glob (str): Le motif de recherche des fichiers
+            glob (Union[str, list[str]]): Le ou les motifs de recherche des fichiers
 
         Returns:
             generator: Un générateur de fichiers.
         """
+        walker = FSWalker.from_config({**self._config, "glob": glob})
+        for walked_file in walker.walk(path):
+            self._file_stats[str(walked_file.path)] = walked_file.stat
+            yield walked_file.path
 
-        file_path = Path(path)
-
-        return file_path.rglob(glob)
-
-    def _get_metadatas(self, path: Path, relative_path: str) -> dict:
+    def _get_metadatas(
+        self,
+        path: Path,
+        relative_path: str,
+        stat: Optional[os.stat_result] = None,
+    ) -> dict:
         """Récupère les métadonnées d'un fichier.
 
         Args:
             path (Path): Le chemin du fichier.
+            relative_path (str): Le chemin relatif du fichier.
+            stat (Optional[os.stat_result]): Le stat() du fichier s'il est déjà connu.
 
         Returns:
             dict: Les métadonnées du fichier.
         """
-        last_modified = path.stat().st_mtime
+        if stat is None:
+            stat = self._file_stats.get(str(path)) or path.stat()
+        last_modified = stat.st_mtime
         last_modified_formatted = datetime.fromtimestamp(last_modified).isoformat()
 
         metadata = {
@@ -56,15 +141,208 @@ class AbstractFSReader(BaseReader):
         return metadata
 
     @abstractmethod
-    def _process_file(self, path: Path) -> Document:
+    def _process_file(self, path: Path) -> Optional[Document]:
         """Traite un fichier et retourne un objet Document.
 
+        Les readers qui découpent un fichier en plusieurs documents surchargent aussi
+        _process_file_documents.
+
         Args:
             file (Path): Le fichier à traiter.
 
         Returns:
-            Document: Un objet Document.
+            Optional[Document]: Un objet Document, None si le fichier est ignoré.
+        """
+
+    def _process_file_documents(self, path: Path) -> Iterator[Document]:
+        """Traite un fichier et retourne ses documents au fil de l'eau.
+
+        Par défaut, renvoie le document de _process_file ; les readers qui découpent un
+        fichier en plusieurs documents surchargent cette méthode.
+
+        Args:
+            path (Path): Le fichier à traiter.
+
+        Returns:
+            Iterator[Document]: Documents du fichier (aucun si le fichier est ignoré).
+        """
+        document = self._process_file(path)
+        if document is not None:
+            yield document
+
+    def _process_file_list(
+        self, path: Path, stat: Optional[os.stat_result] = None
+    ) -> Tuple[list[Document], list[str]]:
+        """Traite un fichier dans un processus du pool.
+
+        Args:
+            path (Path): Le fichier à traiter.
+            stat (Optional[os.stat_result]): Le stat() du fichier s'il est déjà connu.
+
+        Returns:
+            Tuple[list[Document], list[str]]: Documents du fichier et docs en échec
+            signalés lors de son traitement.
+        """
+        if stat is not None:
+            self._file_stats[str(path)] = stat
+        self._unsuccessful_docs = []
+        try:
+            return list(self._process_file_documents(path)), self._unsuccessful_docs
+        finally:
+            self._file_stats.pop(str(path), None)
+
+    def _create_file_executor(self) -> Executor:
+        """Crée le pool de traitement des fichiers (threads ou processus)."""
+        if self._worker_type == "thread":
+            return ThreadPoolExecutor(
+                max_workers=self._workers, thread_name_prefix="fs-reader"
+            )
+
+        worker_config = {
+            key: value
+            for key, value in self._config.items()
+            if key not in self.worker_excluded_options
+        }
+        worker_config["workers"] = 0
+        # "spawn" évite de forker un processus possédant des threads actifs
+        return ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_file_worker,
+            initargs=(type(self), worker_config, self._namespace),
+        )
+
+    def _iter_file_documents(
+        self, files: Iterator[Tuple[Path, str]]
+    ) -> Iterator[Tuple[Path, str, Iterator[Document]]]:
+        """Traite les fichiers, éventuellement en parallèle, dans leur ordre d'arrivée.
+
+        Args:
+            files (Iterator[Tuple[Path, str]]): Fichiers à traiter et chemins relatifs
+
+        Returns:
+            Iterator[Tuple[Path, str, Iterator[Document]]]: Pour chaque fichier, ses
+            documents (les erreurs de traitement sont levées à leur lecture)
         """
+        if self._workers <= 0:
+            for path, relative_path in files:
+                yield path, relative_path, self._process_file_documents(path)
+            return
+
+        def future_documents(future: Future) -> Iterator[Document]:
+            if self._worker_type == "thread":
+                yield from future.result()
+                return
+            documents, unsuccessful_docs = future.result()
+            self._unsuccessful_docs.extend(unsuccessful_docs)
+            yield from documents
+
+        # Fenêtre bornée de fichiers en cours : le parcours avance avec le traitement
+        max_in_flight = self._workers * 2
+        in_flight: deque = deque()
+        executor = self._create_file_executor()
+        try:
+            for path, relative_path in files:
+                if self._worker_type == "thread":
+                    # Le générateur est consommé (donc le fichier traité) par le thread
+                    future = executor.submit(list, self._process_file_documents(path))
+                else:
+                    future = executor.submit(
+                        _process_file_in_worker, path, self._file_stats.get(str(path))
+                    )
+                in_flight.append((path, relative_path, future))
+                if len(in_flight) >= max_in_flight:
+                    path, relative_path, future = in_flight.popleft()
+                    yield path, relative_path, future_documents(future)
+            while in_flight:
+                path, relative_path, future = in_flight.popleft()
+                yield path, relative_path, future_documents(future)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def lazy_load_data(self, *args: Any, **kwargs: Any) -> Iterator[Document]:
+        """Charge les données à partir d'un path et d'un glob, fichier par fichier.
+
+        Avec l'option manifest_path, seuls les fichiers nouveaux ou modifiés depuis le
+        dernier chargement complet sont renvoyés ; les documents inchangés et supprimés
+        sont disponibles via get_unchanged_docs et get_deleted_docs. Un fichier en
+        erreur est ajouté aux docs en échec sans interrompre le chargement.
+
+        Returns:
+            Iterator[Document]: Générateur des documents.
+        """
+        glob = self._config.get("glob", "*.json")
+
+        files = self._get_files(self._file_dir, glob)
+
+        if self._manifest is not None:
+            self._unchanged_docs = []
+            self._deleted_docs = None
+        seen_paths = set()
+        stale_doc_ids = []
+
+        def files_to_process() -> Iterator[Tuple[Path, str]]:
+            for file in files:
+                relative_path = os.path.relpath(file, self._config["base_dir"])
+                seen_paths.add(relative_path)
+                if self._skip_doc_ids and relative_path in self._skip_doc_ids:
+                    self._file_stats.pop(str(file), None)
+                    continue
+                if self._manifest is not None and self._manifest.is_unchanged(
+                    relative_path,
+                    str(file),
+                    self._file_stats.get(str(file)) or file.stat(),
+                ):
+                    self._unchanged_docs.extend(
+                        self._manifest.get_doc_ids(relative_path)
+                    )
+                    self._file_stats.pop(str(file), None)
+                    continue
+                yield file, relative_path
+
+        for file, relative_path, documents in self._iter_file_documents(
+            files_to_process()
+        ):
+            doc_ids = []
+            try:
+                for document in documents:
+                    doc_ids.append(document.doc_id)
+                    yield document
+            except BrokenProcessPool:
+                # Erreur du pool et non du fichier : le chargement est interrompu
+                raise
+            except Exception as e:
+                logger.error(f"Error processing {relative_path}: {e}")
+                self._unsuccessful_docs.append(relative_path)
+                doc_ids = []
+            finally:
+                stat = self._file_stats.pop(str(file), None)
+
+            if self._manifest is not None:
+                if doc_ids:
+                    # Les documents qui ne sont plus produits (ex: fichier raccourci)
+                    # sont à supprimer ; l'état du fichier est enregistré lorsque
+                    # l'appelant confirme avoir traité ses documents
+                    stale_doc_ids.extend(
+                        self._manifest.stage(
+                            relative_path,
+                            stat or file.stat(),
+                            path=str(file),
+                            doc_ids=doc_ids,
+                        )
+                    )
+                else:
+                    self._manifest.remove(relative_path)
+
+        # Les fichiers inchangés ou supprimés ne sont enregistrés que si le chargement
+        # est allé à son terme ; les fichiers renvoyés le sont par commit_docs
+        if self._manifest is not None:
+            self._deleted_docs = self._manifest.prune(seen_paths) + stale_doc_ids
+            logger.info(
+                f"{len(self._unchanged_docs)} unchanged documents skipped, "
+                f"{len(self._deleted_docs)} deleted documents"
+            )
+            self._manifest.save()
 
     def load_data(self, *args: Any, **kwargs: Any) -> list:
         """Charge les données à partir d'un path et d'un glob.
@@ -72,18 +350,47 @@ class AbstractFSReader(BaseReader):
         Returns:
             list: Liste des documents.
         """
-        glob = self._config.get("glob", "*.json")
+        return list(self.lazy_load_data(*args, **kwargs))
 
-        files = self._get_files(self._file_dir, glob)
+    def set_skip_doc_ids(self, doc_ids: Iterable[str]):
+        """Définit les fichiers à ne pas traiter (ex: déjà traités avant une interruption).
+
+        Args:
+            doc_ids (Iterable[str]): Chemins relatifs des fichiers à ignorer
+        """
+        self._skip_doc_ids = set(doc_ids)
 
-        documents = []
+    def set_operation(self, operation: str):
+        """Définit l'opération pour laquelle les fichiers sont chargés ("cache" ou "ingest").
 
-        for file in files:
-            document = self._process_file(file)
-            documents.append(document)
+        Avec manifest_path, chaque opération a son propre manifeste
+        (ex: manifest.ingest.json).
+        """
+        self._operation = operation
+        self._manifest = self._open_manifest()
+
+    def commit_docs(self, doc_ids: Iterable[str]):
+        """Confirme que des docs renvoyés ont été traités (écrits dans le cache ou ingérés).
 
-        return documents
+        Avec manifest_path, l'état d'un fichier n'est enregistré qu'une fois tous ses
+        documents confirmés : un fichier dont l'écriture a échoué est retraité.
+        """
+        if self._manifest is not None:
+            self._manifest.commit(doc_ids)
 
     def get_unsuccessful_docs(self) -> list[str]:
         """Retourne une liste vide par défaut pour les fichiers/Docs échoués."""
         return self._unsuccessful_docs
+
+    def get_unchanged_docs(self) -> list[str]:
+        """Retourne la liste des fichiers/Docs inchangés, à conserver lors d'une suppression."""
+        return self._unchanged_docs
+
+    def get_deleted_docs(self) -> Optional[list[str]]:
+        """Retourne la liste des fichiers supprimés depuis le dernier chargement.
+
+        Returns:
+            Optional[list[str]]: Chemins relatifs des fichiers supprimés, None si le
+            reader ne suit pas les suppressions (pas de manifest_path)
+        """
+        return self._deleted_docs
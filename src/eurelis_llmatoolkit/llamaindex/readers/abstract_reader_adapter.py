@@ -1,4 +1,28 @@
+import os
 from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, Optional
+
+from llama_index.core.schema import Document
+
+
+class LoadDataError(Exception):
+    """Levée lorsque le chargement des données d'un reader échoue."""
+
+
+def get_operation_path(path: str, operation: Optional[str]) -> str:
+    """Ajoute l'opération au nom d'un fichier d'état (ex: state.json -> state.ingest.json).
+
+    Args:
+        path (str): Chemin du fichier d'état configuré
+        operation (Optional[str]): Opération ("cache" ou "ingest"), None pour aucune
+
+    Returns:
+        str: Chemin du fichier d'état propre à l'opération
+    """
+    if not operation:
+        return path
+    base, ext = os.path.splitext(path)
+    return f"{base}.{operation}{ext}"
 
 
 class AbstractReaderAdapter(ABC):
@@ -10,15 +34,70 @@ class AbstractReaderAdapter(ABC):
         self._unsuccessful_docs: list[str] = (
             []
         )  # Liste des docs non récupérés(ex:pages en timeout)
+        self._unchanged_docs: list[str] = (
+            []
+        )  # Liste des docs inchangés depuis le dernier chargement (non renvoyés)
+        self._skip_doc_ids: set[str] = (
+            set()
+        )  # Docs déjà traités lors d'un chargement interrompu (reprise)
+        self._operation: Optional[str] = None
 
     @abstractmethod
     def load_data(self, *args, **kwargs):
         """Méthode abstraite que chaque sous-classe doit implémenter pour appeler la méthode de chargement des données du reader"""
 
+    def lazy_load_data(self, *args, **kwargs) -> Iterator[Document]:
+        """Charge les données sous forme de générateur.
+
+        Par défaut, délègue à load_data ; les readers capables de produire les documents
+        au fil de l'eau surchargent cette méthode.
+
+        Raises:
+            LoadDataError: Si le chargement des données échoue
+        """
+        documents = self.load_data(*args, **kwargs)
+        if documents is None:
+            raise LoadDataError(f"{self.__class__.__name__} failed to load data")
+        yield from documents
+
     def _get_load_data_params(self):
         """Récupère les paramètres nécessaires pour charger les données à partir de la configuration."""
         return {param: self.config[param] for param in self.__class__.required_params}
 
+    def set_skip_doc_ids(self, doc_ids: Iterable[str]):
+        """Définit les docs à ne pas charger (ex: déjà traités avant une interruption).
+
+        Les readers capables d'éviter le traitement de ces docs utilisent cette liste ;
+        les autres docs sont de toute façon filtrés par l'appelant.
+        """
+        self._skip_doc_ids = set(doc_ids)
+
+    def set_operation(self, operation: str):
+        """Définit l'opération pour laquelle les docs sont chargés ("cache" ou "ingest").
+
+        Les readers incrémentaux conservent un état distinct par opération : un doc
+        déjà écrit dans le cache n'est pas pour autant ingéré, et inversement.
+        """
+        self._operation = operation
+
+    def commit_docs(self, doc_ids: Iterable[str]):
+        """Confirme que des docs renvoyés ont été traités (écrits dans le cache ou ingérés).
+
+        Les readers incrémentaux n'enregistrent l'état d'un doc qu'après cette
+        confirmation ; par défaut, ne fait rien.
+        """
+
     def get_unsuccessful_docs(self) -> list[str]:
         """Retourne une liste vide par défaut pour les URLs/Docs échouées."""
         return self._unsuccessful_docs
+
+    def get_unchanged_docs(self) -> list[str]:
+        """Retourne la liste des URLs/Docs inchangés, à conserver lors d'une suppression."""
+        return self._unchanged_docs
+
+    def get_deleted_docs(self) -> Optional[list[str]]:
+        """Retourne la liste des URLs/Docs supprimés depuis le dernier chargement.
+
+        Par défaut None : le reader ne suit pas les suppressions.
+        """
+        return None
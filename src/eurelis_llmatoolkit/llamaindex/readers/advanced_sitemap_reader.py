@@ -1,20 +1,94 @@
+import hashlib
+import importlib.util
 import logging
+import multiprocessing
 import re
+import threading
 import time
-import xml.etree.ElementTree as ET
-from typing import List, Optional
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
 
 import requests
 import requests.compat
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 from llama_index.core.schema import Document
 
 from eurelis_llmatoolkit.llamaindex.readers.abstract_reader_adapter import (
     AbstractReaderAdapter,
+    LoadDataError,
+    get_operation_path,
 )
+from eurelis_llmatoolkit.llamaindex.readers.bounded_download import (
+    DownloadedBody,
+    ResponseRejectedError,
+    download_body,
+)
+from eurelis_llmatoolkit.llamaindex.readers.crawl_state import (
+    CrawlStateStore,
+    NotModifiedError,
+)
+from eurelis_llmatoolkit.llamaindex.readers.http_session import (
+    ConnectionStats,
+    create_pooled_session,
+)
+from eurelis_llmatoolkit.llamaindex.readers.pdf_cache import PDFExtractionCache
+from eurelis_llmatoolkit.llamaindex.readers.pdf_extraction import PDFExtractor
+from eurelis_llmatoolkit.llamaindex.readers.rate_limiter import (
+    HostRateLimiter,
+    backoff_delay,
+    parse_retry_after,
+)
+from eurelis_llmatoolkit.llamaindex.readers.raw_response_cache import RawResponseCache
+from eurelis_llmatoolkit.llamaindex.readers.sitemap_parser import (
+    SitemapEntry,
+    SpooledResponseStream,
+    parse_sitemap,
+)
+from eurelis_llmatoolkit.llamaindex.readers.url_canonicalizer import URLCanonicalizer
 
 logger = logging.getLogger(__name__)
 
+# Codes HTTP pour lesquels une nouvelle tentative est inutile
+NON_RETRYABLE_STATUS_CODES = (404, 410)
+
+# Types MIME acceptés pour les pages et les PDFs (une réponse sans Content-Type est
+# acceptée)
+PAGE_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+PDF_CONTENT_TYPES = (
+    "application/pdf",
+    "application/x-pdf",
+    "application/octet-stream",
+    "binary/octet-stream",
+)
+
+# Options sans objet dans les processus de parsing (état partagé du crawl)
+_PARSE_WORKER_EXCLUDED_OPTIONS = ("crawl_state_path", "pdf_cache_dir", "raw_cache_dir")
+
+_parse_worker_reader: Optional["AdvancedSitemapReader"] = None
+
+
+def _init_parse_worker(reader_class: type, config: dict, namespace: str):
+    """Crée le reader utilisé par un processus de parsing (hooks des sous-classes)."""
+    global _parse_worker_reader
+    _parse_worker_reader = reader_class(config, namespace)
+
+
+def _parse_page_in_worker(url: str, content: bytes) -> Tuple[str, dict, List[str]]:
+    return _parse_worker_reader._parse_and_convert_page(url, content)
+
+
+def _convert_text_in_worker(text: str) -> str:
+    return _parse_worker_reader._convert_page_text(text)
+
+
+def _resolve_html_parser(html_parser: str) -> str:
+    """Retourne le parser BeautifulSoup à utiliser ("auto" : lxml s'il est installé)."""
+    if html_parser != "auto":
+        return html_parser
+    return "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
 
 class AdvancedSitemapReader(AbstractReaderAdapter):
     required_params = ["sitemap_url"]  # Liste des paramètres requis
@@ -23,93 +97,522 @@ class AdvancedSitemapReader(AbstractReaderAdapter):
         super().__init__(config)
         self._headers = {"User-Agent": config.get("user_agent", "EurelisLLMATK/0.1")}
         self._namespace = namespace
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        self._connection_stats = ConnectionStats()
+        self._rate_limiter = HostRateLimiter.from_config(config)
+        self._html_parser = _resolve_html_parser(config.get("html_parser", "auto"))
+        self._parse_executor: Optional[ProcessPoolExecutor] = None
+        self._parse_executor_lock = threading.Lock()
+        if config.get("parse_workers", 0) > 0 and not config.get("async_mode", False):
+            # Sans requêtes concurrentes, le crawl attendrait chaque parsing
+            raise ValueError("parse_workers requires async_mode")
+
+        # Crawl incrémental : état persistant des URLs déjà récupérées
+        self._crawl_state: Optional[CrawlStateStore] = self._open_crawl_state()
+        self._pending_validators: dict[str, dict] = {}
+        self._seen_urls: set[str] = set()
+
+        # Déduplication : URLs canoniques et hash des contenus déjà renvoyés
+        self._url_canonicalizer = URLCanonicalizer.from_config(config)
+        self._aliases_lock = threading.Lock()
+        self._url_aliases: defaultdict[str, set] = defaultdict(set)
+        # Métadonnées des documents en cours de traitement (None une fois renvoyés)
+        self._doc_metadata: dict[str, Optional[dict]] = {}
+        self._content_hashes: dict[str, str] = {}
+        self._duplicate_docs: dict[str, str] = {}
+        self._pdf_extractor = PDFExtractor.from_config(config)
+
+        # Cache des extractions PDF, partagé entre les pages et entre les crawls
+        self._pdf_cache = PDFExtractionCache.from_config(config)
+        self._checked_pdf_urls: set[str] = set()
+
+        # Cache des réponses brutes, pour reparser les pages sans les retélécharger
+        self._raw_cache = RawResponseCache.from_config(config)
+
+    def _open_crawl_state(self) -> Optional[CrawlStateStore]:
+        """Ouvre l'état du crawl propre à l'opération en cours (None sans crawl_state_path)."""
+        crawl_state_path = self.config.get("crawl_state_path", None)
+        if not crawl_state_path:
+            return None
+        return CrawlStateStore(get_operation_path(crawl_state_path, self._operation))
+
+    def set_operation(self, operation: str):
+        super().set_operation(operation)
+        self._crawl_state = self._open_crawl_state()
+
+    def commit_docs(self, doc_ids: Iterable[str]):
+        """Enregistre l'état du crawl des pages traitées par l'appelant.
+
+        Args:
+            doc_ids (Iterable[str]): URLs des pages écrites dans le cache ou ingérées
+        """
+        if self._crawl_state is not None:
+            self._crawl_state.commit(doc_ids)
 
     def load_data(self, url: Optional[str] = None) -> Optional[list]:
         """Charge les données d'un sitemap
 
         Args:
+            url (Optional[str]): URL du sitemap (par défaut sitemap_url de la configuration)
 
         Returns:
             Optional[list]: Liste des données du sitemap ou None en cas d'erreur
         """
-        if url is None:
-            load_params = self._get_load_data_params()
-            url = load_params["sitemap_url"]
+        try:
+            return list(self.lazy_load_data(url))
+        except LoadDataError:
+            return None
+
+    def lazy_load_data(self, url: Optional[str] = None) -> Iterator[Document]:
+        """Charge les données d'un sitemap au fil du crawl
+
+        Args:
+            url (Optional[str]): URL du sitemap (par défaut sitemap_url de la configuration)
+
+        Returns:
+            Iterator[Document]: Documents des pages du sitemap
+
+        Raises:
+            LoadDataError: Si un sitemap ne peut pas être récupéré
+        """
+        if url is not None:
+            yield from self._iter_sitemap_documents(url)
+            return
 
+        load_params = self._get_load_data_params()
+        self._seen_urls = set()
+        self._url_aliases = defaultdict(set)
+        self._doc_metadata = {}
+        self._content_hashes = {}
+        self._duplicate_docs = {}
+        self._checked_pdf_urls = set()
+        try:
+            yield from self._iter_sitemap_documents(load_params["sitemap_url"])
+        finally:
+            self._pdf_extractor.close()
+            self._close_parse_executor()
+            if self._pdf_cache is not None:
+                self._pdf_cache.save()
+
+        # L'état des pages inchangées n'est enregistré que si le chargement est allé à
+        # son terme ; celui des pages renvoyées l'est par commit_docs
+        logger.info(f"HTTP connection stats: {self.get_connection_stats()}")
+        if self._duplicate_docs:
+            logger.info(f"{len(self._duplicate_docs)} duplicate pages skipped")
+        if self._crawl_state is not None:
+            logger.info(f"{len(self._unchanged_docs)} unchanged pages skipped")
+            self._crawl_state.save()
+
+    def _iter_sitemap_documents(self, url: str) -> Iterator[Document]:
+        """Récupère les documents d'un sitemap ou d'un sitemap index
+
+        Args:
+            url (str): URL du sitemap
+
+        Returns:
+            Iterator[Document]: Documents des pages du sitemap
+
+        Raises:
+            LoadDataError: Si le sitemap ne peut pas être récupéré
+        """
         logger.info(f"Loading data from sitemap URL: {url}")
 
-        sitemap_content = self._fetch_url(url)
-        if sitemap_content is None:
+        # Le sitemap (éventuellement gzippé) est parsé au fil du téléchargement
+        response = self._fetch_response(url, stream=True)
+        if response is None:
             logger.critical(f"Failed to fetch sitemap content for URL: {url}")
-            return None
+            raise LoadDataError(f"Failed to fetch sitemap content for URL: {url}")
 
         logger.debug(f"Sitemap : {url}")
-        root = ET.fromstring(sitemap_content)
+        with SpooledResponseStream(response) as stream:
+            root_name, entries = parse_sitemap(stream)
 
-        # on vérifie si le sitemap est un sitemap index ou un sitemap
-        if root.tag.endswith("sitemapindex"):
-            return self._process_sitemap_index(root)
-        if root.tag.endswith("urlset"):
-            return self._process_urlset(root)
+            # on vérifie si le sitemap est un sitemap index ou un sitemap
+            if root_name == "sitemapindex":
+                yield from self._process_sitemap_index(entries)
+                return
+            if root_name == "urlset":
+                yield from self._process_urlset(entries)
+                return
         raise ValueError(f"Unsupported sitemap format for URL: {url}")
 
-    def _process_sitemap_index(self, root: ET.Element) -> list:
+    def _process_sitemap_index(
+        self, entries: Iterable[SitemapEntry]
+    ) -> Iterator[Document]:
         """Récupère les données de tous les sitemaps référencés dans un sitemap index
 
+        Les sitemaps enfants sont récupérés en parallèle et leurs URLs sont traitées
+        comme un seul urlset.
+
         Args:
-            root (ET.Element): ElementTree root de l'index de sitemap
+            entries (Iterable[SitemapEntry]): Entrées <sitemap> de l'index de sitemap
 
         Returns:
-            list: Liste des données de tous les sitemaps référencés
+            Iterator[Document]: Données de tous les sitemaps référencés
         """
         logger.debug("Processing sitemap index")
-        all_data = []
-        for sitemap in root.findall(".//{*}sitemap"):
-            loc = sitemap.find("{*}loc").text
-            data = self.load_data(loc)
-            all_data.extend(data)
-        return all_data
-
-    def _process_urlset(self, root: ET.Element) -> list:
+        return self._process_urlset(self._iter_sitemap_index_entries(entries))
+
+    def _iter_sitemap_index_entries(
+        self, entries: Iterable[SitemapEntry]
+    ) -> Iterator[SitemapEntry]:
+        """Récupère les entrées <url> des sitemaps d'un index avec un pool de workers
+
+        Au plus sitemap_workers sitemaps enfants sont récupérés simultanément ; leurs
+        entrées sont renvoyées dans l'ordre de l'index. Les sitemaps index imbriqués
+        sont parcourus de la même manière.
+
+        Args:
+            entries (Iterable[SitemapEntry]): Entrées <sitemap> de l'index de sitemap
+
+        Returns:
+            Iterator[SitemapEntry]: Entrées <url> de tous les sitemaps référencés
+
+        Raises:
+            LoadDataError: Si un sitemap enfant ne peut pas être récupéré
+        """
+        workers = max(1, self.config.get("sitemap_workers", 4))
+        sitemap_locs = (entry.loc for entry in entries)
+        nested_locs: deque = deque()
+        pending: deque = deque()
+        seen_sitemaps: set[str] = set()
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="sitemap-index"
+        ) as executor:
+
+            def next_loc() -> Optional[str]:
+                return (
+                    nested_locs.popleft() if nested_locs else next(sitemap_locs, None)
+                )
+
+            def submit_next() -> bool:
+                loc = next_loc()
+                while loc in seen_sitemaps:
+                    loc = next_loc()
+                if loc is None:
+                    return False
+                seen_sitemaps.add(loc)
+                pending.append(executor.submit(self._fetch_sitemap_entries, loc))
+                return True
+
+            try:
+                while len(pending) < workers and submit_next():
+                    pass
+
+                while pending:
+                    root_name, child_entries = pending.popleft().result()
+                    if root_name == "sitemapindex":
+                        nested_locs.extend(entry.loc for entry in child_entries)
+                    while len(pending) < workers and submit_next():
+                        pass
+                    if root_name != "sitemapindex":
+                        yield from child_entries
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _fetch_sitemap_entries(self, url: str) -> Tuple[str, List[SitemapEntry]]:
+        """Récupère et parse un sitemap enfant
+
+        Args:
+            url (str): URL du sitemap
+
+        Returns:
+            Tuple[str, List[SitemapEntry]]: Nom de l'élément racine et entrées du sitemap
+
+        Raises:
+            LoadDataError: Si le sitemap ne peut pas être récupéré
+        """
+        logger.info(f"Loading data from sitemap URL: {url}")
+        response = self._fetch_response(url, stream=True)
+        if response is None:
+            logger.critical(f"Failed to fetch sitemap content for URL: {url}")
+            raise LoadDataError(f"Failed to fetch sitemap content for URL: {url}")
+
+        with SpooledResponseStream(response) as stream:
+            root_name, entries = parse_sitemap(stream)
+            if root_name not in ("sitemapindex", "urlset"):
+                raise ValueError(f"Unsupported sitemap format for URL: {url}")
+            return root_name, list(entries)
+
+    def _process_urlset(self, entries: Iterable[SitemapEntry]) -> Iterator[Document]:
         """Récupère les données d'un sitemap
 
         Args:
-            root (ET.Element): ElementTree root du sitemap
+            entries (Iterable[SitemapEntry]): Entrées <url> du sitemap
 
         Returns:
-            list: Liste des données du sitemap
+            Iterator[Document]: Données du sitemap
         """
         logger.debug("Processing URL set")
-        all_data = []
+        entries = self._iter_url_entries(entries)
+
+        if self.config.get("async_mode", False):
+            documents = self._process_urlset_async(entries)
+        else:
+            documents = (self._process_url(loc, lastmod) for loc, lastmod in entries)
 
+        # Documents dans l'ordre du sitemap : la première URL d'un contenu est la
+        # version canonique, même en mode asynchrone
+        deduplicate = self.config.get("deduplicate_content", False)
+        for page_data in documents:
+            if not page_data:
+                continue
+            doc_id = page_data.doc_id
+            if deduplicate:
+                page_data = self._deduplicate_document(page_data)
+            if page_data:
+                yield page_data
+            self._release_document(doc_id)
+
+    def _deduplicate_document(self, document: Document) -> Optional[Document]:
+        """Écarte un document dont le contenu a déjà été renvoyé par une autre URL
+
+        L'URL écartée est ajoutée aux alias du document canonique.
+
+        Args:
+            document (Document): Document d'une page
+
+        Returns:
+            Optional[Document]: Le document, ou None s'il s'agit d'un doublon
+        """
+        content_hash = hashlib.sha256(document.text.encode("utf-8")).hexdigest()
+        canonical_id = self._content_hashes.setdefault(content_hash, document.doc_id)
+        if canonical_id == document.doc_id:
+            return document
+
+        logger.debug(f"URL {document.doc_id} duplicates {canonical_id}, skipping")
+        self._duplicate_docs[document.doc_id] = canonical_id
+        for alias in [document.doc_id, *document.metadata.get("aliases", [])]:
+            self._add_alias(canonical_id, alias)
+        return None
+
+    def _add_alias(self, canonical_id: str, alias: str):
+        """Ajoute une URL aux alias d'un document
+
+        Si le document a déjà été créé, ses métadonnées sont complétées. Un alias trouvé
+        après que le document a été renvoyé est ignoré.
+
+        Args:
+            canonical_id (str): URL canonique du document
+            alias (str): URL alias
+        """
+        with self._aliases_lock:
+            if canonical_id not in self._doc_metadata:
+                self._url_aliases[canonical_id].add(alias)
+                return
+            metadata = self._doc_metadata[canonical_id]
+            if metadata is None:
+                logger.debug(
+                    f"URL {canonical_id} already returned, alias {alias} ignored"
+                )
+                return
+            aliases = metadata.setdefault("aliases", [])
+            if alias not in aliases:
+                aliases.append(alias)
+
+    def _release_document(self, doc_id: str):
+        """Libère les métadonnées d'un document renvoyé ou écarté
+
+        Seule l'URL est conservée, afin que la mémoire reste bornée au fil du crawl.
+
+        Args:
+            doc_id (str): URL du document
+        """
+        with self._aliases_lock:
+            if doc_id in self._doc_metadata:
+                self._doc_metadata[doc_id] = None
+
+    def get_duplicate_docs(self) -> dict[str, str]:
+        """Retourne les URLs écartées car dupliquant le contenu d'une autre URL.
+
+        Returns:
+            dict[str, str]: URL écartée -> URL canonique
+        """
+        return self._duplicate_docs
+
+    def _iter_url_entries(
+        self, entries: Iterable[SitemapEntry]
+    ) -> Iterator[Tuple[str, str]]:
+        """Parcourt les URLs d'un sitemap en appliquant les url_include_filters
+
+        Les URLs sont d'abord canonicalisées (url_canonicalization). Les URLs déjà
+        rencontrées pendant le chargement (ex: présentes dans deux sitemaps d'un même
+        index) et celles déjà traitées avant la reprise d'un chargement interrompu
+        sont ignorées.
+
+        Args:
+            entries (Iterable[SitemapEntry]): Entrées <url> du sitemap
+
+        Returns:
+            Iterator[Tuple[str, str]]: Couples (loc, lastmod) des URLs à traiter
+        """
         url_include_filters = self.config.get("url_include_filters", None)
 
-        requests_per_second = self.config.get("requests_per_second", -1)
+        for loc, lastmod in entries:
+            if self._url_canonicalizer is not None:
+                canonical_loc = self._url_canonicalizer.canonicalize(loc)
+                if canonical_loc != loc:
+                    self._add_alias(canonical_loc, loc)
+                    loc = canonical_loc
+
+            if loc in self._seen_urls:
+                logger.debug(f"URL {loc} already processed, skipping")
+                continue
+            self._seen_urls.add(loc)
 
-        for url in root.findall(".//{*}url"):
-            loc = url.find("{*}loc").text
             if url_include_filters and not any(
                 re.match(regexp_pattern, loc) for regexp_pattern in url_include_filters
             ):
                 logger.debug(f"URL {loc} does not match include filters, skipping")
                 continue
+
+            if loc in self._skip_doc_ids:
+                logger.debug(f"URL {loc} already processed before resume, skipping")
+                continue
+            yield loc, lastmod
+
+    def _process_url(self, loc: str, lastmod: str) -> Optional[Document]:
+        """Récupère le document d'une URL du sitemap et y ajoute ses métadonnées
+
+        Args:
+            loc (str): URL de la page
+            lastmod (str): Date de dernière modification indiquée dans le sitemap
+
+        Returns:
+            Optional[Document]: Document de la page ou None en cas d'erreur ou si la
+            page n'a pas changé depuis le dernier crawl
+        """
+        state = self._crawl_state.get(loc) if self._crawl_state else None
+        if state and lastmod and state.get("lastmod") == lastmod:
+            logger.debug(f"URL {loc} unchanged since {lastmod}, skipping")
+            self._skip_unchanged(loc, state)
+            return None
+
+        try:
             page_data = self._process_page(loc)
-            if page_data:
-                metadatas = {
-                    "source": loc,
-                    "namespace": self._namespace,
-                    "lastmod": (
-                        url.find("{*}lastmod").text if url.find("{*}lastmod") else ""
-                    ),
-                }
-                page_data.metadata.update(metadatas)
-                all_data.append(page_data)
+        except NotModifiedError:
+            logger.debug(f"URL {loc} not modified, skipping")
+            self._skip_unchanged(loc, state)
+            if self._crawl_state is not None:
+                self._crawl_state.update(loc, lastmod=lastmod or None)
+            return None
+
+        validators = self._pending_validators.pop(loc, {})
+        if not page_data:
+            return None
+
+        metadatas = {
+            "source": loc,
+            "namespace": self._namespace,
+            "lastmod": lastmod,
+        }
+        page_data.metadata.update(metadatas)
+
+        if self._url_canonicalizer is not None or self.config.get(
+            "deduplicate_content", False
+        ):
+            with self._aliases_lock:
+                aliases = self._url_aliases.pop(loc, None)
+                if aliases:
+                    page_data.metadata["aliases"] = sorted(aliases)
+                # Les alias trouvés ensuite seront ajoutés à ces métadonnées
+                self._doc_metadata[loc] = page_data.metadata
+
+            # Les alias n'apportent rien aux embeddings ni au LLM
+            for excluded_keys in (
+                page_data.excluded_embed_metadata_keys,
+                page_data.excluded_llm_metadata_keys,
+            ):
+                if "aliases" not in excluded_keys:
+                    excluded_keys.append("aliases")
+
+        if self._crawl_state is not None:
+            content_hash = hashlib.sha256(page_data.text.encode("utf-8")).hexdigest()
+            fields = dict(lastmod=lastmod or None, content_hash=content_hash)
+            if state and state.get("content_hash") == content_hash:
+                logger.debug(f"URL {loc} content unchanged, skipping")
+                self._crawl_state.update(loc, **fields, **validators)
+                self._skip_unchanged(loc, state)
+                return None
+            # Enregistré lorsque l'appelant confirme avoir traité la page
+            self._crawl_state.stage(loc, **fields, **validators)
+
+        return page_data
+
+    def _skip_unchanged(self, loc: str, state: Optional[dict]):
+        """Enregistre une page inchangée depuis le dernier crawl (non renvoyée)
+
+        Son contenu connu reste pris en compte par la déduplication, afin que ses
+        doublons ne soient pas renvoyés à sa place.
+        """
+        self._unchanged_docs.append(loc)
+        content_hash = state.get("content_hash") if state else None
+        if content_hash and self.config.get("deduplicate_content", False):
+            self._content_hashes.setdefault(content_hash, loc)
+
+    def _process_urlset_async(
+        self, entries: Iterable[Tuple[str, str]]
+    ) -> Iterator[Document]:
+        """Récupère les données d'un sitemap en parallélisant les requêtes
+
+        Les pages sont traitées par un pool de threads : au plus
+        max_concurrent_requests simultanément, dont max_concurrent_requests_per_host
+        par hôte. Une fenêtre bornée d'URLs est soumise en avance, et les requêtes en
+        cours continuent pendant que l'appelant traite les documents déjà renvoyés.
+        Aucune boucle d'événements n'est créée : ce mode fonctionne aussi depuis du
+        code asynchrone.
+
+        Args:
+            entries (Iterable[Tuple[str, str]]): Couples (loc, lastmod) des URLs à traiter
+
+        Returns:
+            Iterator[Document]: Données du sitemap, dans l'ordre du sitemap
 
-            if requests_per_second > 0:
-                logger.debug(f"Sleeping for {1 / requests_per_second} seconds")
-                time.sleep(1 / requests_per_second)
+        Raises:
+            Exception: Erreur inattendue lors du traitement d'une page, les pages non
+            démarrées sont alors abandonnées
+        """
+        max_in_flight = max(1, self.config.get("max_concurrent_requests", 10))
+        max_per_host = max(1, self.config.get("max_concurrent_requests_per_host", 2))
 
-        return all_data
+        host_semaphores: dict[str, threading.BoundedSemaphore] = {}
+        host_semaphores_lock = threading.Lock()
+
+        def process(loc: str, lastmod: str) -> Optional[Document]:
+            host = urlparse(loc).netloc
+            with host_semaphores_lock:
+                semaphore = host_semaphores.setdefault(
+                    host, threading.BoundedSemaphore(max_per_host)
+                )
+            # Le débit par hôte est limité dans _fetch_response
+            with semaphore:
+                return self._process_url(loc, lastmod)
+
+        # Fenêtre bornée de pages soumises pour ne pas lire tout le sitemap d'avance
+        window_size = max_in_flight * 4
+        pending: deque = deque()
+        with ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="sitemap-fetch"
+        ) as executor:
+            try:
+                for loc, lastmod in entries:
+                    pending.append(executor.submit(process, loc, lastmod))
+                    if len(pending) >= window_size:
+                        document = pending.popleft().result()
+                        if document:
+                            yield document
+
+                while pending:
+                    document = pending.popleft().result()
+                    if document:
+                        yield document
+            finally:
+                # Arrêt anticipé ou erreur : les pages non démarrées sont abandonnées
+                for future in pending:
+                    future.cancel()
 
     def _process_page(self, url: str) -> Optional[Document]:
         """Récupère les données d'une page en incluant les PDFs dans la page
@@ -122,27 +625,33 @@ class AdvancedSitemapReader(AbstractReaderAdapter):
         """
         logger.debug(f"Fetching page data for URL: {url}")
         try:
-            response = self._fetch_url(url)
+            response = self._fetch_url(url, conditional=True)
             if response is None:
                 self._unsuccessful_docs.append(url)  # Add URL to unsuccessful docs list
                 return None
 
-            page = BeautifulSoup(response, "html.parser")
-
-            if self.config.get("parser_remove", None):
-                self._remove_excluded_elements(page, self.config["parser_remove"])
+            # Avec parse_workers (mode asynchrone), ce thread attend le processus de
+            # parsing pendant que les autres threads continuent de télécharger
+            executor = self._get_parse_executor()
+            if executor is None:
+                page_text, metadata, pdf_urls = self._parse_and_convert_page(
+                    url, response
+                )
+            else:
+                page_text, metadata, pdf_urls = executor.submit(
+                    _parse_page_in_worker, url, response
+                ).result()
 
-            page_text = page.get_text()
-
-            if self.config.get("embed_pdf", False):
-                pdf_urls = self._find_pdf_urls(page, url)
+            # Le texte des PDFs est converti avec celui de la page
+            if pdf_urls:
                 for pdf_url in pdf_urls:
                     page_text += f"\n{self._process_pdf(pdf_url)}"
-
-            if self.config.get("html_to_text", True):
-                import html2text
-
-                page_text = html2text.html2text(page_text)
+                if executor is None:
+                    page_text = self._convert_page_text(page_text)
+                else:
+                    page_text = executor.submit(
+                        _convert_text_in_worker, page_text
+                    ).result()
 
             logger.debug(
                 f"Page content: {page_text[:100]}"
@@ -150,14 +659,115 @@ class AdvancedSitemapReader(AbstractReaderAdapter):
 
             return Document(
                 text=page_text,
-                metadata=self._get_metadata(url, page),
+                metadata=metadata,
                 doc_id=url,
             )
 
+        except NotModifiedError:
+            raise
+        except ResponseRejectedError as e:
+            # Page non HTML ou trop volumineuse : la version déjà indexée est conservée
+            logger.warning(f"Page rejected {url}: {e}")
+            self._unsuccessful_docs.append(url)
+            return None
         except Exception as e:
             logger.error(f"Error fetching {url}: {e}")
+            self._unsuccessful_docs.append(url)
+            return None
+
+    def _parse_page(self, url: str, content: bytes) -> Tuple[str, dict, List[str]]:
+        """Parse une page et en extrait le texte, les métadonnées et les URLs des PDFs
+
+        Traitement exclusivement CPU, éventuellement exécuté dans un processus de parsing.
+
+        Args:
+            url (str): URL de la page
+            content (bytes): Contenu HTML de la page
+
+        Returns:
+            Tuple[str, dict, List[str]]: Texte de la page, métadonnées et URLs des PDFs
+            à inclure (vide si embed_pdf est désactivé)
+        """
+        page = BeautifulSoup(content, self._html_parser)
+
+        if self.config.get("parser_remove", None):
+            self._remove_excluded_elements(page, self.config["parser_remove"])
+
+        pdf_urls = []
+        if self.config.get("embed_pdf", False):
+            pdf_urls = self._find_pdf_urls(page, url)
+
+        return page.get_text(), self._get_metadata(url, page), pdf_urls
+
+    def _parse_and_convert_page(
+        self, url: str, content: bytes
+    ) -> Tuple[str, dict, List[str]]:
+        """Parse une page et convertit son texte s'il n'y a pas de PDF à y inclure
+
+        Une page sans PDF est ainsi traitée en un seul appel au processus de parsing.
+
+        Args:
+            url (str): URL de la page
+            content (bytes): Contenu HTML de la page
+
+        Returns:
+            Tuple[str, dict, List[str]]: Texte de la page (converti si aucun PDF n'est à
+            inclure), métadonnées et URLs des PDFs à inclure
+        """
+        page_text, metadata, pdf_urls = self._parse_page(url, content)
+        if not pdf_urls:
+            page_text = self._convert_page_text(page_text)
+        return page_text, metadata, pdf_urls
+
+    def _convert_page_text(self, text: str) -> str:
+        """Convertit le texte d'une page avec html2text si html_to_text est activé
+
+        Args:
+            text (str): Texte de la page (PDFs inclus)
+
+        Returns:
+            str: Texte converti
+        """
+        if not self.config.get("html_to_text", True):
+            return text
+
+        import html2text
+
+        return html2text.html2text(text)
+
+    def _get_parse_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Retourne le pool de processus de parsing (None si parse_workers <= 0)
+
+        parse_workers n'est accepté qu'en mode asynchrone : chaque thread de
+        téléchargement attend le parsing de sa page, les autres threads continuant de
+        télécharger pendant ce temps.
+        """
+        parse_workers = self.config.get("parse_workers", 0)
+        if parse_workers <= 0:
             return None
 
+        with self._parse_executor_lock:
+            if self._parse_executor is None:
+                worker_config = {
+                    key: value
+                    for key, value in self.config.items()
+                    if key not in _PARSE_WORKER_EXCLUDED_OPTIONS
+                }
+                # "spawn" évite de forker un processus possédant des threads actifs
+                self._parse_executor = ProcessPoolExecutor(
+                    max_workers=parse_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_parse_worker,
+                    initargs=(type(self), worker_config, self._namespace),
+                )
+            return self._parse_executor
+
+    def _close_parse_executor(self):
+        with self._parse_executor_lock:
+            executor, self._parse_executor = self._parse_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
     def _find_pdf_urls(self, page: BeautifulSoup, url: str) -> List[str]:
         """Récupère les URLs des PDFs inclus dans une page
 
@@ -186,34 +796,102 @@ class AdvancedSitemapReader(AbstractReaderAdapter):
             str: Contenu du PDF
         """
         logger.debug(f"Processing PDF URL: {pdf_url}")
-        import pymupdf
-        import pymupdf4llm
-
         try:
-            pdf_response = self._fetch_url(pdf_url)
-            pdf_file = pymupdf.open(stream=pdf_response)
+            if self._pdf_cache is None:
+                response = self._fetch_response(pdf_url, stream=True)
+                if response is None:
+                    raise ValueError(f"Unable to download PDF {pdf_url}")
+                with self._download_pdf(response) as body:
+                    # Extraction au format MD (éventuellement dans un pool de processus)
+                    title, pdf_md_text = self._pdf_extractor.extract(body.source)
+            else:
+                with self._pdf_cache.lock_url(pdf_url):
+                    title, pdf_md_text = self._extract_pdf_with_cache(pdf_url)
 
-            title = (
-                pdf_file.metadata.get("title", "PDF Document")
-                if pdf_file.metadata
-                else None
-            )  # Titre du PDF ou titre par défaut
-            if isinstance(title, bytes):
-                title = title.decode("utf-8")
-
-            # Vérifie si le titre est vide ou ne contient que des espaces
-            if title is None or not title.strip():
-                title = "PDF Document"  # Valeur par défaut
-
-            # Extraction au format MD
-            pdf_md_text = pymupdf4llm.to_markdown(pdf_file, show_progress=False)
+            # Titre par défaut si le titre est absent ou vide
+            title = title or "PDF Document"
 
             return f"---------- {title} ----------\n{pdf_md_text}"
 
         except Exception as e:
             logger.error(f"Error fetching {pdf_url}: {e}")
+            self._unsuccessful_docs.append(pdf_url)
             return ""
 
+    def _extract_pdf_with_cache(self, pdf_url: str) -> Tuple[Optional[str], str]:
+        """Extrait un PDF en réutilisant si possible le cache des extractions
+
+        Un PDF déjà vérifié pendant ce crawl n'est pas retéléchargé. Sinon une requête
+        conditionnelle est envoyée avec l'ETag connu ; si le PDF a changé (ou si le
+        serveur ne gère pas les ETag), le hash de son contenu permet encore de
+        retrouver une extraction existante.
+
+        Args:
+            pdf_url (str): URL du PDF
+
+        Returns:
+            Tuple[Optional[str], str]: Titre du PDF et texte markdown
+        """
+        link = self._pdf_cache.get_url(pdf_url)
+        if link is not None and pdf_url in self._checked_pdf_urls:
+            cached = self._pdf_cache.get(link["hash"])
+            if cached is not None:
+                return cached
+
+        if link is not None and link.get("etag"):
+            headers = {**self._headers, "If-None-Match": link["etag"]}
+            response = self._fetch_response(pdf_url, headers=headers, stream=True)
+            if response is not None and response.status_code == 304:
+                response.close()
+                cached = self._pdf_cache.get(link["hash"])
+                if cached is not None:
+                    logger.debug(f"PDF not modified, using cache: {pdf_url}")
+                    self._checked_pdf_urls.add(pdf_url)
+                    return cached
+                # Extraction évincée du cache : nouveau téléchargement complet
+                response = self._fetch_response(pdf_url, stream=True)
+        else:
+            response = self._fetch_response(pdf_url, stream=True)
+
+        if response is None:
+            raise ValueError(f"Unable to download PDF {pdf_url}")
+
+        etag = response.headers.get("ETag")
+        with self._download_pdf(response) as body:
+            content_hash = body.content_hash
+            extraction = self._pdf_cache.get(content_hash)
+            if extraction is None:
+                # Extraction au format MD (éventuellement dans un pool de processus)
+                extraction = self._pdf_extractor.extract(body.source)
+                self._pdf_cache.put(content_hash, *extraction)
+            else:
+                logger.debug(f"PDF content already extracted, using cache: {pdf_url}")
+
+        self._pdf_cache.link_url(pdf_url, etag, content_hash)
+        self._checked_pdf_urls.add(pdf_url)
+        return extraction
+
+    def _download_pdf(self, response: requests.Response) -> DownloadedBody:
+        """Télécharge un PDF en streaming, sur disque au-delà de pdf_spool_threshold_mb
+
+        Args:
+            response (requests.Response): Réponse obtenue avec stream=True
+
+        Returns:
+            DownloadedBody: Contenu du PDF (à fermer après l'extraction)
+
+        Raises:
+            ResponseRejectedError: Si la réponse n'est pas un PDF ou dépasse max_pdf_size_mb
+        """
+        return download_body(
+            response,
+            accepted_types=PDF_CONTENT_TYPES,
+            max_size=int(self.config.get("max_pdf_size_mb", 200) * 1024 * 1024),
+            spool_threshold=int(
+                self.config.get("pdf_spool_threshold_mb", 10) * 1024 * 1024
+            ),
+        )
+
     def _remove_excluded_elements(self, page: BeautifulSoup, remove_list: list):
         """Supprime les éléments dans parser_remove du contenu HTML
 
@@ -221,15 +899,28 @@ class AdvancedSitemapReader(AbstractReaderAdapter):
             page (BeautifulSoup): Page à traiter
             remove_list (list): Liste des éléments à supprimer
         """
+        strainers = []
         for remove in remove_list:
-            nodes = []
             if isinstance(remove, str):
-                nodes = page.find_all(remove)
+                strainers.append(SoupStrainer(remove))
             elif isinstance(remove, dict):
-                nodes = page.find_all(**remove)
+                strainers.append(SoupStrainer(**remove))
 
-            for node in nodes:
-                node.extract()
+        # Un seul parcours de l'arbre pour toutes les règles ; les descendants d'un
+        # élément supprimé ne sont pas visités
+        nodes = []
+        stack = list(reversed(page.contents))
+        while stack:
+            node = stack.pop()
+            if not isinstance(node, Tag):
+                continue
+            if any(strainer.matches_tag(node) for strainer in strainers):
+                nodes.append(node)
+            else:
+                stack.extend(reversed(node.contents))
+
+        for node in nodes:
+            node.extract()
 
     def _get_metadata(self, url: str, page: BeautifulSoup) -> dict:
         """
@@ -248,30 +939,163 @@ class AdvancedSitemapReader(AbstractReaderAdapter):
 
         return {"title": title}
 
-    def _fetch_url(self, url: str) -> Optional[str]:
-        """Récupère le contenu d'une URL
+    def get_connection_stats(self) -> dict:
+        """Retourne les statistiques de réutilisation des connexions HTTP du reader."""
+        return self._connection_stats.as_dict()
+
+    def close(self):
+        """Ferme la session HTTP et libère les connexions du pool."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _get_session(self) -> requests.Session:
+        """Retourne la session HTTP partagée, créée à la première requête."""
+        with self._session_lock:
+            if self._session is None:
+                self._session = create_pooled_session(
+                    self.config, self._connection_stats
+                )
+            return self._session
+
+    def _get_conditional_headers(self, url: str) -> dict:
+        """Construit les en-têtes If-None-Match / If-Modified-Since d'une URL
 
         Args:
             url (str): URL de la page
 
         Returns:
-            str: Contenu de la page
+            dict: En-têtes conditionnels issus du dernier crawl
+        """
+        state = self._crawl_state.get(url) if self._crawl_state else None
+        if not state:
+            return {}
+
+        headers = {}
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+        return headers
+
+    def _fetch_url(self, url: str, conditional: bool = False) -> Optional[bytes]:
+        """Récupère le contenu d'une page
+
+        Le contenu est téléchargé en streaming et abandonné si la réponse n'est pas
+        une page HTML ou dépasse max_page_size_mb. Avec un cache de réponses brutes,
+        la réponse est enregistrée, ou relue sans requête HTTP en mode "replay".
+
+        Args:
+            url (str): URL de la page
+            conditional (bool): Envoie une requête conditionnelle à partir de l'état
+                du dernier crawl
+
+        Returns:
+            bytes: Contenu de la page
+
+        Raises:
+            NotModifiedError: Si la requête est conditionnelle et que le serveur
+                répond 304 Not Modified
+            ResponseRejectedError: Si le type ou la taille de la réponse ne conviennent pas
+        """
+        if self._raw_cache is not None and self._raw_cache.replay:
+            cached = self._raw_cache.get(url)
+            if cached is not None:
+                logger.debug(f"Replaying {url} from the raw response cache")
+                return cached.body
+
+        headers = self._headers
+        if conditional:
+            headers = {**self._headers, **self._get_conditional_headers(url)}
+
+        response = self._fetch_response(url, headers=headers, stream=True)
+        if response is None:
+            return None
+        if response.status_code == 304:
+            response.close()
+            raise NotModifiedError(url)
+
+        if conditional and self._crawl_state is not None:
+            self._pending_validators[url] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+
+        body = download_body(
+            response,
+            accepted_types=PAGE_CONTENT_TYPES,
+            max_size=int(self.config.get("max_page_size_mb", 20) * 1024 * 1024),
+        )
+        if self._raw_cache is not None:
+            self._raw_cache.put(url, response.headers, body.content)
+        return body.content
+
+    def _fetch_response(
+        self, url: str, headers: Optional[dict] = None, stream: bool = False
+    ) -> Optional[requests.Response]:
+        """Envoie une requête GET en réessayant en cas d'erreur
+
+        Chaque tentative respecte la limite de débit de l'hôte. Entre deux tentatives,
+        le délai indiqué par Retry-After est respecté, sinon le délai augmente de façon
+        exponentielle. Les erreurs 404 et 410 ne sont pas réessayées ; les erreurs
+        réseau (connexion, requests_timeout dépassé) le sont.
+
+        Args:
+            url (str): URL à récupérer
+            headers (Optional[dict]): En-têtes de la requête (par défaut ceux du reader)
+            stream (bool): Ne télécharge pas le corps de la réponse immédiatement
+
+        Returns:
+            Optional[requests.Response]: Réponse 200 (ou 304 pour une requête
+            conditionnelle), None si toutes les tentatives ont échoué
         """
         requests_timeout = self.config.get("requests_timeout", 60)
         max_attempts = max(
             1, self.config.get("max_attempts", 5)
         )  # Assure au moins 1 tentative
+        retry_backoff = self.config.get("retry_backoff", 2)
+        max_retry_delay = self.config.get("max_retry_delay", 120)
         for attempt in range(max_attempts):
-            response = requests.get(
-                url, timeout=requests_timeout, headers=self._headers
-            )
-            if response.status_code == 200:
-                return response.content
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire(url)
+            try:
+                response = self._get_session().get(
+                    url,
+                    timeout=requests_timeout,
+                    headers=headers or self._headers,
+                    stream=stream,
+                )
+            except requests.RequestException as e:
+                logger.error(f"Error fetching {url}, attempt {attempt + 1}: {e}")
+                response = None
+            else:
+                if response.status_code in (200, 304):
+                    return response
+                response.close()
+
+                logger.error(
+                    f"Error fetching {url}, attempt {attempt + 1}: {response.status_code}"
+                )
+                if response.status_code in NON_RETRYABLE_STATUS_CODES:
+                    # Page supprimée : inutile de réessayer
+                    return None
+            if attempt == max_attempts - 1:
+                break
 
-            logger.error(
-                f"Error fetching {url}, attempt {attempt + 1}: {response.status_code}"
+            retry_after = (
+                parse_retry_after(response.headers.get("Retry-After"))
+                if response is not None
+                else None
             )
-            if attempt < max_attempts - 1:
-                time.sleep(2)  # Attend 2 secondes avant la prochaine tentative
+            if retry_after is not None:
+                delay = min(retry_after, max_retry_delay)
+                if self._rate_limiter is not None:
+                    # Les autres requêtes vers cet hôte attendent également
+                    self._rate_limiter.block(url, delay)
+            else:
+                delay = backoff_delay(attempt, retry_backoff, max_retry_delay)
+            logger.debug(f"Retrying {url} in {delay:.2f} seconds")
+            time.sleep(delay)
         logger.error(f"All {max_attempts} attempts failed for {url}")
         return None
@@ -0,0 +1,154 @@
+import hashlib
+import logging
+import os
+import tempfile
+from typing import Iterable, Optional, Union
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseRejectedError(Exception):
+    """Levée lorsqu'une réponse HTTP est abandonnée avant la fin de son téléchargement."""
+
+
+class ResponseTooLargeError(ResponseRejectedError):
+    """Levée lorsque le corps d'une réponse dépasse la taille maximale autorisée."""
+
+
+class UnexpectedContentTypeError(ResponseRejectedError):
+    """Levée lorsque le Content-Type d'une réponse ne correspond pas au type attendu."""
+
+
+class DownloadedBody:
+    """Corps d'une réponse HTTP, en mémoire ou dans un fichier temporaire.
+
+    Les fichiers temporaires sont supprimés à la fermeture (utilisable comme context
+    manager).
+    """
+
+    def __init__(
+        self, content_hash: str, content: Optional[bytes] = None, path: str = None
+    ):
+        self.content_hash = content_hash
+        self.content = content
+        self.path = path
+
+    @property
+    def source(self) -> Union[bytes, str]:
+        """Contenu en mémoire, ou chemin du fichier temporaire."""
+        return self.content if self.path is None else self.path
+
+    def close(self):
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def check_content_type(response: requests.Response, accepted: Iterable[str]):
+    """Vérifie le Content-Type d'une réponse (une réponse sans Content-Type est acceptée).
+
+    Args:
+        response (requests.Response): Réponse à vérifier
+        accepted (Iterable[str]): Types MIME acceptés
+
+    Raises:
+        UnexpectedContentTypeError: Si le type de la réponse n'est pas accepté
+    """
+    content_type = response.headers.get("Content-Type")
+    if not content_type:
+        return
+    mime_type = content_type.split(";", 1)[0].strip().lower()
+    if mime_type not in accepted:
+        raise UnexpectedContentTypeError(
+            f"Unexpected Content-Type {mime_type} for {response.url}"
+        )
+
+
+def download_body(
+    response: requests.Response,
+    accepted_types: Optional[Iterable[str]] = None,
+    max_size: Optional[int] = None,
+    spool_threshold: Optional[int] = None,
+    chunk_size: int = 64 * 1024,
+) -> DownloadedBody:
+    """Télécharge le corps d'une réponse en streaming, dans la limite de max_size octets.
+
+    Le téléchargement est abandonné dès que le Content-Type ou la taille annoncée ne
+    conviennent pas. Au-delà de spool_threshold octets, le corps est écrit dans un
+    fichier temporaire plutôt que conservé en mémoire.
+
+    Args:
+        response (requests.Response): Réponse obtenue avec stream=True
+        accepted_types (Optional[Iterable[str]]): Types MIME acceptés (None : tous)
+        max_size (Optional[int]): Taille maximale du corps en octets
+        spool_threshold (Optional[int]): Taille à partir de laquelle le corps est écrit
+            sur disque (None : toujours en mémoire)
+        chunk_size (int): Taille des blocs lus
+
+    Returns:
+        DownloadedBody: Corps de la réponse et hash SHA-256 de son contenu
+
+    Raises:
+        UnexpectedContentTypeError: Si le type de la réponse n'est pas accepté
+        ResponseTooLargeError: Si le corps dépasse max_size octets
+    """
+    try:
+        if accepted_types is not None:
+            check_content_type(response, accepted_types)
+
+        content_length = response.headers.get("Content-Length")
+        if max_size and content_length and content_length.isdigit():
+            if int(content_length) > max_size:
+                raise ResponseTooLargeError(
+                    f"Response of {content_length} bytes exceeds the limit of "
+                    f"{max_size} bytes for {response.url}"
+                )
+
+        sha256 = hashlib.sha256()
+        chunks = []
+        size = 0
+        spool_file = None
+        try:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                size += len(chunk)
+                if max_size and size > max_size:
+                    raise ResponseTooLargeError(
+                        f"Response exceeds the limit of {max_size} bytes "
+                        f"for {response.url}"
+                    )
+                sha256.update(chunk)
+
+                if spool_file is None and spool_threshold and size > spool_threshold:
+                    spool_file = tempfile.NamedTemporaryFile(
+                        prefix="llmatk-", suffix=".download", delete=False
+                    )
+                    spool_file.writelines(chunks)
+                    chunks = []
+                if spool_file is not None:
+                    spool_file.write(chunk)
+                else:
+                    chunks.append(chunk)
+        except BaseException:
+            if spool_file is not None:
+                spool_file.close()
+                os.unlink(spool_file.name)
+            raise
+
+        if spool_file is not None:
+            spool_file.close()
+            logger.debug(f"Spooled {size} bytes from {response.url} to disk")
+            return DownloadedBody(sha256.hexdigest(), path=spool_file.name)
+        return DownloadedBody(sha256.hexdigest(), content=b"".join(chunks))
+    finally:
+        response.close()
@@ -0,0 +1,106 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class NotModifiedError(Exception):
+    """Levée lorsque le serveur répond 304 Not Modified à une requête conditionnelle."""
+
+
+class CrawlStateStore:
+    """État persistant d'un crawl (ETag, Last-Modified, lastmod et hash par URL).
+
+    L'état est stocké dans un fichier JSON et réécrit de manière atomique. L'état des
+    pages renvoyées à l'appelant est préparé (stage) et n'est appliqué qu'une fois
+    qu'il a confirmé les avoir traitées (commit) : une page non écrite dans le cache
+    ou non ingérée n'est jamais considérée inchangée au crawl suivant.
+    """
+
+    def __init__(self, path: str):
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] = self._load()
+        self._staged: dict[str, dict] = {}
+
+    def _load(self) -> dict:
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            logger.info(f"No crawl state found at {self._path}, starting a new one.")
+        except json.JSONDecodeError as e:
+            logger.warning(f"Invalid crawl state file {self._path}, ignored: {e}")
+        return {}
+
+    def get(self, url: str) -> Optional[dict]:
+        """Retourne l'état enregistré pour une URL.
+
+        Args:
+            url (str): URL de la page
+
+        Returns:
+            Optional[dict]: État de l'URL ou None si elle n'a jamais été récupérée
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            return dict(entry) if entry else None
+
+    def update(self, url: str, **fields):
+        """Met à jour l'état d'une URL (les champs à None sont ignorés).
+
+        Args:
+            url (str): URL de la page
+            **fields: Champs à enregistrer (etag, last_modified, lastmod, content_hash)
+        """
+        with self._lock:
+            entry = self._entries.setdefault(url, {})
+            entry.update({k: v for k, v in fields.items() if v is not None})
+
+    def stage(self, url: str, **fields):
+        """Prépare la mise à jour de l'état d'une URL, appliquée par commit.
+
+        Args:
+            url (str): URL de la page
+            **fields: Champs à enregistrer (etag, last_modified, lastmod, content_hash)
+        """
+        with self._lock:
+            entry = self._staged.setdefault(url, {})
+            entry.update({k: v for k, v in fields.items() if v is not None})
+
+    def commit(self, urls: Iterable[str]):
+        """Applique les mises à jour préparées des URLs traitées et enregistre l'état.
+
+        Args:
+            urls (Iterable[str]): URLs des pages traitées par l'appelant
+        """
+        with self._lock:
+            committed = 0
+            for url in urls:
+                fields = self._staged.pop(url, None)
+                if fields:
+                    self._entries.setdefault(url, {}).update(fields)
+                    committed += 1
+        if committed:
+            self.save()
+
+    def save(self):
+        """Écrit l'état sur disque (écriture dans un fichier temporaire puis renommage)."""
+        with self._lock:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self._path.parent, prefix=f".{self._path.name}.", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(self._entries, f, ensure_ascii=False)
+                os.replace(tmp_path, self._path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        logger.debug(f"Crawl state saved to {self._path}")
@@ -0,0 +1,258 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def hash_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Calcule le hash SHA-256 du contenu d'un fichier, bloc par bloc.
+
+    Args:
+        path (str): Chemin du fichier
+        chunk_size (int): Taille des blocs lus
+
+    Returns:
+        str: Hash SHA-256 hexadécimal
+    """
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+class FSManifest:
+    """Manifeste persistant des fichiers lus par un reader (taille, mtime et hash).
+
+    Le manifeste associe le chemin relatif de chaque fichier à sa taille, sa date de
+    modification et le hash de son contenu lors du dernier chargement, ainsi qu'aux
+    doc_ids des documents produits lorsqu'ils diffèrent du chemin relatif (fichier
+    découpé en plusieurs documents). Il est stocké dans un fichier JSON et réécrit de
+    manière atomique. L'état d'un fichier dont les documents ont été renvoyés est
+    préparé (stage) et n'est appliqué qu'une fois tous ses documents confirmés par
+    l'appelant (commit), avant ou après la préparation : le dernier fichier d'un lot
+    n'est préparé qu'à la lecture du lot suivant.
+    """
+
+    def __init__(self, path: str):
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] = self._load()
+        # Fichier -> (entrée, doc_ids non confirmés) et doc_id -> fichier
+        self._staged: dict[str, tuple[dict, set[str]]] = {}
+        self._staged_doc_ids: dict[str, str] = {}
+        # doc_ids confirmés avant la préparation de leur fichier
+        self._committed_doc_ids: set[str] = set()
+
+    def _load(self) -> dict:
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            logger.info(f"No manifest found at {self._path}, starting a new one.")
+        except json.JSONDecodeError as e:
+            logger.warning(f"Invalid manifest file {self._path}, ignored: {e}")
+        return {}
+
+    def is_unchanged(self, relative_path: str, path: str, stat: os.stat_result) -> bool:
+        """Indique si un fichier est identique à celui enregistré dans le manifeste.
+
+        Le hash du contenu n'est calculé que si la taille ou la date de modification
+        ont changé ; un fichier seulement "touché" est donc considéré inchangé (et son
+        entrée mise à jour).
+
+        Args:
+            relative_path (str): Chemin relatif du fichier (clé du manifeste)
+            path (str): Chemin du fichier
+            stat (os.stat_result): stat() du fichier
+
+        Returns:
+            bool: True si le fichier n'a pas changé depuis le dernier chargement
+        """
+        with self._lock:
+            entry = self._entries.get(relative_path)
+        if entry is None:
+            return False
+        if entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+            return True
+        if entry["size"] != stat.st_size:
+            return False
+
+        content_hash = hash_file(path)
+        if content_hash != entry["content_hash"]:
+            return False
+        self.update(relative_path, stat, content_hash)
+        return True
+
+    def update(
+        self,
+        relative_path: str,
+        stat: os.stat_result,
+        content_hash: Optional[str] = None,
+        path: Optional[str] = None,
+        doc_ids: Optional[list[str]] = None,
+    ) -> list[str]:
+        """Enregistre l'état d'un fichier.
+
+        Args:
+            relative_path (str): Chemin relatif du fichier
+            stat (os.stat_result): stat() du fichier
+            content_hash (Optional[str]): Hash du contenu, calculé à partir de path si absent
+            path (Optional[str]): Chemin du fichier
+            doc_ids (Optional[list[str]]): doc_ids produits (par défaut conservés, ou le
+                chemin relatif pour un nouveau fichier)
+
+        Returns:
+            list[str]: doc_ids produits lors du chargement précédent qui ne le sont plus
+        """
+        entry, stale_doc_ids = self._make_entry(
+            relative_path, stat, content_hash, path, doc_ids
+        )
+        with self._lock:
+            self._entries[relative_path] = entry
+        return stale_doc_ids
+
+    def stage(
+        self,
+        relative_path: str,
+        stat: os.stat_result,
+        path: str,
+        doc_ids: list[str],
+    ) -> list[str]:
+        """Prépare l'état d'un fichier, appliqué par commit une fois ses documents confirmés.
+
+        Args:
+            relative_path (str): Chemin relatif du fichier
+            stat (os.stat_result): stat() du fichier
+            path (str): Chemin du fichier
+            doc_ids (list[str]): doc_ids produits
+
+        Returns:
+            list[str]: doc_ids produits lors du chargement précédent qui ne le sont plus
+        """
+        entry, stale_doc_ids = self._make_entry(
+            relative_path, stat, None, path, doc_ids
+        )
+        with self._lock:
+            pending_doc_ids = set(doc_ids) - self._committed_doc_ids
+            self._committed_doc_ids.difference_update(doc_ids)
+            if pending_doc_ids:
+                self._staged[relative_path] = (entry, pending_doc_ids)
+                for doc_id in pending_doc_ids:
+                    self._staged_doc_ids[doc_id] = relative_path
+            else:
+                self._entries[relative_path] = entry
+        if not pending_doc_ids:
+            # Au plus un fichier par lot (le dernier) est enregistré ici
+            self.save()
+        return stale_doc_ids
+
+    def commit(self, doc_ids: Iterable[str]):
+        """Applique l'état des fichiers dont tous les documents sont confirmés et enregistre le manifeste.
+
+        Args:
+            doc_ids (Iterable[str]): doc_ids traités par l'appelant
+        """
+        committed = 0
+        with self._lock:
+            for doc_id in doc_ids:
+                relative_path = self._staged_doc_ids.pop(doc_id, None)
+                if relative_path is None:
+                    self._committed_doc_ids.add(doc_id)
+                    continue
+                entry, pending_doc_ids = self._staged[relative_path]
+                pending_doc_ids.discard(doc_id)
+                if not pending_doc_ids:
+                    del self._staged[relative_path]
+                    self._entries[relative_path] = entry
+                    committed += 1
+        if committed:
+            self.save()
+
+    def _make_entry(
+        self,
+        relative_path: str,
+        stat: os.stat_result,
+        content_hash: Optional[str],
+        path: Optional[str],
+        doc_ids: Optional[list[str]],
+    ) -> tuple[dict, list[str]]:
+        """Construit l'entrée d'un fichier et la liste des doc_ids qui ne sont plus produits."""
+        if content_hash is None:
+            content_hash = hash_file(path)
+        with self._lock:
+            previous = self._entries.get(relative_path)
+        entry = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "content_hash": content_hash,
+        }
+        if doc_ids is None and previous is not None and "doc_ids" in previous:
+            entry["doc_ids"] = previous["doc_ids"]
+        elif doc_ids is not None and doc_ids != [relative_path]:
+            entry["doc_ids"] = list(doc_ids)
+
+        if previous is None or doc_ids is None:
+            return entry, []
+        doc_ids = set(doc_ids)
+        previous_doc_ids = previous.get("doc_ids", [relative_path])
+        return entry, [doc_id for doc_id in previous_doc_ids if doc_id not in doc_ids]
+
+    def get_doc_ids(self, relative_path: str) -> list[str]:
+        """Retourne les doc_ids produits par un fichier lors du dernier chargement.
+
+        Args:
+            relative_path (str): Chemin relatif du fichier
+
+        Returns:
+            list[str]: doc_ids du fichier, vide s'il est absent du manifeste
+        """
+        with self._lock:
+            entry = self._entries.get(relative_path)
+        if entry is None:
+            return []
+        return list(entry.get("doc_ids", [relative_path]))
+
+    def remove(self, relative_path: str):
+        """Retire un fichier du manifeste (il sera retraité au prochain chargement)."""
+        with self._lock:
+            self._entries.pop(relative_path, None)
+
+    def prune(self, seen_paths: Iterable[str]) -> list[str]:
+        """Retire du manifeste les fichiers qui n'ont pas été trouvés.
+
+        Args:
+            seen_paths (Iterable[str]): Chemins relatifs des fichiers trouvés
+
+        Returns:
+            list[str]: doc_ids des fichiers supprimés depuis le dernier chargement
+        """
+        seen_paths = set(seen_paths)
+        deleted = []
+        with self._lock:
+            for relative_path in sorted(set(self._entries) - seen_paths):
+                entry = self._entries.pop(relative_path)
+                deleted.extend(entry.get("doc_ids", [relative_path]))
+        return deleted
+
+    def save(self):
+        """Écrit le manifeste sur disque (écriture dans un fichier temporaire puis renommage)."""
+        with self._lock:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self._path.parent, prefix=f".{self._path.name}.", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(self._entries, f, ensure_ascii=False)
+                os.replace(tmp_path, self._path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        logger.debug(f"Manifest saved to {self._path}")
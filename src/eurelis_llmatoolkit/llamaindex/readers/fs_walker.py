@@ -0,0 +1,151 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Iterable, Iterator, NamedTuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+class WalkedFile(NamedTuple):
+    """Fichier trouvé lors du parcours, avec le résultat de son stat()."""
+
+    path: Path
+    relative_path: str
+    stat: os.stat_result
+
+
+def _as_patterns(patterns: Union[str, Iterable[str], None]) -> list[str]:
+    if not patterns:
+        return []
+    if isinstance(patterns, str):
+        return [patterns]
+    return list(patterns)
+
+
+class FSWalker:
+    """Parcours récursif d'un répertoire basé sur os.scandir.
+
+    Les motifs sont comparés au chemin relatif depuis la fin, comme Path.rglob :
+    "*.txt" correspond à tous les fichiers .txt, "docs/*.txt" aux fichiers .txt d'un
+    répertoire docs. Un motif d'exclusion correspondant à un répertoire l'exclut
+    entièrement sans le parcourir ; un motif terminé par "/" ne s'applique qu'aux
+    répertoires (ex: "archive/").
+
+    Avec workers > 1, les sous-répertoires de premier niveau sont parcourus en
+    parallèle (utile sur les partages réseau, où chaque appel est coûteux). L'ordre
+    des fichiers renvoyés est toujours le même (tri par nom dans chaque répertoire).
+    """
+
+    def __init__(
+        self,
+        include: Union[str, Iterable[str]] = "*",
+        exclude: Union[str, Iterable[str], None] = None,
+        workers: int = 1,
+        follow_symlinks: bool = False,
+    ):
+        self._include = _as_patterns(include) or ["*"]
+        self._exclude_files = []
+        self._exclude_dirs = []
+        for pattern in _as_patterns(exclude):
+            if pattern.endswith("/"):
+                self._exclude_dirs.append(pattern.rstrip("/"))
+            else:
+                self._exclude_files.append(pattern)
+                self._exclude_dirs.append(pattern)
+        self._workers = max(1, workers)
+        self._follow_symlinks = follow_symlinks
+
+    @classmethod
+    def from_config(cls, config: dict, default_glob: str = "*") -> "FSWalker":
+        """Crée le parcours à partir de la configuration d'un reader (glob, exclude,
+        walk_workers, follow_symlinks)."""
+        return cls(
+            include=config.get("glob", default_glob),
+            exclude=config.get("exclude", None),
+            workers=config.get("walk_workers", 1),
+            follow_symlinks=config.get("follow_symlinks", False),
+        )
+
+    @staticmethod
+    def _matches(relative_path: str, patterns: list[str]) -> bool:
+        path = PurePosixPath(relative_path)
+        return any(path.match(pattern) for pattern in patterns)
+
+    def _scan(self, directory: str, relative_dir: str) -> tuple[list, list]:
+        """Liste un répertoire : fichiers retenus et sous-répertoires à parcourir."""
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                entries = sorted(entries, key=lambda entry: entry.name)
+        except OSError as e:
+            logger.warning(f"Unable to list directory {directory}: {e}")
+            return files, subdirs
+
+        for entry in entries:
+            relative_path = (
+                f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+            )
+            try:
+                if entry.is_dir(follow_symlinks=self._follow_symlinks):
+                    if not self._matches(relative_path, self._exclude_dirs):
+                        subdirs.append((entry.path, relative_path))
+                    continue
+                if not entry.is_file(follow_symlinks=self._follow_symlinks):
+                    continue
+                if not self._matches(relative_path, self._include):
+                    continue
+                if self._matches(relative_path, self._exclude_files):
+                    continue
+                files.append(
+                    WalkedFile(
+                        Path(entry.path),
+                        relative_path,
+                        entry.stat(follow_symlinks=self._follow_symlinks),
+                    )
+                )
+            except OSError as e:
+                logger.warning(f"Unable to read {entry.path}: {e}")
+        return files, subdirs
+
+    def _walk_dir(self, directory: str, relative_dir: str) -> Iterator[WalkedFile]:
+        # Parcours en profondeur itératif, les fichiers d'un répertoire avant ses
+        # sous-répertoires
+        stack = [(directory, relative_dir)]
+        while stack:
+            current, current_relative = stack.pop()
+            files, subdirs = self._scan(current, current_relative)
+            yield from files
+            stack.extend(reversed(subdirs))
+
+    def walk(self, base_dir: Union[str, Path]) -> Iterator[WalkedFile]:
+        """Parcourt base_dir et renvoie les fichiers correspondant aux motifs.
+
+        Args:
+            base_dir (Union[str, Path]): Répertoire à parcourir
+
+        Returns:
+            Iterator[WalkedFile]: Fichiers trouvés, avec leur chemin relatif et leur stat
+        """
+        base_dir = str(base_dir)
+        if self._workers <= 1:
+            yield from self._walk_dir(base_dir, "")
+            return
+
+        files, subdirs = self._scan(base_dir, "")
+        yield from files
+        if not subdirs:
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=min(self._workers, len(subdirs)),
+            thread_name_prefix="fs-walker",
+        ) as executor:
+            # map conserve l'ordre des sous-répertoires ; chaque sous-arbre est
+            # collecté entièrement par son thread
+            results = executor.map(
+                lambda subdir: list(self._walk_dir(*subdir)), subdirs
+            )
+            for subdir_files in results:
+                yield from subdir_files
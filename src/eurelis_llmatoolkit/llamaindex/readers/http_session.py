@@ -0,0 +1,141 @@
+import threading
+from functools import partial
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+class ConnectionStats:
+    """Compteurs thread-safe des requêtes envoyées et des connexions ouvertes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    def as_dict(self) -> dict:
+        """Retourne les statistiques de réutilisation des connexions.
+
+        Returns:
+            dict: Nombre de requêtes, de connexions ouvertes et de connexions réutilisées.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections,
+                "connections_reused": max(0, self.requests - self.connections),
+            }
+
+
+class _CountingHTTPConnection(HTTPConnection):
+    def __init__(self, *args, stats: ConnectionStats, keep_alive: bool, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats = stats
+        self._keep_alive = keep_alive
+
+    def connect(self):
+        # Appelé à chaque ouverture, y compris la reconnexion d'une connexion fermée
+        self._stats.record_connection()
+        super().connect()
+
+    @property
+    def is_connected(self) -> bool:
+        # Sans keep-alive, le pool ferme la connexion avant de la réutiliser : le
+        # serveur peut l'avoir fermée sans renvoyer "Connection: close"
+        return self._keep_alive and super().is_connected
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def __init__(self, *args, stats: ConnectionStats, keep_alive: bool, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats = stats
+        self._keep_alive = keep_alive
+
+    def connect(self):
+        self._stats.record_connection()
+        super().connect()
+
+    @property
+    def is_connected(self) -> bool:
+        return self._keep_alive and super().is_connected
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+    def __init__(self, *args, stats: ConnectionStats, keep_alive: bool, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.conn_kw["stats"] = stats
+        self.conn_kw["keep_alive"] = keep_alive
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+    def __init__(self, *args, stats: ConnectionStats, keep_alive: bool, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.conn_kw["stats"] = stats
+        self.conn_kw["keep_alive"] = keep_alive
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter comptabilisant les requêtes et les ouvertures de connexions TCP/TLS."""
+
+    def __init__(self, stats: ConnectionStats, keep_alive: bool = True, **kwargs):
+        # Doivent être définis avant super().__init__ qui appelle init_poolmanager
+        self.stats = stats
+        self.keep_alive = keep_alive
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        pool_kwargs = {"stats": self.stats, "keep_alive": self.keep_alive}
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": partial(_CountingHTTPConnectionPool, **pool_kwargs),
+            "https": partial(_CountingHTTPSConnectionPool, **pool_kwargs),
+        }
+
+    def send(self, request, *args, **kwargs):
+        self.stats.record_request()
+        return super().send(request, *args, **kwargs)
+
+
+def create_pooled_session(config: dict, stats: ConnectionStats) -> requests.Session:
+    """Crée une session requests avec un pool de connexions keep-alive.
+
+    Args:
+        config (dict): Configuration du reader (pool_connections, pool_maxsize, keep_alive)
+        stats (ConnectionStats): Compteurs alimentés par la session
+
+    Returns:
+        requests.Session: Session partagée par toutes les requêtes du reader
+    """
+    # Au moins autant de connexions par hôte que de requêtes simultanées
+    default_maxsize = max(10, config.get("max_concurrent_requests", 10))
+    keep_alive = config.get("keep_alive", True)
+
+    adapter = PooledHTTPAdapter(
+        stats,
+        keep_alive=keep_alive,
+        pool_connections=config.get("pool_connections", 10),
+        pool_maxsize=config.get("pool_maxsize", default_maxsize),
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+
+    return session
@@ -0,0 +1,154 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PDFExtractionCache:
+    """Cache disque des extractions markdown de PDF.
+
+    Les extractions sont indexées par le hash SHA-256 du contenu brut du PDF (ou par
+    l'empreinte d'une page pour PDFFileReader avec pages_per_section) ; chaque URL est
+    associée à son dernier ETag et au hash de son contenu, ce qui permet d'envoyer une
+    requête conditionnelle puis de réutiliser l'extraction sans retélécharger le PDF.
+    La taille totale est bornée par une éviction LRU.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir: str, max_size_mb: float = 1024):
+        self._dir = Path(cache_dir)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._max_size = int(max_size_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._url_locks: defaultdict = defaultdict(threading.Lock)
+        self._urls, self._entries = self._load_index()
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional["PDFExtractionCache"]:
+        """Crée le cache à partir de la configuration d'un reader (pdf_cache_dir, pdf_cache_max_size_mb)."""
+        cache_dir = config.get("pdf_cache_dir", None)
+        if not cache_dir:
+            return None
+        return cls(cache_dir, config.get("pdf_cache_max_size_mb", 1024))
+
+    def _load_index(self) -> Tuple[dict, dict]:
+        try:
+            with open(self._dir / self.INDEX_FILE, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            return index.get("urls", {}), index.get("entries", {})
+        except FileNotFoundError:
+            return {}, {}
+        except json.JSONDecodeError as e:
+            logger.warning(f"Invalid PDF cache index in {self._dir}, ignored: {e}")
+            return {}, {}
+
+    def _entry_path(self, content_hash: str) -> Path:
+        return self._dir / content_hash[:2] / f"{content_hash}.json"
+
+    def lock_url(self, url: str) -> threading.Lock:
+        """Verrou propre à une URL, évitant de traiter plusieurs fois un même PDF en parallèle."""
+        with self._lock:
+            return self._url_locks[url]
+
+    def get_url(self, url: str) -> Optional[dict]:
+        """Retourne l'ETag et le hash associés à une URL.
+
+        Args:
+            url (str): URL du PDF
+
+        Returns:
+            Optional[dict]: Dictionnaire {"etag", "hash"} ou None si l'URL est inconnue
+        """
+        with self._lock:
+            link = self._urls.get(url)
+            return dict(link) if link else None
+
+    def link_url(self, url: str, etag: Optional[str], content_hash: str):
+        """Associe une URL à son ETag et au hash de son contenu."""
+        with self._lock:
+            self._urls[url] = {"etag": etag, "hash": content_hash}
+
+    def get(self, content_hash: str) -> Optional[Tuple[Optional[str], str]]:
+        """Retourne l'extraction d'un PDF à partir du hash de son contenu.
+
+        Args:
+            content_hash (str): Hash SHA-256 du contenu du PDF
+
+        Returns:
+            Optional[Tuple[Optional[str], str]]: Titre et texte markdown, None si absent
+        """
+        try:
+            with open(self._entry_path(content_hash), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        with self._lock:
+            if content_hash in self._entries:
+                self._entries[content_hash]["last_access"] = time.time()
+        return entry["title"], entry["text"]
+
+    def put(self, content_hash: str, title: Optional[str], text: str):
+        """Enregistre l'extraction d'un PDF puis applique la limite de taille.
+
+        Args:
+            content_hash (str): Hash SHA-256 du contenu du PDF
+            title (Optional[str]): Titre du PDF
+            text (str): Texte markdown extrait
+        """
+        path = self._entry_path(content_hash)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_json(path, {"title": title, "text": text})
+
+        with self._lock:
+            self._entries[content_hash] = {
+                "size": path.stat().st_size,
+                "last_access": time.time(),
+            }
+            self._evict()
+
+    def _evict(self):
+        """Supprime les extractions les moins récemment utilisées au-delà de la taille maximale."""
+        total_size = sum(entry["size"] for entry in self._entries.values())
+        if total_size <= self._max_size:
+            return
+
+        by_last_access = sorted(
+            self._entries.items(), key=lambda item: item[1]["last_access"]
+        )
+        for content_hash, entry in by_last_access:
+            if total_size <= self._max_size:
+                break
+            self._entry_path(content_hash).unlink(missing_ok=True)
+            del self._entries[content_hash]
+            total_size -= entry["size"]
+            logger.debug(f"Evicted PDF extraction {content_hash} from cache")
+
+    def save(self):
+        """Écrit l'index du cache sur disque."""
+        with self._lock:
+            index = {"urls": self._urls, "entries": self._entries}
+            self._write_json(self._dir / self.INDEX_FILE, index)
+        logger.debug(f"PDF extraction cache index saved to {self._dir}")
+
+    @staticmethod
+    def _write_json(path: Path, data: dict):
+        """Écrit un fichier JSON de manière atomique (fichier temporaire puis renommage)."""
+        fd, tmp_path = tempfile.mkstemp(
+            dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,270 @@
+import hashlib
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+def pdf_to_markdown(source: Union[bytes, str]) -> Tuple[Optional[str], str]:
+    """Convertit un PDF au format markdown.
+
+    Fonction exécutée dans les processus du pool : elle doit rester au niveau du module.
+
+    Args:
+        source (Union[bytes, str]): Contenu du PDF ou chemin du fichier
+
+    Returns:
+        Tuple[Optional[str], str]: Titre du PDF (None s'il est absent) et texte markdown
+    """
+    import pymupdf4llm
+
+    with _open_pdf(source) as pdf_file:
+        title = _pdf_title(pdf_file)
+
+        # Extraction au format MD
+        pdf_md_text = pymupdf4llm.to_markdown(pdf_file, show_progress=False)
+
+    return title, pdf_md_text
+
+
+def pdf_pages_to_markdown(source: Union[bytes, str], pages: List[int]) -> List[str]:
+    """Convertit des pages d'un PDF au format markdown.
+
+    Fonction exécutée dans les processus du pool : elle doit rester au niveau du module.
+
+    Args:
+        source (Union[bytes, str]): Contenu du PDF ou chemin du fichier
+        pages (List[int]): Numéros des pages à convertir (à partir de 0)
+
+    Returns:
+        List[str]: Texte markdown de chaque page, dans l'ordre de pages
+    """
+    import pymupdf4llm
+
+    with _open_pdf(source) as pdf_file:
+        chunks = pymupdf4llm.to_markdown(
+            pdf_file, pages=pages, page_chunks=True, show_progress=False
+        )
+    texts = {chunk["metadata"]["page_number"] - 1: chunk["text"] for chunk in chunks}
+    return [texts.get(page, "") for page in pages]
+
+
+def pdf_page_hashes(source: Union[bytes, str]) -> Tuple[Optional[str], List[str]]:
+    """Calcule une empreinte de chaque page d'un PDF, sans conversion.
+
+    L'empreinte couvre les flux de contenu de la page, ses dimensions et le hash de ses
+    images : une page inchangée d'un PDF réédité garde la même empreinte.
+
+    Args:
+        source (Union[bytes, str]): Contenu du PDF ou chemin du fichier
+
+    Returns:
+        Tuple[Optional[str], List[str]]: Titre du PDF et hash SHA-256 de chaque page
+    """
+    page_hashes = []
+    with _open_pdf(source) as pdf_file:
+        title = _pdf_title(pdf_file)
+        for page in pdf_file:
+            sha256 = hashlib.sha256()
+            sha256.update(f"{tuple(page.rect)}:{page.rotation}".encode("utf-8"))
+            for xref in page.get_contents():
+                sha256.update(pdf_file.xref_stream_raw(xref) or b"")
+            for image in page.get_image_info(hashes=True):
+                sha256.update(image.get("digest") or b"")
+            page_hashes.append(sha256.hexdigest())
+    return title, page_hashes
+
+
+def _open_pdf(source: Union[bytes, str]):
+    import pymupdf
+
+    if isinstance(source, bytes):
+        return pymupdf.open(stream=source)
+    return pymupdf.open(source)
+
+
+def _pdf_title(pdf_file) -> Optional[str]:
+    title = pdf_file.metadata.get("title") if pdf_file.metadata else None
+    if isinstance(title, bytes):
+        title = title.decode("utf-8")
+    if title is not None and not title.strip():
+        title = None
+    return title
+
+
+def _register_worker(worker_pids):
+    """Initialise un processus du pool en transmettant son pid au processus parent."""
+    worker_pids.put(os.getpid())
+
+
+class _WorkerPool(ProcessPoolExecutor):
+    """ProcessPoolExecutor dont les processus peuvent être arrêtés.
+
+    Chaque processus transmet son pid au démarrage : ProcessPoolExecutor n'offre pas
+    d'API publique pour tuer ses workers avant Python 3.14.
+    """
+
+    def __init__(self, max_workers: int):
+        # "spawn" évite de forker un processus possédant des threads actifs
+        mp_context = multiprocessing.get_context("spawn")
+        self._worker_pids = mp_context.SimpleQueue()
+        super().__init__(
+            max_workers=max_workers,
+            mp_context=mp_context,
+            initializer=_register_worker,
+            initargs=(self._worker_pids,),
+        )
+
+    def terminate_workers(self):
+        """Arrête les processus démarrés par le pool."""
+        while not self._worker_pids.empty():
+            try:
+                os.kill(self._worker_pids.get(), signal.SIGTERM)
+            except OSError:
+                pass  # Processus déjà terminé
+
+
+class PDFExtractor:
+    """Convertit des PDF en markdown, dans le processus courant ou dans un pool de processus.
+
+    Avec workers > 0, les conversions sont exécutées dans un ProcessPoolExecutor et
+    chaque document est limité à timeout secondes : en cas de dépassement, les
+    processus du pool sont arrêtés et un nouveau pool est créé. Les conversions
+    interrompues par cet arrêt sont soumises une nouvelle fois au nouveau pool.
+    """
+
+    def __init__(self, workers: int = 0, timeout: Optional[float] = None):
+        self._workers = workers
+        self._timeout = timeout
+        self._executor: Optional[_WorkerPool] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict) -> "PDFExtractor":
+        """Crée un extracteur à partir de la configuration d'un reader (pdf_workers, pdf_timeout)."""
+        return cls(
+            workers=config.get("pdf_workers", 0),
+            timeout=config.get("pdf_timeout", None),
+        )
+
+    def extract(self, source: Union[bytes, str]) -> Tuple[Optional[str], str]:
+        """Convertit un PDF au format markdown.
+
+        Args:
+            source (Union[bytes, str]): Contenu du PDF ou chemin du fichier
+
+        Returns:
+            Tuple[Optional[str], str]: Titre du PDF (None s'il est absent) et texte markdown
+
+        Raises:
+            TimeoutError: Si la conversion dépasse le timeout configuré
+        """
+        if self._workers <= 0:
+            return pdf_to_markdown(source)
+
+        try:
+            return self._extract_in_pool(source)
+        except (BrokenProcessPool, CancelledError):
+            # Pool arrêté pendant la conversion (timeout d'un autre document ou
+            # plantage d'un worker) : nouvelle tentative dans un nouveau pool
+            return self._extract_in_pool(source)
+
+    def extract_pages(
+        self, source: Union[bytes, str], page_batches: List[List[int]]
+    ) -> Iterator[List[str]]:
+        """Convertit des lots de pages d'un PDF au format markdown.
+
+        Avec workers > 0, tous les lots sont soumis au pool et convertis en parallèle ;
+        les résultats sont renvoyés dans l'ordre des lots, chacun limité à timeout
+        secondes. Si le pool est arrêté pendant la conversion, les lots restants sont
+        soumis une nouvelle fois à un nouveau pool.
+
+        Args:
+            source (Union[bytes, str]): Contenu du PDF ou chemin du fichier
+            page_batches (List[List[int]]): Lots de numéros de pages (à partir de 0)
+
+        Returns:
+            Iterator[List[str]]: Texte markdown des pages de chaque lot
+
+        Raises:
+            TimeoutError: Si la conversion d'un lot dépasse le timeout configuré
+        """
+        if self._workers <= 0:
+            for pages in page_batches:
+                yield pdf_pages_to_markdown(source, pages)
+            return
+
+        pending_batches = list(page_batches)
+        retried = False
+        while pending_batches:
+            with self._lock:
+                executor = self._get_executor()
+                futures = [
+                    executor.submit(pdf_pages_to_markdown, source, pages)
+                    for pages in pending_batches
+                ]
+            try:
+                for index, future in enumerate(futures):
+                    try:
+                        pages_text = self._wait(executor, future)
+                    except (BrokenProcessPool, CancelledError):
+                        # Pool arrêté pendant la conversion (timeout d'un autre
+                        # document ou plantage d'un worker) : nouvelle tentative des
+                        # lots restants dans un nouveau pool
+                        if retried:
+                            raise
+                        retried = True
+                        pending_batches = pending_batches[index:]
+                        break
+                    yield pages_text
+                else:
+                    pending_batches = []
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _extract_in_pool(self, source: Union[bytes, str]) -> Tuple[Optional[str], str]:
+        with self._lock:
+            executor = self._get_executor()
+            future = executor.submit(pdf_to_markdown, source)
+        return self._wait(executor, future)
+
+    def _wait(self, executor: _WorkerPool, future: Future):
+        try:
+            return future.result(timeout=self._timeout)
+        except FuturesTimeoutError:
+            self._discard_executor(executor, terminate=True)
+            raise TimeoutError(
+                f"PDF extraction exceeded {self._timeout} seconds"
+            ) from None
+        except (BrokenProcessPool, CancelledError):
+            self._discard_executor(executor)
+            raise
+
+    def _get_executor(self) -> _WorkerPool:
+        if self._executor is None:
+            self._executor = _WorkerPool(self._workers)
+        return self._executor
+
+    def _discard_executor(self, executor: _WorkerPool, terminate: bool = False):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        if terminate:
+            logger.warning("Terminating PDF extraction workers")
+            executor.terminate_workers()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        """Arrête le pool de processus s'il a été créé."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -1,35 +1,183 @@
+import logging
 import os
 from pathlib import Path
+from typing import Any, Iterator, Optional
 
 from llama_index.core.schema import Document
 
 from eurelis_llmatoolkit.llamaindex.readers.abstract_fs_reader import AbstractFSReader
+from eurelis_llmatoolkit.llamaindex.readers.pdf_cache import PDFExtractionCache
+from eurelis_llmatoolkit.llamaindex.readers.pdf_extraction import (
+    PDFExtractor,
+    pdf_page_hashes,
+)
+
+logger = logging.getLogger(__name__)
+
+# Métadonnées de position, inutiles pour les embeddings
+SECTION_METADATA_KEYS = ["part", "page_start", "page_end"]
 
 
 class PDFFileReader(AbstractFSReader):
+    """Reader de fichiers PDF, convertis au format markdown.
+
+    Avec l'option pages_per_section, chaque PDF est découpé en sections de
+    pages_per_section pages : les sections sont converties en parallèle (pdf_workers)
+    et renvoyées sous forme de Documents "<chemin>#part-<N>" avec les pages couvertes
+    dans les métadonnées. Avec pdf_cache_dir, la conversion de chaque page est mise en
+    cache selon l'empreinte de la page : seules les pages modifiées d'un PDF réédité
+    sont reconverties.
+    """
+
+    # La conversion des PDF est limitée par le CPU
+    default_worker_type = "process"
+    # Les processus du pool convertissent eux-mêmes les PDF, sans pool imbriqué ; le
+    # cache des pages n'est pas partagé entre processus
+    worker_excluded_options = AbstractFSReader.worker_excluded_options + (
+        "pdf_workers",
+        "pdf_cache_dir",
+    )
+
     def __init__(self, config: dict, namespace: str = None):
         super().__init__(config)
         self._namespace = namespace
+        self._pdf_extractor = PDFExtractor.from_config(config)
+        self._pages_per_section = config.get("pages_per_section", 0)
+        self._page_cache = (
+            PDFExtractionCache.from_config(config)
+            if self._pages_per_section > 0
+            else None
+        )
+        if (
+            self._page_cache is not None
+            and self._workers > 0
+            and self._worker_type == "process"
+        ):
+            logger.warning(
+                "pdf_cache_dir is not used by process workers, "
+                "set worker_type to 'thread' to reuse converted pages"
+            )
 
-    def _process_file(self, path: Path) -> Document:
-        """Traite un fichier et retourne un objet Document.
+    def lazy_load_data(self, *args: Any, **kwargs: Any) -> Iterator[Document]:
+        try:
+            yield from super().lazy_load_data(*args, **kwargs)
+        finally:
+            self._pdf_extractor.close()
+            if self._page_cache is not None:
+                self._page_cache.save()
+
+    def _process_file_documents(self, path: Path) -> Iterator[Document]:
+        """Traite un fichier et retourne ses documents au fil de la conversion.
 
         Args:
-            file (Path): Le fichier à traiter.
+            path (Path): Le fichier à traiter.
+
+        Returns:
+            Iterator[Document]: Un Document par section (ou pour tout le fichier sans
+            pages_per_section), aucun si l'extraction a échoué.
+        """
+        if self._pages_per_section <= 0:
+            yield from super()._process_file_documents(path)
+            return
+
+        relative_path = os.path.relpath(path, self._config["base_dir"])
+        try:
+            yield from self._process_sections(path, relative_path)
+        except Exception as e:
+            logger.error(f"Error extracting {relative_path}: {e}")
+            self._unsuccessful_docs.append(relative_path)
+
+    def _process_sections(self, path: Path, relative_path: str) -> Iterator[Document]:
+        """Convertit un PDF par sections de pages, en réutilisant les pages en cache.
+
+        Args:
+            path (Path): Le fichier à traiter.
+            relative_path (str): Le chemin relatif du fichier.
 
         Returns:
-            Document: Un objet Document.
+            Iterator[Document]: Un Document par section, dans l'ordre des pages.
         """
-        import pymupdf
-        import pymupdf4llm
+        _, page_hashes = pdf_page_hashes(str(path))
+        sections = [
+            list(range(start, min(start + self._pages_per_section, len(page_hashes))))
+            for start in range(0, len(page_hashes), self._pages_per_section)
+        ]
+
+        page_texts: dict[int, str] = {}
+        if self._page_cache is not None:
+            for page, page_hash in enumerate(page_hashes):
+                cached = self._page_cache.get(page_hash)
+                if cached is not None:
+                    page_texts[page] = cached[1]
+
+        # Seules les pages absentes du cache sont converties, un lot par section
+        page_batches = [
+            [page for page in pages if page not in page_texts] for pages in sections
+        ]
+        page_batches = [pages for pages in page_batches if pages]
+        logger.debug(
+            f"{relative_path}: {len(page_hashes)} pages, "
+            f"{len(page_hashes) - len(page_texts)} to convert"
+        )
+        pending_batches = iter(page_batches)
+        converted = self._pdf_extractor.extract_pages(str(path), page_batches)
+
+        metadata = self._get_metadatas(path, relative_path)
+        try:
+            for part, pages in enumerate(sections):
+                if any(page not in page_texts for page in pages):
+                    batch = next(pending_batches)
+                    for page, text in zip(batch, next(converted)):
+                        page_texts[page] = text
+                        if self._page_cache is not None:
+                            self._page_cache.put(page_hashes[page], None, text)
 
-        pdf = pymupdf.open(path)
+                yield self._build_section(
+                    relative_path, metadata, part, pages, page_texts
+                )
+        finally:
+            converted.close()
 
-        # Extraction au format MD
-        pdf_md_text = pymupdf4llm.to_markdown(pdf, show_progress=False)
+    def _build_section(
+        self,
+        relative_path: str,
+        metadata: dict,
+        part: int,
+        pages: list[int],
+        page_texts: dict[int, str],
+    ) -> Document:
+        return Document(
+            text="\n".join(page_texts.pop(page) for page in pages),
+            metadata={
+                **metadata,
+                "part": part,
+                "page_start": pages[0] + 1,
+                "page_end": pages[-1] + 1,
+            },
+            doc_id=f"{relative_path}#part-{part}",
+            excluded_embed_metadata_keys=list(SECTION_METADATA_KEYS),
+            excluded_llm_metadata_keys=["part"],
+        )
 
+    def _process_file(self, path: Path) -> Optional[Document]:
+        """Traite un fichier et retourne un objet Document.
+
+        Args:
+            file (Path): Le fichier à traiter.
+
+        Returns:
+            Optional[Document]: Un objet Document, None si l'extraction a échoué.
+        """
         relative_path = os.path.relpath(path, self._config["base_dir"])
 
+        try:
+            # Extraction au format MD (éventuellement dans un pool de processus)
+            _, pdf_md_text = self._pdf_extractor.extract(str(path))
+        except Exception as e:
+            logger.error(f"Error extracting {relative_path}: {e}")
+            self._unsuccessful_docs.append(relative_path)
+            return None
+
         document = Document(
             text=pdf_md_text,
             metadata=self._get_metadatas(path, relative_path),
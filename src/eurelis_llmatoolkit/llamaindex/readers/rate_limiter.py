@@ -0,0 +1,116 @@
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class HostRateLimiter:
+    """Limiteur de débit par hôte (token bucket), partagé entre les threads.
+
+    Chaque hôte dispose d'un seau de burst jetons rechargé à rate jetons par seconde.
+    Un jeton est réservé pour chaque requête ; si le seau est vide, l'appelant attend
+    que son jeton soit disponible. Un hôte peut aussi être suspendu (ex: Retry-After).
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self._rate = rate
+        self._burst = max(1, burst)
+        self._lock = threading.Lock()
+        self._buckets: dict[str, dict] = {}
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional["HostRateLimiter"]:
+        """Crée le limiteur à partir de la configuration d'un reader (requests_per_second, requests_burst)."""
+        rate = config.get("requests_per_second", -1)
+        if rate <= 0:
+            return None
+        return cls(rate, config.get("requests_burst", 1))
+
+    def _bucket(self, host: str, now: float) -> dict:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = {
+                "tokens": float(self._burst),
+                "updated": now,
+                "blocked_until": 0.0,
+            }
+            self._buckets[host] = bucket
+        return bucket
+
+    def acquire(self, url: str):
+        """Attend qu'une requête vers l'hôte de l'URL soit autorisée.
+
+        Args:
+            url (str): URL de la requête
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+            elapsed = now - bucket["updated"]
+            bucket["tokens"] = min(self._burst, bucket["tokens"] + elapsed * self._rate)
+            bucket["updated"] = now
+            # Le jeton est réservé tout de suite, quitte à rendre le solde négatif
+            bucket["tokens"] -= 1
+            delay = max(-bucket["tokens"] / self._rate, bucket["blocked_until"] - now)
+
+        if delay > 0:
+            logger.debug(f"Rate limit for {host}: sleeping for {delay:.2f} seconds")
+            time.sleep(delay)
+
+    def block(self, url: str, delay: float):
+        """Suspend les requêtes vers l'hôte de l'URL pendant delay secondes.
+
+        Args:
+            url (str): URL dont l'hôte doit être suspendu
+            delay (float): Durée de la suspension en secondes
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+            bucket["blocked_until"] = max(bucket["blocked_until"], now + delay)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Convertit un en-tête Retry-After (secondes ou date HTTP) en délai.
+
+    Args:
+        value (Optional[str]): Valeur de l'en-tête
+
+    Returns:
+        Optional[float]: Délai en secondes, None si l'en-tête est absent ou invalide
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_date.tzinfo is None:
+        retry_date = retry_date.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_date - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """Calcule le délai avant une nouvelle tentative (exponentiel avec jitter).
+
+    Args:
+        attempt (int): Numéro de la tentative échouée (à partir de 0)
+        base (float): Délai de la première nouvelle tentative en secondes
+        maximum (float): Délai maximal en secondes
+
+    Returns:
+        float: Délai en secondes, entre la moitié et la totalité du délai exponentiel
+    """
+    delay = min(maximum, base * 2**attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
@@ -0,0 +1,112 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+RAW_CACHE_MODES = ("record", "replay")
+
+
+class CachedResponse(NamedTuple):
+    """Réponse HTTP brute enregistrée dans le cache."""
+
+    url: str
+    headers: dict
+    body: bytes
+    fetched_at: float
+
+
+class RawResponseCache:
+    """Cache disque des réponses HTTP brutes (corps compressé et en-têtes).
+
+    Chaque réponse est stockée sous le hash SHA-256 de son URL : un fichier .json pour
+    l'URL et les en-têtes, un fichier .gz pour le corps. En mode "record" les réponses
+    sont toujours téléchargées puis enregistrées ; en mode "replay" les réponses
+    enregistrées sont relues sans requête HTTP, ce qui permet de reparser un site
+    (parser_remove, métadonnées...) sans le crawler à nouveau.
+    """
+
+    def __init__(self, cache_dir: str, mode: str = "record"):
+        if mode not in RAW_CACHE_MODES:
+            raise ValueError(
+                f"Invalid raw_cache_mode {mode}, expected one of {RAW_CACHE_MODES}"
+            )
+        self._dir = Path(cache_dir)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self.mode = mode
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional["RawResponseCache"]:
+        """Crée le cache à partir de la configuration d'un reader (raw_cache_dir, raw_cache_mode)."""
+        cache_dir = config.get("raw_cache_dir", None)
+        if not cache_dir:
+            return None
+        return cls(cache_dir, config.get("raw_cache_mode", "record"))
+
+    @property
+    def replay(self) -> bool:
+        return self.mode == "replay"
+
+    def _entry_path(self, url: str) -> Path:
+        url_hash = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self._dir / url_hash[:2] / url_hash
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Retourne la réponse enregistrée pour une URL.
+
+        Args:
+            url (str): URL de la requête
+
+        Returns:
+            Optional[CachedResponse]: Réponse enregistrée, None si absente
+        """
+        path = self._entry_path(url)
+        try:
+            with open(path.with_suffix(".json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with gzip.open(path.with_suffix(".gz"), "rb") as f:
+                body = f.read()
+        except (FileNotFoundError, json.JSONDecodeError, OSError, EOFError):
+            return None
+        return CachedResponse(meta["url"], meta["headers"], body, meta["fetched_at"])
+
+    def put(self, url: str, headers: dict, body: bytes):
+        """Enregistre la réponse d'une URL.
+
+        Args:
+            url (str): URL de la requête
+            headers (dict): En-têtes de la réponse
+            body (bytes): Corps de la réponse
+        """
+        path = self._entry_path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Le corps est écrit avant les métadonnées : une entrée n'est lisible
+        # qu'une fois complète
+        self._write_atomic(
+            path.with_suffix(".gz"), gzip.compress(body, compresslevel=6)
+        )
+        meta = {"url": url, "headers": dict(headers), "fetched_at": time.time()}
+        self._write_atomic(
+            path.with_suffix(".json"),
+            json.dumps(meta, ensure_ascii=False).encode("utf-8"),
+        )
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(
+            dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
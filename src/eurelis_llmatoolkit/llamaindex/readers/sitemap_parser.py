@@ -0,0 +1,150 @@
+import logging
+import tempfile
+import threading
+import xml.etree.ElementTree as ET
+import zlib
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+class SitemapEntry(NamedTuple):
+    """Entrée d'un sitemap (<url> d'un urlset ou <sitemap> d'un sitemap index)."""
+
+    loc: str
+    lastmod: str = ""
+
+
+class SpooledResponseStream:
+    """Flux de lecture d'une réponse HTTP téléchargée en arrière-plan.
+
+    Un thread télécharge la réponse (en la décompressant si elle est gzippée) dans un
+    fichier temporaire pendant que le parser lit les données déjà reçues. Le parsing
+    commence dès les premiers octets sans garder la connexion ouverte pendant tout le
+    traitement des pages, et sans charger le sitemap complet en mémoire.
+    """
+
+    def __init__(self, response: requests.Response, chunk_size: int = 64 * 1024):
+        self._response = response
+        self._chunk_size = chunk_size
+        self._file = tempfile.TemporaryFile()
+        self._condition = threading.Condition()
+        self._written = 0
+        self._position = 0
+        self._done = False
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._decompressor = None
+        self._thread = threading.Thread(
+            target=self._download, name="sitemap-download", daemon=True
+        )
+        self._thread.start()
+
+    def _download(self):
+        first_chunk = True
+        try:
+            for chunk in self._response.iter_content(chunk_size=self._chunk_size):
+                if self._closed:
+                    break
+                if first_chunk:
+                    # Sitemap .xml.gz servi sans Content-Encoding
+                    if chunk.startswith(GZIP_MAGIC):
+                        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                    first_chunk = False
+                if self._decompressor is not None:
+                    chunk = self._decompress(chunk)
+                self._append(chunk)
+        except BaseException as e:  # Transmis au thread de lecture
+            self._error = e
+        finally:
+            self._response.close()
+            with self._condition:
+                self._done = True
+                self._condition.notify_all()
+
+    def _decompress(self, chunk: bytes) -> bytes:
+        """Décompresse un bloc en gérant les fichiers gzip à plusieurs membres."""
+        data = self._decompressor.decompress(chunk)
+        while self._decompressor.eof and self._decompressor.unused_data:
+            unused = self._decompressor.unused_data
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            data += self._decompressor.decompress(unused)
+        return data
+
+    def _append(self, chunk: bytes):
+        if not chunk:
+            return
+        with self._condition:
+            self._file.seek(0, 2)
+            self._file.write(chunk)
+            self._written += len(chunk)
+            self._condition.notify_all()
+
+    def read(self, size: int = -1) -> bytes:
+        with self._condition:
+            while self._position >= self._written and not self._done:
+                self._condition.wait()
+            if self._error is not None:
+                raise self._error
+            available = self._written - self._position
+            if size is None or size < 0 or size > available:
+                size = available
+            self._file.seek(self._position)
+            data = self._file.read(size)
+            self._position += len(data)
+            return data
+
+    def close(self):
+        self._closed = True
+        self._thread.join()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(element: ET.Element, name: str) -> str:
+    child = element.find(f"{{*}}{name}")
+    if child is None or child.text is None:
+        return ""
+    return child.text.strip()
+
+
+def parse_sitemap(stream) -> Tuple[str, Iterator[SitemapEntry]]:
+    """Parse un sitemap de manière incrémentale.
+
+    Args:
+        stream: Flux binaire du sitemap (objet disposant d'une méthode read)
+
+    Returns:
+        Tuple[str, Iterator[SitemapEntry]]: Nom de l'élément racine (urlset,
+        sitemapindex) et itérateur des entrées au fur et à mesure du parsing
+    """
+    events = ET.iterparse(stream, events=("start", "end"))
+    _, root = next(events)
+    root_name = _local_name(root.tag)
+    entry_name = "sitemap" if root_name == "sitemapindex" else "url"
+
+    def iter_entries() -> Iterator[SitemapEntry]:
+        for event, element in events:
+            if event != "end" or _local_name(element.tag) != entry_name:
+                continue
+            loc = _child_text(element, "loc")
+            lastmod = _child_text(element, "lastmod")
+            # Libère les entrées déjà traitées
+            root.clear()
+            if loc:
+                yield SitemapEntry(loc, lastmod)
+
+    return root_name, iter_entries()
@@ -0,0 +1,123 @@
+import os
+from pathlib import Path
+from typing import Iterator
+
+from llama_index.core.schema import Document
+
+from eurelis_llmatoolkit.llamaindex.readers.abstract_fs_reader import AbstractFSReader
+
+DEFAULT_SECTION_SIZE = 1024 * 1024
+
+# Métadonnées de position, inutiles pour les embeddings et le LLM
+SECTION_METADATA_KEYS = ["part", "start_byte", "end_byte"]
+
+
+def _utf8_boundary(data: bytes) -> int:
+    """Retourne la position de la dernière frontière de caractère UTF-8 de data."""
+    end = len(data)
+    # Recule sur les octets de continuation (10xxxxxx), au plus 3 pour un caractère
+    for _ in range(3):
+        if end == 0 or data[end - 1] & 0xC0 != 0x80:
+            break
+        end -= 1
+    if end and data[end - 1] >= 0xC0:
+        # Premier octet d'un caractère multi-octets incomplet
+        end -= 1
+    return end
+
+
+class StreamingTXTFileReader(AbstractFSReader):
+    """Reader de fichiers texte volumineux, découpés en sections lues au fil de l'eau.
+
+    Chaque fichier est lu par fenêtres de section_size octets (1 Mo par défaut),
+    coupées à la dernière fin de ligne de la fenêtre, et chaque section est renvoyée
+    dès sa lecture sous forme d'un Document d'identifiant "<chemin>#part-<N>". Les
+    positions de la section dans le fichier sont indiquées dans les métadonnées
+    start_byte et end_byte. Avec section_size à 0, chaque fichier est renvoyé entier
+    dans un seul Document "<chemin>". Les fichiers doivent être encodés en UTF-8.
+    """
+
+    def __init__(self, config: dict, namespace: str = None):
+        super().__init__(config)
+        self._namespace = namespace
+        self._section_size = max(0, config.get("section_size", DEFAULT_SECTION_SIZE))
+
+    def _iter_sections(self, path: Path) -> Iterator[tuple[int, bytes]]:
+        """Lit un fichier par fenêtres coupées en fin de ligne.
+
+        Args:
+            path (Path): Le fichier à lire.
+
+        Returns:
+            Iterator[tuple[int, bytes]]: Position de début et contenu de chaque section.
+        """
+        offset = 0
+        pending = b""
+        with open(path, "rb") as f:
+            while True:
+                data = f.read(self._section_size - len(pending))
+                if not data:
+                    break
+                pending += data
+                if len(pending) < self._section_size:
+                    continue
+
+                end = pending.rfind(b"\n") + 1
+                if end == 0:
+                    # Ligne plus longue qu'une section : coupe entre deux caractères
+                    end = _utf8_boundary(pending) or len(pending)
+                yield offset, pending[:end]
+                offset += end
+                pending = pending[end:]
+
+        if pending or offset == 0:
+            yield offset, pending
+
+    def _process_file_documents(self, path: Path) -> Iterator[Document]:
+        """Traite un fichier et retourne ses sections au fil de la lecture.
+
+        Args:
+            path (Path): Le fichier à traiter.
+
+        Returns:
+            Iterator[Document]: Un Document par section du fichier.
+        """
+        if not self._section_size:
+            yield from super()._process_file_documents(path)
+            return
+
+        relative_path = os.path.relpath(path, self._config["base_dir"])
+        metadata = self._get_metadatas(path, relative_path)
+
+        for part, (start, content) in enumerate(self._iter_sections(path)):
+            document = Document(
+                text=content.decode("utf-8"),
+                metadata={
+                    **metadata,
+                    "part": part,
+                    "start_byte": start,
+                    "end_byte": start + len(content),
+                },
+                doc_id=f"{relative_path}#part-{part}",
+                excluded_embed_metadata_keys=list(SECTION_METADATA_KEYS),
+                excluded_llm_metadata_keys=list(SECTION_METADATA_KEYS),
+            )
+            yield document
+
+    def _process_file(self, path: Path) -> Document:
+        """Traite un fichier entier en un seul Document (section_size à 0).
+
+        Args:
+            path (Path): Le fichier à traiter.
+
+        Returns:
+            Document: Un objet Document.
+        """
+        relative_path = os.path.relpath(path, self._config["base_dir"])
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read()
+        return Document(
+            text=content,
+            metadata=self._get_metadatas(path, relative_path),
+            doc_id=relative_path,
+        )
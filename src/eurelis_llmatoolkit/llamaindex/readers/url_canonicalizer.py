@@ -0,0 +1,109 @@
+import fnmatch
+import re
+from typing import Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class URLCanonicalizer:
+    """Normalise les URLs afin qu'un même contenu ne soit récupéré qu'une seule fois.
+
+    Les règles sont définies par l'option url_canonicalization d'un reader, par exemple :
+
+        "url_canonicalization": {
+            "force_scheme": "https",
+            "strip_query_params": ["utm_*", "fbclid", "gclid"],
+            "trailing_slash": "strip",
+            "rewrites": [{"pattern": "/en-gb/", "replacement": "/en/"}]
+        }
+    """
+
+    def __init__(
+        self,
+        force_scheme: Optional[str] = None,
+        lowercase_host: bool = True,
+        remove_default_port: bool = True,
+        drop_fragment: bool = True,
+        strip_query_params: Iterable[str] = (),
+        drop_query: bool = False,
+        sort_query: bool = True,
+        trailing_slash: Optional[str] = None,
+        rewrites: Iterable[dict] = (),
+    ):
+        if trailing_slash not in (None, "strip", "add"):
+            raise ValueError(
+                f"Invalid trailing_slash {trailing_slash}, expected 'strip' or 'add'"
+            )
+        self._force_scheme = force_scheme
+        self._lowercase_host = lowercase_host
+        self._remove_default_port = remove_default_port
+        self._drop_fragment = drop_fragment
+        self._strip_query_params = [param.lower() for param in strip_query_params]
+        self._drop_query = drop_query
+        self._sort_query = sort_query
+        self._trailing_slash = trailing_slash
+        self._rewrites = [
+            (re.compile(rewrite["pattern"]), rewrite["replacement"])
+            for rewrite in rewrites
+        ]
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional["URLCanonicalizer"]:
+        """Crée le canonicaliseur à partir de l'option url_canonicalization d'un reader."""
+        rules = config.get("url_canonicalization", None)
+        if not rules:
+            return None
+        return cls(**rules)
+
+    def _keep_query_param(self, name: str) -> bool:
+        name = name.lower()
+        return not any(
+            fnmatch.fnmatchcase(name, pattern) for pattern in self._strip_query_params
+        )
+
+    def canonicalize(self, url: str) -> str:
+        """Retourne l'URL canonique d'une URL.
+
+        Args:
+            url (str): URL à normaliser
+
+        Returns:
+            str: URL canonique
+        """
+        parts = urlsplit(url.strip())
+
+        scheme = (self._force_scheme or parts.scheme).lower()
+
+        netloc = parts.netloc
+        if self._lowercase_host:
+            netloc = netloc.lower()
+        if self._remove_default_port and parts.port is not None:
+            if DEFAULT_PORTS.get(scheme) == parts.port:
+                netloc = netloc.rsplit(":", 1)[0]
+
+        path = parts.path or "/"
+        if self._trailing_slash == "strip" and path != "/":
+            path = path.rstrip("/") or "/"
+        elif self._trailing_slash == "add" and not path.endswith("/"):
+            # Les chemins de fichiers (ex: /doc.pdf) sont conservés
+            if "." not in path.rsplit("/", 1)[-1]:
+                path += "/"
+
+        query = ""
+        if not self._drop_query:
+            params = [
+                (name, value)
+                for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                if self._keep_query_param(name)
+            ]
+            if self._sort_query:
+                params.sort()
+            query = urlencode(params)
+
+        fragment = "" if self._drop_fragment else parts.fragment
+
+        canonical_url = urlunsplit((scheme, netloc, path, query, fragment))
+        for pattern, replacement in self._rewrites:
+            canonical_url = pattern.sub(replacement, canonical_url)
+        return canonical_url
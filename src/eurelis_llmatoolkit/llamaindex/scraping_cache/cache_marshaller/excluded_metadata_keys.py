@@ -0,0 +1,24 @@
+from llama_index.core import Document
+
+# Attributs d'un document absents du format embedchain, conservés par les caches
+EXCLUDED_METADATA_KEYS_FIELDS = (
+    "excluded_embed_metadata_keys",
+    "excluded_llm_metadata_keys",
+)
+
+
+def get_excluded_metadata_keys(document: Document) -> dict[str, list[str]]:
+    """Retourne les clés de métadonnées exclues d'un document (les listes non vides)."""
+    return {
+        field: list(getattr(document, field))
+        for field in EXCLUDED_METADATA_KEYS_FIELDS
+        if getattr(document, field)
+    }
+
+
+def set_excluded_metadata_keys(document: Document, content: dict) -> Document:
+    """Rétablit sur un document relu du cache les clés de métadonnées exclues."""
+    for field in EXCLUDED_METADATA_KEYS_FIELDS:
+        if content.get(field):
+            setattr(document, field, list(content[field]))
+    return document
@@ -1,59 +1,398 @@
+import hashlib
 import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 from llama_index.core import Document
 
+from eurelis_llmatoolkit.llamaindex.scraping_cache.cache_marshaller.excluded_metadata_keys import (
+    get_excluded_metadata_keys,
+    set_excluded_metadata_keys,
+)
+
 from eurelis_llmatoolkit.llamaindex.readers.abstract_fs_reader import AbstractFSReader
 
+try:
+    import orjson
+except ImportError:  # Dépendance optionnelle : sérialisation JSON plus rapide
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _dumps_json(data: dict, indent: Optional[int] = None) -> bytes:
+    """Sérialise un document en JSON UTF-8 (avec orjson s'il est installé)."""
+    if orjson is not None and indent in (None, 2):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, ensure_ascii=False, indent=indent).encode("utf-8")
+
 
 class FSCacheMarshaller(AbstractFSReader):
+    """Cache des documents dans des fichiers JSON, un fichier par document.
+
+    Les fichiers sont écrits de manière atomique (fichier temporaire puis renommage),
+    en parallèle (write_workers threads). Le hash de chaque fichier écrit est ajouté
+    au journal .content_hashes.tsv du dataset : un document dont le contenu n'a pas
+    changé n'est pas réécrit.
+
+    La date de modification d'un fichier est celle du dernier enregistrement du
+    document, ou de la dernière confirmation qu'il est inchangé (touch) : au-delà de
+    ttl_days (ou de dataset_ttl_days pour un dataset), le document est expiré et n'est
+    plus relu. Avec max_size_mb, prune() évince les
+    documents les moins récemment utilisés (date d'accès) au-delà de cette taille.
+    """
+
+    HASH_LOG = ".content_hashes.tsv"
+
     def __init__(self, cache_config):
         super().__init__(cache_config)
         self.base_dir = Path(cache_config["base_dir"]).resolve()
+        self._write_workers = cache_config.get("write_workers", 4)
+        self._json_indent = cache_config.get("json_indent", None)
+        self._hashes_lock = threading.Lock()
+        self._hashes: dict[str, dict[str, str]] = {}  # Hashes par dataset
+        self._write_stats = {"written": 0, "unchanged": 0, "bytes": 0}
+        self._ttl_days = cache_config.get("ttl_days", None)
+        self._dataset_ttl_days = cache_config.get("dataset_ttl_days", {})
+        max_size_mb = cache_config.get("max_size_mb", None)
+        self._max_size = int(max_size_mb * 1024 * 1024) if max_size_mb else None
+        self._expires_before: Optional[float] = None
+
+    def _get_ttl(self, dataset_name: str) -> Optional[float]:
+        """Retourne la durée de validité (en secondes) des documents d'un dataset, None si illimitée."""
+        ttl_days = self._dataset_ttl_days.get(dataset_name, self._ttl_days)
+        return ttl_days * 24 * 3600 if ttl_days else None
+
+    def _load_hashes(self, cache_base_path: Path) -> dict[str, str]:
+        """Charge le journal des hashes d'un dataset (la dernière ligne l'emporte)."""
+        hashes = {}
+        lines = 0
+        try:
+            with open(cache_base_path / self.HASH_LOG, "r", encoding="utf-8") as f:
+                for line in f:
+                    lines += 1
+                    # Une ligne tronquée (interruption) est ignorée
+                    relative_path, _, content_hash = line.rstrip("\n").rpartition("\t")
+                    if relative_path and len(content_hash) == 64:
+                        hashes[relative_path] = content_hash
+        except FileNotFoundError:
+            return hashes
+
+        if lines > 2 * len(hashes) + 1000:
+            self._rewrite_hashes(cache_base_path, hashes)
+        return hashes
+
+    def _rewrite_hashes(self, cache_base_path: Path, hashes: dict[str, str]):
+        fd, tmp_path = tempfile.mkstemp(
+            dir=cache_base_path, prefix=f"{self.HASH_LOG}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.writelines(f"{path}\t{value}\n" for path, value in hashes.items())
+            os.replace(tmp_path, cache_base_path / self.HASH_LOG)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _get_cache_file_path(self, cache_base_path: Path, doc_id: str) -> Path:
+        """Retourne le chemin du fichier JSON d'un document."""
+        # Définit le chemin de cache en fonction du doc_id
+        cache_path = self._define_cache_path(doc_id)
+
+        # Retirer un slash au début du cache_path si présent car provoque un l'écrasement des autres Path lors d'un concaténation
+        if cache_path.parts and cache_path.parts[0].startswith("/"):
+            cache_path = Path(*cache_path.parts[1:])
+
+        # Combine base_dir, dataset_name et cache_path pour construire le chemin complet
+        cache_path = (cache_base_path / cache_path).resolve()
+        if "#" in cache_path.name:
+            # Partie d'un fichier (ex: big.txt#part-1) : le nom complet est conservé
+            # pour que les parties d'un même fichier ne partagent pas le même JSON
+            return cache_path.with_name(f"{cache_path.name}.json")
+        return cache_path.with_suffix(".json")
+
+    def _write_document(
+        self, cache_base_path: Path, hashes: dict[str, str], document: Document
+    ) -> Optional[Tuple[str, str, int]]:
+        """Écrit le fichier d'un document s'il a changé.
 
-    def to_cache(self, dataset_name: str, documents: List[Document]):
+        Returns:
+            Optional[Tuple[str, str, int]]: Chemin relatif, hash et taille du fichier
+            écrit, None si le fichier existant est identique
+        """
+        full_cache_path = self._get_cache_file_path(cache_base_path, document.doc_id)
+        relative_path = Path(
+            os.path.relpath(full_cache_path, cache_base_path)
+        ).as_posix()
+
+        # Sérialiser le document en JSON
+        data = _dumps_json(
+            {
+                **document.to_embedchain_format(),
+                **get_excluded_metadata_keys(document),
+            },
+            self._json_indent,
+        )
+        content_hash = hashlib.sha256(data).hexdigest()
+        if hashes.get(relative_path) == content_hash:
+            try:
+                # Document inchangé : seule sa date d'enregistrement (TTL) est rafraîchie
+                os.utime(full_cache_path)
+                return None
+            except FileNotFoundError:
+                pass
+
+        # Crée les répertoires si nécessaire
+        full_cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Écriture atomique : un fichier interrompu n'est jamais lu par load_data
+        fd, tmp_path = tempfile.mkstemp(
+            dir=full_cache_path.parent,
+            prefix=f".{full_cache_path.name}.",
+            suffix=".tmp",
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, full_cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return relative_path, content_hash, len(data)
+
+    def to_cache(self, dataset_name: str, documents: Iterable[Document]):
         """
         Sérialise les documents dans des fichiers JSON en utilisant un chemin de cache
         basé sur l'URL source des documents.
 
         Args:
             dataset_name (str): Le nom du dataset.
-            documents (list): La liste des documents à sérialiser.
+            documents (Iterable[Document]): Les documents à sérialiser.
         """
         if dataset_name is None:
             raise ValueError("dataset_name cannot be None")
 
         cache_base_path = self.base_dir / dataset_name
+        cache_base_path.mkdir(parents=True, exist_ok=True)
+
+        with self._hashes_lock:
+            if dataset_name not in self._hashes:
+                self._hashes[dataset_name] = self._load_hashes(cache_base_path)
+            hashes = self._hashes[dataset_name]
+
+        def write(document: Document) -> Optional[Tuple[str, str, int]]:
+            return self._write_document(cache_base_path, hashes, document)
 
-        for document in documents:
-            # Définit le chemin de cache en fonction du doc_id
-            cache_path = self._define_cache_path(document.doc_id)
+        if self._write_workers > 1:
+            with ThreadPoolExecutor(
+                max_workers=self._write_workers, thread_name_prefix="fs-cache"
+            ) as executor:
+                results = list(executor.map(write, documents))
+        else:
+            results = [write(document) for document in documents]
 
-            # Retirer un slash au début du cache_path si présent car provoque un l'écrasement des autres Path lors d'un concaténation
-            if cache_path.parts and cache_path.parts[0].startswith("/"):
-                cache_path = Path(*cache_path.parts[1:])
+        written = [result for result in results if result is not None]
+        with self._hashes_lock:
+            for relative_path, content_hash, _ in written:
+                hashes[relative_path] = content_hash
+            self._write_stats["written"] += len(written)
+            self._write_stats["unchanged"] += len(results) - len(written)
+            self._write_stats["bytes"] += sum(size for _, _, size in written)
 
-            # Combine base_dir, dataset_name et cache_path pour construire le chemin complet
-            full_cache_path = (cache_base_path / cache_path).resolve()
+        # Les hashes ne sont journalisés qu'une fois les fichiers écrits
+        if written:
+            with open(cache_base_path / self.HASH_LOG, "a", encoding="utf-8") as f:
+                f.writelines(f"{path}\t{value}\n" for path, value, _ in written)
 
-            # Crée les répertoires si nécessaire
-            full_cache_path.parent.mkdir(parents=True, exist_ok=True)
+    def get_write_stats(self) -> dict:
+        """Retourne le nombre de documents écrits et inchangés et le volume écrit."""
+        with self._hashes_lock:
+            return dict(self._write_stats)
 
-            # Sérialiser le document dans un fichier JSON
-            document_data = document.to_embedchain_format()
-            with open(full_cache_path.with_suffix(".json"), "w", encoding="utf-8") as f:
-                json.dump(document_data, f, ensure_ascii=False, indent=4)
+    def _get_files(self, path: str, glob: Union[str, List[str]]) -> Iterator[Path]:
+        """Récupère les fichiers du cache, sans les documents expirés."""
+        for file in super()._get_files(path, glob):
+            stat = self._file_stats[str(file)]
+            if (
+                self._expires_before is not None
+                and stat.st_mtime < self._expires_before
+            ):
+                self._file_stats.pop(str(file), None)
+                continue
+            yield file
 
     def _process_file(self, path: Path) -> Document:
-        with open(path, "r", encoding="utf-8") as f:
-            content = json.load(f)
-            return Document.from_embedchain_format(content)
+        with open(path, "rb") as f:
+            data = f.read()
+        stat = self._file_stats.get(str(path))
+        if self._max_size is not None and stat is not None:
+            # La date d'accès sert à l'éviction LRU, la date de modification au TTL
+            os.utime(path, ns=(time.time_ns(), stat.st_mtime_ns))
+        content = orjson.loads(data) if orjson is not None else json.loads(data)
+        return set_excluded_metadata_keys(
+            Document.from_embedchain_format(content), content
+        )
 
-    def load_data(self, dataset_name: str = None, *args, **kwargs) -> List[Document]:
+    def lazy_load_data(
+        self, dataset_name: str = None, *args, **kwargs
+    ) -> Iterator[Document]:
         self._file_dir = f"{self._config['base_dir']}/{dataset_name}"
-        return super().load_data(*args, **kwargs)
+        ttl = self._get_ttl(dataset_name)
+        self._expires_before = time.time() - ttl if ttl else None
+        return super().lazy_load_data(*args, **kwargs)
+
+    def load_data(self, dataset_name: str = None, *args, **kwargs) -> List[Document]:
+        return list(self.lazy_load_data(dataset_name, *args, **kwargs))
+
+    @staticmethod
+    def _iter_cache_files(directory: Path) -> Iterator[Tuple[Path, os.stat_result]]:
+        """Parcourt les fichiers JSON d'un répertoire du cache, avec leur stat()."""
+        directories = [directory]
+        while directories:
+            with os.scandir(directories.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        directories.append(Path(entry.path))
+                    elif entry.name.endswith(".json"):
+                        yield Path(entry.path), entry.stat(follow_symlinks=False)
+
+    def touch(self, dataset_name: str, doc_ids: Iterable[str]) -> int:
+        """
+        Rafraîchit la date d'enregistrement (TTL) de documents inchangés qui n'ont pas
+        été réécrits (ex: ignorés par un reader incrémental).
+
+        Args:
+            dataset_name (str): Le nom du dataset.
+            doc_ids (Iterable[str]): Les documents toujours présents à la source.
+
+        Returns:
+            int: Nombre de documents du cache rafraîchis.
+        """
+        if dataset_name is None:
+            raise ValueError("dataset_name cannot be None")
+
+        cache_base_path = self.base_dir / dataset_name
+        touched = 0
+        for doc_id in doc_ids:
+            try:
+                os.utime(self._get_cache_file_path(cache_base_path, doc_id))
+                touched += 1
+            except FileNotFoundError:
+                pass
+        return touched
+
+    def prune(
+        self, dataset_name: str, keep_doc_ids: Optional[Iterable[str]] = None
+    ) -> dict:
+        """
+        Supprime du cache d'un dataset les documents expirés et, si keep_doc_ids est
+        fourni, ceux qui n'en font pas partie (ex: pages absentes du dernier crawl),
+        puis applique la taille maximale du cache.
+
+        Args:
+            dataset_name (str): Le nom du dataset.
+            keep_doc_ids (Optional[Iterable[str]]): Les documents à conserver.
+
+        Returns:
+            dict: Nombre de documents expirés (expired), absents de keep_doc_ids
+            (removed) et évincés par la limite de taille (evicted).
+        """
+        if dataset_name is None:
+            raise ValueError("dataset_name cannot be None")
+
+        cache_base_path = self.base_dir / dataset_name
+        stats = {"expired": 0, "removed": 0, "evicted": 0}
+        ttl = self._get_ttl(dataset_name)
+        if (ttl or keep_doc_ids is not None) and cache_base_path.is_dir():
+            expires_before = time.time() - ttl if ttl else None
+            keep_paths = None
+            if keep_doc_ids is not None:
+                keep_paths = {
+                    self._get_cache_file_path(cache_base_path, doc_id)
+                    for doc_id in keep_doc_ids
+                }
+
+            deleted = []
+            for path, stat in self._iter_cache_files(cache_base_path):
+                if expires_before is not None and stat.st_mtime < expires_before:
+                    stats["expired"] += 1
+                elif keep_paths is not None and path not in keep_paths:
+                    stats["removed"] += 1
+                else:
+                    continue
+                path.unlink(missing_ok=True)
+                deleted.append(path)
+            self._forget(dataset_name, deleted)
+
+        if self._max_size is not None:
+            stats["evicted"] = self._evict()
+
+        logger.log(
+            logging.INFO if any(stats.values()) else logging.DEBUG,
+            f"Pruned cache of dataset {dataset_name}: {stats['expired']} expired, "
+            f"{stats['removed']} removed, {stats['evicted']} evicted documents",
+        )
+        return stats
+
+    def _evict(self) -> int:
+        """Supprime les documents les moins récemment utilisés au-delà de la taille maximale (tous datasets confondus)."""
+        files = [
+            (path, stat, entry.name)
+            for entry in os.scandir(self.base_dir)
+            if entry.is_dir(follow_symlinks=False)
+            for path, stat in self._iter_cache_files(Path(entry.path))
+        ]
+        total_size = sum(stat.st_size for _, stat, _ in files)
+        if total_size <= self._max_size:
+            return 0
+
+        evicted = defaultdict(list)
+        for path, stat, dataset_name in sorted(
+            files, key=lambda file: file[1].st_atime_ns
+        ):
+            if total_size <= self._max_size:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= stat.st_size
+            evicted[dataset_name].append(path)
+
+        for dataset_name, paths in evicted.items():
+            self._forget(dataset_name, paths)
+        return sum(len(paths) for paths in evicted.values())
+
+    def _forget(self, dataset_name: str, paths: List[Path]):
+        """Retire des fichiers supprimés du journal des hashes et supprime les répertoires vidés."""
+        if not paths:
+            return
+        cache_base_path = self.base_dir / dataset_name
+
+        with self._hashes_lock:
+            if dataset_name not in self._hashes:
+                self._hashes[dataset_name] = self._load_hashes(cache_base_path)
+            hashes = self._hashes[dataset_name]
+            for path in paths:
+                hashes.pop(
+                    Path(os.path.relpath(path, cache_base_path)).as_posix(), None
+                )
+            self._rewrite_hashes(cache_base_path, hashes)
+
+        for directory in sorted(
+            {path.parent for path in paths}, key=lambda d: len(d.parts), reverse=True
+        ):
+            while directory != cache_base_path:
+                try:
+                    directory.rmdir()
+                except OSError:  # Répertoire non vide
+                    break
+                directory = directory.parent
 
     @staticmethod
     def _define_cache_path(doc_id: str) -> Path:
@@ -0,0 +1,387 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from llama_index.core import Document
+
+from eurelis_llmatoolkit.llamaindex.scraping_cache.cache_marshaller.excluded_metadata_keys import (
+    get_excluded_metadata_keys,
+    set_excluded_metadata_keys,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ShardCacheMarshaller:
+    """Cache des documents dans des fichiers JSONL compressés (shards) avec un index.
+
+    Chaque dataset est stocké dans <base_dir>/<dataset>/ :
+      - shard-NNNNN.jsonl.gz : documents ajoutés à la suite, chacun compressé dans son
+        propre membre gzip (le fichier reste lisible avec zcat) ; un nouveau shard est
+        commencé au-delà de shard_size_mb ;
+      - index.json : position (shard, offset, longueur) et hash du dernier
+        enregistrement de chaque doc_id ;
+      - index.log : journal des entrées ajoutées depuis l'écriture de index.json (la
+        dernière ligne l'emporte).
+
+    Un document mis à jour est ajouté à la fin et l'index pointe sur sa nouvelle
+    version ; un document dont le hash n'a pas changé n'est pas réécrit. Chaque appel
+    à to_cache n'ajoute que ses entrées au journal : index.json est réécrit par
+    prune() en fin de chargement, qui compacte aussi les shards (compact) lorsque les
+    versions remplacées dépassent compact_ratio fois le volume des versions à jour.
+    L'index lu est gardé en mémoire tant que ses fichiers n'ont pas changé.
+    """
+
+    INDEX_FILE = "index.json"
+    JOURNAL_FILE = "index.log"
+
+    def __init__(self, cache_config: dict):
+        self._config = cache_config
+        self.base_dir = Path(cache_config["base_dir"]).resolve()
+        self._shard_size = int(cache_config.get("shard_size_mb", 64) * 1024 * 1024)
+        self._compress_level = cache_config.get("compress_level", 6)
+        self._compact_ratio = cache_config.get("compact_ratio", 1.0)
+        self._lock = threading.Lock()
+        self._skip_doc_ids: set[str] = set()
+        self._write_stats = {"written": 0, "unchanged": 0, "bytes": 0}
+        # Dossier du dataset -> (signature de index.json et index.log, index)
+        self._indexes: dict[Path, tuple[tuple, dict]] = {}
+
+    def _dataset_dir(self, dataset_name: str) -> Path:
+        if dataset_name is None:
+            raise ValueError("dataset_name cannot be None")
+        return self.base_dir / dataset_name
+
+    @staticmethod
+    def _shard_name(shard: int) -> str:
+        return f"shard-{shard:05d}.jsonl.gz"
+
+    def _load_index(self, dataset_dir: Path) -> dict:
+        """Lit index.json puis rejoue le journal index.log."""
+        try:
+            with open(dataset_dir / self.INDEX_FILE, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            index = {"docs": {}, "current_shard": 0}
+        docs = index["docs"]
+        try:
+            with open(dataset_dir / self.JOURNAL_FILE, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # Ligne tronquée (interruption)
+                    doc_id, location = entry[0], entry[1:]
+                    docs[doc_id] = location
+                    index["current_shard"] = max(
+                        index.get("current_shard", 0), location[0]
+                    )
+        except FileNotFoundError:
+            pass
+        return index
+
+    def _signature(self, dataset_dir: Path) -> tuple:
+        signature = []
+        for name in (self.INDEX_FILE, self.JOURNAL_FILE):
+            try:
+                stat = (dataset_dir / name).stat()
+                signature.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _get_index(self, dataset_dir: Path) -> dict:
+        """Retourne l'index du dataset, relu seulement si ses fichiers ont changé.
+
+        L'index renvoyé est partagé : seules les écritures (sous verrou) le modifient.
+        """
+        signature = self._signature(dataset_dir)
+        cached = self._indexes.get(dataset_dir)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        index = self._load_index(dataset_dir)
+        # Un index relu pendant une écriture est écarté au prochain appel (signature)
+        self._indexes[dataset_dir] = (signature, index)
+        return index
+
+    def _append_journal(self, dataset_dir: Path, index: dict, entries: list):
+        """Ajoute des entrées au journal et garde l'index à jour en mémoire."""
+        with open(dataset_dir / self.JOURNAL_FILE, "a", encoding="utf-8") as f:
+            f.writelines(
+                json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+                for entry in entries
+            )
+        self._indexes[dataset_dir] = (self._signature(dataset_dir), index)
+
+    def _save_index(self, dataset_dir: Path, index: dict):
+        """Écrit index.json de manière atomique et vide le journal."""
+        fd, tmp_path = tempfile.mkstemp(
+            dir=dataset_dir, prefix=f".{self.INDEX_FILE}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, dataset_dir / self.INDEX_FILE)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        # Une interruption ici est sans effet : le journal rejoué redonne le même index
+        (dataset_dir / self.JOURNAL_FILE).unlink(missing_ok=True)
+        self._indexes[dataset_dir] = (self._signature(dataset_dir), index)
+
+    @staticmethod
+    def _serialize(document: Document) -> bytes:
+        line = json.dumps(
+            {**document.to_embedchain_format(), **get_excluded_metadata_keys(document)},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return (line + "\n").encode("utf-8")
+
+    def _compress(self, data: bytes) -> bytes:
+        # mtime=0 : le même document donne toujours le même enregistrement
+        return gzip.compress(data, compresslevel=self._compress_level, mtime=0)
+
+    @staticmethod
+    def _decode(record: bytes) -> Document:
+        content = json.loads(gzip.decompress(record))
+        return set_excluded_metadata_keys(
+            Document.from_embedchain_format(content), content
+        )
+
+    def to_cache(self, dataset_name: str, documents: Iterable[Document]):
+        """
+        Ajoute les documents modifiés aux shards du dataset et leurs entrées au journal
+        de l'index.
+
+        Args:
+            dataset_name (str): Le nom du dataset.
+            documents (Iterable[Document]): Les documents à mettre en cache.
+        """
+        dataset_dir = self._dataset_dir(dataset_name)
+        dataset_dir.mkdir(parents=True, exist_ok=True)
+
+        with self._lock:
+            index = self._get_index(dataset_dir)
+            docs = index["docs"]
+            shard = index.get("current_shard", 0)
+            entries = []
+            shard_file = open(dataset_dir / self._shard_name(shard), "ab")
+            try:
+                for document in documents:
+                    data = self._serialize(document)
+                    content_hash = hashlib.sha256(data).hexdigest()
+                    location = docs.get(document.doc_id)
+                    if location is not None and location[3:] == [content_hash]:
+                        self._write_stats["unchanged"] += 1
+                        continue
+                    offset = shard_file.tell()
+                    if offset >= self._shard_size:
+                        shard_file.close()
+                        shard += 1
+                        shard_file = open(dataset_dir / self._shard_name(shard), "ab")
+                        offset = shard_file.tell()
+                    record = self._compress(data)
+                    shard_file.write(record)
+                    entries.append(
+                        [document.doc_id, shard, offset, len(record), content_hash]
+                    )
+                    self._write_stats["written"] += 1
+                    self._write_stats["bytes"] += len(record)
+            finally:
+                shard_file.close()
+
+            # Le journal n'est écrit qu'une fois les enregistrements sur disque : en
+            # cas d'interruption, les octets ajoutés sont simplement ignorés
+            if entries:
+                for doc_id, *location in entries:
+                    docs[doc_id] = location
+                index["current_shard"] = shard
+                self._append_journal(dataset_dir, index, entries)
+
+    def get_document(self, dataset_name: str, doc_id: str) -> Optional[Document]:
+        """
+        Lit un document du cache à partir de son doc_id (accès direct via l'index).
+
+        Args:
+            dataset_name (str): Le nom du dataset.
+            doc_id (str): L'identifiant du document.
+
+        Returns:
+            Optional[Document]: Le document, None s'il n'est pas dans le cache.
+        """
+        dataset_dir = self._dataset_dir(dataset_name)
+        location = self._get_index(dataset_dir)["docs"].get(doc_id)
+        if location is None:
+            return None
+        shard, offset, length = location[:3]
+        with open(dataset_dir / self._shard_name(shard), "rb") as f:
+            f.seek(offset)
+            return self._decode(f.read(length))
+
+    def _iter_records(self, dataset_dir: Path, index: dict) -> Iterator[bytes]:
+        """Lit les enregistrements à jour dans l'ordre des shards (lecture séquentielle)."""
+        by_shard: dict[int, list] = {}
+        for doc_id, (shard, offset, length, *_) in index["docs"].items():
+            if doc_id in self._skip_doc_ids:
+                continue
+            by_shard.setdefault(shard, []).append((offset, length))
+
+        for shard in sorted(by_shard):
+            with open(dataset_dir / self._shard_name(shard), "rb") as f:
+                position = 0
+                for offset, length in sorted(by_shard[shard]):
+                    if offset != position:
+                        f.seek(offset)
+                    yield f.read(length)
+                    position = offset + length
+
+    def lazy_load_data(
+        self, dataset_name: str = None, *args, **kwargs
+    ) -> Iterator[Document]:
+        dataset_dir = self._dataset_dir(dataset_name)
+        index = self._get_index(dataset_dir)
+        for record in self._iter_records(dataset_dir, index):
+            yield self._decode(record)
+
+    def load_data(self, dataset_name: str = None, *args, **kwargs) -> List[Document]:
+        return list(self.lazy_load_data(dataset_name, *args, **kwargs))
+
+    def compact(self, dataset_name: str):
+        """
+        Réécrit les shards du dataset sans les versions remplacées des documents.
+
+        Tous les shards non référencés par le nouvel index sont supprimés, y compris
+        ceux laissés par une compaction interrompue.
+
+        Args:
+            dataset_name (str): Le nom du dataset.
+        """
+        dataset_dir = self._dataset_dir(dataset_name)
+        with self._lock:
+            self._compact(dataset_dir, self._get_index(dataset_dir))
+        logger.info(f"Compacted cache of dataset {dataset_name}")
+
+    def prune(
+        self, dataset_name: str, keep_doc_ids: Optional[Iterable[str]] = None
+    ) -> dict:
+        """
+        Retire de l'index les documents absents de keep_doc_ids puis écrit index.json.
+        Les shards sont compactés lorsque les versions remplacées occupent plus de
+        compact_ratio fois le volume des versions à jour (None : jamais).
+
+        Args:
+            dataset_name (str): Le nom du dataset.
+            keep_doc_ids (Optional[Iterable[str]]): Les documents à conserver.
+
+        Returns:
+            dict: Nombre de documents retirés (removed) et compaction effectuée
+            (compacted).
+        """
+        if dataset_name is None:
+            raise ValueError("dataset_name cannot be None")
+
+        dataset_dir = self._dataset_dir(dataset_name)
+        stats = {"removed": 0, "compacted": False}
+        if not dataset_dir.is_dir():
+            return stats
+
+        with self._lock:
+            index = self._get_index(dataset_dir)
+            docs = index["docs"]
+            if keep_doc_ids is not None:
+                keep_doc_ids = set(keep_doc_ids)
+                for doc_id in [doc_id for doc_id in docs if doc_id not in keep_doc_ids]:
+                    del docs[doc_id]
+                    stats["removed"] += 1
+
+            live_bytes = sum(location[2] for location in docs.values())
+            dead_bytes = (
+                sum(
+                    path.stat().st_size for path in dataset_dir.glob("shard-*.jsonl.gz")
+                )
+                - live_bytes
+            )
+            if self._compact_ratio is not None and dead_bytes > max(
+                self._compact_ratio * live_bytes, 0
+            ):
+                self._compact(dataset_dir, index)
+                stats["compacted"] = True
+            elif stats["removed"] or (dataset_dir / self.JOURNAL_FILE).exists():
+                self._save_index(dataset_dir, index)
+
+        if stats["removed"] or stats["compacted"]:
+            logger.info(
+                f"Pruned cache of dataset {dataset_name}: {stats['removed']} removed, "
+                f"compacted: {stats['compacted']}"
+            )
+        return stats
+
+    def _compact(self, dataset_dir: Path, index: dict):
+        existing_shards = {
+            int(path.name[len("shard-") : -len(".jsonl.gz")])
+            for path in dataset_dir.glob("shard-*.jsonl.gz")
+        }
+        existing_shards.add(index.get("current_shard", 0))
+        first_shard = max(existing_shards) + 1
+
+        # Les nouveaux shards sont numérotés après les anciens : l'ancien index
+        # reste valide jusqu'au remplacement
+        new_docs = {}
+        shard = first_shard
+        shard_file = open(dataset_dir / self._shard_name(shard), "wb")
+        old_shard_file = None
+        try:
+            for doc_id, (old_shard, offset, length, *content_hash) in sorted(
+                index["docs"].items(), key=lambda item: item[1]
+            ):
+                if shard_file.tell() >= self._shard_size:
+                    shard_file.close()
+                    shard += 1
+                    shard_file = open(dataset_dir / self._shard_name(shard), "wb")
+                old_shard_name = self._shard_name(old_shard)
+                if old_shard_file is None or old_shard_file.name != str(
+                    dataset_dir / old_shard_name
+                ):
+                    if old_shard_file is not None:
+                        old_shard_file.close()
+                    old_shard_file = open(dataset_dir / old_shard_name, "rb")
+                old_shard_file.seek(offset)
+                new_docs[doc_id] = [shard, shard_file.tell(), length, *content_hash]
+                shard_file.write(old_shard_file.read(length))
+        finally:
+            shard_file.close()
+            if old_shard_file is not None:
+                old_shard_file.close()
+
+        self._save_index(dataset_dir, {"docs": new_docs, "current_shard": shard})
+        new_shards = {
+            self._shard_name(new_shard) for new_shard in range(first_shard, shard + 1)
+        }
+        for path in dataset_dir.glob("shard-*.jsonl.gz"):
+            if path.name not in new_shards:
+                path.unlink(missing_ok=True)
+
+    def get_write_stats(self) -> dict:
+        """Retourne le nombre de documents écrits et le volume écrit (compressé)."""
+        with self._lock:
+            return dict(self._write_stats)
+
+    def set_skip_doc_ids(self, doc_ids: Iterable[str]):
+        """Définit les documents à ne pas relire (ex: déjà traités avant une interruption)."""
+        self._skip_doc_ids = set(doc_ids)
+
+    def get_unsuccessful_docs(self) -> list[str]:
+        return []
+
+    def get_unchanged_docs(self) -> list[str]:
+        return []
+
+    def get_deleted_docs(self) -> Optional[list[str]]:
+        return None
@@ -0,0 +1,286 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from contextlib import closing
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Union
+
+from llama_index.core import Document
+
+from eurelis_llmatoolkit.llamaindex.scraping_cache.cache_marshaller.excluded_metadata_keys import (
+    get_excluded_metadata_keys,
+    set_excluded_metadata_keys,
+)
+
+logger = logging.getLogger(__name__)
+
+# Nombre maximal de paramètres d'une requête "IN (...)"
+MAX_QUERY_IDS = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    dataset TEXT NOT NULL,
+    doc_id TEXT NOT NULL,
+    text TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    excluded_metadata_keys TEXT NOT NULL DEFAULT '{}',
+    content_hash TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (dataset, doc_id)
+);
+CREATE INDEX IF NOT EXISTS documents_fetched_at ON documents (dataset, fetched_at);
+"""
+
+# Colonnes ajoutées depuis la création du schéma : nom -> définition
+MIGRATED_COLUMNS = {
+    "excluded_metadata_keys": "TEXT NOT NULL DEFAULT '{}'",
+}
+
+
+class SQLiteCacheMarshaller:
+    """Cache des documents dans une base SQLite, indexée par dataset et doc_id.
+
+    Chaque document est stocké avec son texte, ses métadonnées et ses clés de
+    métadonnées exclues (JSON), le hash SHA-256 de ces champs et sa date
+    d'enregistrement. Les documents sont écrits par lots dans des transactions (un
+    document dont le hash n'a pas changé n'est pas réécrit) et relus au fil d'un
+    curseur, éventuellement filtrés par date (since) ou par doc_id (ids).
+    """
+
+    DB_FILE = "scraping_cache.sqlite3"
+
+    def __init__(self, cache_config: dict):
+        self._config = cache_config
+        self.base_dir = Path(cache_config["base_dir"]).resolve()
+        self._db_path = Path(
+            cache_config.get("db_path", None) or self.base_dir / self.DB_FILE
+        )
+        self._batch_size = cache_config.get("batch_size", 1000)
+        self._skip_doc_ids: set[str] = set()
+        self._write_stats = {"written": 0, "unchanged": 0, "bytes": 0}
+
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.executescript(SCHEMA)
+            self._migrate(connection)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._db_path, timeout=30)
+        # WAL : les lectures (curseur de load_data) ne bloquent pas les écritures
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @staticmethod
+    def _migrate(connection: sqlite3.Connection):
+        """Ajoute à une base existante les colonnes absentes de sa table."""
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(documents)")}
+        with connection:
+            for name, definition in MIGRATED_COLUMNS.items():
+                if name not in columns:
+                    connection.execute(
+                        f"ALTER TABLE documents ADD COLUMN {name} {definition}"
+                    )
+
+    @staticmethod
+    def _to_row(dataset_name: str, document: Document, fetched_at: float) -> tuple:
+        metadata = json.dumps(document.metadata, ensure_ascii=False)
+        excluded_metadata_keys = json.dumps(
+            get_excluded_metadata_keys(document), ensure_ascii=False
+        )
+        # Sans clés exclues, le hash reste celui des versions précédentes
+        hashed = f"{document.text}\n{metadata}"
+        if excluded_metadata_keys != "{}":
+            hashed += f"\n{excluded_metadata_keys}"
+        content_hash = hashlib.sha256(hashed.encode("utf-8")).hexdigest()
+        return (
+            dataset_name,
+            document.doc_id,
+            document.text,
+            metadata,
+            excluded_metadata_keys,
+            content_hash,
+            fetched_at,
+        )
+
+    @staticmethod
+    def _get_content_hashes(
+        connection: sqlite3.Connection, dataset_name: str, doc_ids: List[str]
+    ) -> dict[str, str]:
+        content_hashes = {}
+        for i in range(0, len(doc_ids), MAX_QUERY_IDS):
+            id_batch = doc_ids[i : i + MAX_QUERY_IDS]
+            placeholders = ", ".join("?" * len(id_batch))
+            content_hashes.update(
+                connection.execute(
+                    "SELECT doc_id, content_hash FROM documents"
+                    f" WHERE dataset = ? AND doc_id IN ({placeholders})",
+                    [dataset_name] + id_batch,
+                )
+            )
+        return content_hashes
+
+    def to_cache(self, dataset_name: str, documents: Iterable[Document]):
+        """
+        Enregistre les documents dans la base (remplace les versions précédentes).
+
+        Les documents sont insérés par lots de batch_size, un lot par transaction. Un
+        document dont le hash est identique à celui de la base n'est pas réécrit et
+        garde sa date d'enregistrement.
+
+        Args:
+            dataset_name (str): Le nom du dataset.
+            documents (Iterable[Document]): Les documents à mettre en cache.
+        """
+        if dataset_name is None:
+            raise ValueError("dataset_name cannot be None")
+
+        documents = iter(documents)
+        with closing(self._connect()) as connection:
+            while batch := list(islice(documents, self._batch_size)):
+                fetched_at = time.time()
+                rows = [
+                    self._to_row(dataset_name, document, fetched_at)
+                    for document in batch
+                ]
+                content_hashes = self._get_content_hashes(
+                    connection, dataset_name, [row[1] for row in rows]
+                )
+                rows = [row for row in rows if content_hashes.get(row[1]) != row[5]]
+                written = 0
+                if rows:
+                    with connection:
+                        # La condition couvre aussi une écriture concurrente du même
+                        # document depuis la lecture des hash
+                        written = connection.executemany(
+                            """
+                            INSERT INTO documents
+                                (dataset, doc_id, text, metadata,
+                                 excluded_metadata_keys, content_hash, fetched_at)
+                            VALUES (?, ?, ?, ?, ?, ?, ?)
+                            ON CONFLICT (dataset, doc_id) DO UPDATE SET
+                                text = excluded.text,
+                                metadata = excluded.metadata,
+                                excluded_metadata_keys = excluded.excluded_metadata_keys,
+                                content_hash = excluded.content_hash,
+                                fetched_at = excluded.fetched_at
+                            WHERE content_hash != excluded.content_hash
+                            """,
+                            rows,
+                        ).rowcount
+                self._write_stats["written"] += written
+                self._write_stats["unchanged"] += len(batch) - written
+                self._write_stats["bytes"] += sum(
+                    len(row[2].encode("utf-8")) + len(row[3].encode("utf-8"))
+                    for row in rows
+                )
+
+    @staticmethod
+    def _to_timestamp(since: Union[datetime, str, float, None]) -> Optional[float]:
+        if since is None or isinstance(since, (int, float)):
+            return since
+        if isinstance(since, str):
+            since = datetime.fromisoformat(since)
+        return since.timestamp()
+
+    def _iter_rows(
+        self,
+        connection: sqlite3.Connection,
+        dataset_name: str,
+        since: Optional[float],
+        ids: Optional[List[str]],
+    ) -> Iterator[tuple]:
+        query = (
+            "SELECT doc_id, text, metadata, excluded_metadata_keys FROM documents"
+            " WHERE dataset = ?"
+        )
+        params: list = [dataset_name]
+        if since is not None:
+            query += " AND fetched_at >= ?"
+            params.append(since)
+
+        if ids is None:
+            id_batches = [None]
+        else:
+            ids = list(ids)
+            id_batches = [
+                ids[i : i + MAX_QUERY_IDS] for i in range(0, len(ids), MAX_QUERY_IDS)
+            ]
+
+        for id_batch in id_batches:
+            batch_query, batch_params = query, params
+            if id_batch is not None:
+                placeholders = ", ".join("?" * len(id_batch))
+                batch_query += f" AND doc_id IN ({placeholders})"
+                batch_params = params + id_batch
+            cursor = connection.execute(batch_query + " ORDER BY doc_id", batch_params)
+            cursor.arraysize = self._batch_size
+            while rows := cursor.fetchmany():
+                yield from rows
+
+    def lazy_load_data(
+        self,
+        dataset_name: str = None,
+        *args,
+        since: Union[datetime, str, float, None] = None,
+        ids: Optional[Iterable[str]] = None,
+        **kwargs,
+    ) -> Iterator[Document]:
+        """
+        Relit les documents d'un dataset au fil d'un curseur.
+
+        Args:
+            dataset_name (str): Le nom du dataset.
+            since (Union[datetime, str, float, None]): Ne relit que les documents
+                enregistrés depuis cette date (datetime, ISO 8601 ou timestamp).
+            ids (Optional[Iterable[str]]): Ne relit que ces doc_ids.
+
+        Returns:
+            Iterator[Document]: Les documents, par ordre de doc_id.
+        """
+        with closing(self._connect()) as connection:
+            for doc_id, text, metadata, excluded_metadata_keys in self._iter_rows(
+                connection,
+                dataset_name,
+                self._to_timestamp(since),
+                None if ids is None else list(ids),
+            ):
+                if doc_id in self._skip_doc_ids:
+                    continue
+                yield set_excluded_metadata_keys(
+                    Document(text=text, doc_id=doc_id, metadata=json.loads(metadata)),
+                    json.loads(excluded_metadata_keys),
+                )
+
+    def load_data(
+        self,
+        dataset_name: str = None,
+        *args,
+        since: Union[datetime, str, float, None] = None,
+        ids: Optional[Iterable[str]] = None,
+        **kwargs,
+    ) -> List[Document]:
+        return list(
+            self.lazy_load_data(dataset_name, *args, since=since, ids=ids, **kwargs)
+        )
+
+    def get_write_stats(self) -> dict:
+        """Retourne le nombre de documents écrits et le volume écrit (texte et métadonnées)."""
+        return dict(self._write_stats)
+
+    def set_skip_doc_ids(self, doc_ids: Iterable[str]):
+        """Définit les documents à ne pas relire (ex: déjà traités avant une interruption)."""
+        self._skip_doc_ids = set(doc_ids)
+
+    def get_unsuccessful_docs(self) -> list[str]:
+        return []
+
+    def get_unchanged_docs(self) -> list[str]:
+        return []
+
+    def get_deleted_docs(self) -> Optional[list[str]]:
+        return None
@@ -45,6 +45,18 @@ def test_load_txt_file_reader():
     assert reader.__class__.__name__ == "TXTFileReader"
 
 
+def test_load_streaming_txt_file_reader():
+    config = {
+        "provider": "StreamingTXTFileReader",
+        "base_dir": "../etc/data_sample/",
+        "glob": "*.txt",
+        "section_size": 65536,
+    }
+    reader = ReaderFactory.create_reader("eurelis", config)
+    assert reader is not None
+    assert reader.__class__.__name__ == "StreamingTXTFileReader"
+
+
 def test_load_pdf_file_reader():
     config = {
         "provider": "PDFFileReader",
@@ -1,7 +1,20 @@
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+
 import pytest
+from llama_index.core.schema import Document
+
+from eurelis_llmatoolkit.llamaindex.readers import advanced_sitemap_reader
+from eurelis_llmatoolkit.llamaindex.readers.abstract_reader_adapter import (
+    LoadDataError,
+)
 from eurelis_llmatoolkit.llamaindex.readers.advanced_sitemap_reader import (
     AdvancedSitemapReader,
 )
+from eurelis_llmatoolkit.llamaindex.readers.http_session import PooledHTTPAdapter
 
 
 @pytest.mark.parametrize(
@@ -37,3 +50,461 @@ def test_load_data_sitemap_hs(advanced_sitemap_readers):
     for reader in advanced_sitemap_readers:
         data = reader.load_data()
         assert data is None
+
+
+@pytest.mark.parametrize("html_parser", ["html.parser", "lxml"])
+def test_parse_page(html_parser):
+    reader = AdvancedSitemapReader(
+        {
+            "sitemap_url": "https://www.example.com/sitemap.xml",
+            "html_parser": html_parser,
+            "parser_remove": [
+                "script",
+                {"name": "div", "attrs": {"class": "banner"}},
+            ],
+        }
+    )
+    content = (
+        b"<html><body><h1>Title</h1><div class='banner promo'>Promo"
+        b"<script>x</script></div><p>Content<script>y</script></p></body></html>"
+    )
+
+    text, metadata, pdf_urls = reader._parse_page("https://www.example.com/", content)
+
+    assert text == "TitleContent"
+    assert metadata == {"title": "Title"}
+    assert pdf_urls == []
+
+
+def _concurrent_reader(monkeypatch, fail_url=None):
+    """Reader en mode concurrent dont le traitement des pages est simulé."""
+    reader = AdvancedSitemapReader(
+        {
+            "sitemap_url": "https://www.example.com/sitemap.xml",
+            "async_mode": True,
+            "max_concurrent_requests": 4,
+            "max_concurrent_requests_per_host": 2,
+        }
+    )
+    lock = threading.Lock()
+    active = defaultdict(int)
+    stats = {"max_active": 0, "max_active_per_host": 0}
+
+    def process_url(loc, lastmod):
+        host = urlparse(loc).netloc
+        with lock:
+            active[host] += 1
+            stats["max_active"] = max(stats["max_active"], sum(active.values()))
+            stats["max_active_per_host"] = max(
+                stats["max_active_per_host"], active[host]
+            )
+        try:
+            time.sleep(0.01)
+            if loc == fail_url:
+                raise RuntimeError("unexpected failure")
+            return Document(text=loc, doc_id=loc)
+        finally:
+            with lock:
+                active[host] -= 1
+
+    monkeypatch.setattr(reader, "_process_url", process_url)
+    return reader, stats
+
+
+def _entries(count, consumed=None):
+    for i in range(count):
+        if consumed is not None:
+            consumed.append(i)
+        yield f"https://host{i % 3}.example.com/page/{i}", ""
+
+
+def test_process_urlset_async_keeps_order_and_limits(monkeypatch):
+    reader, stats = _concurrent_reader(monkeypatch)
+    consumed = []
+    documents = reader._process_urlset_async(_entries(40, consumed))
+
+    first = next(documents)
+    assert first.doc_id == "https://host0.example.com/page/0"
+    # Au plus 4 * max_concurrent_requests URLs soumises en avance
+    assert len(consumed) <= 4 * 4 + 1
+
+    doc_ids = [first.doc_id] + [document.doc_id for document in documents]
+    assert doc_ids == [loc for loc, _ in _entries(40)]
+    assert stats["max_active"] <= 4
+    assert stats["max_active_per_host"] <= 2
+
+
+def test_process_urlset_async_inside_event_loop(monkeypatch):
+    reader, _ = _concurrent_reader(monkeypatch)
+
+    async def crawl():
+        return list(reader._process_urlset_async(_entries(5)))
+
+    assert len(asyncio.run(crawl())) == 5
+
+
+def test_process_urlset_async_failure(monkeypatch):
+    reader, _ = _concurrent_reader(
+        monkeypatch, fail_url="https://host1.example.com/page/10"
+    )
+    consumed = []
+    documents = reader._process_urlset_async(_entries(100, consumed))
+
+    doc_ids = []
+    with pytest.raises(RuntimeError):
+        for document in documents:
+            doc_ids.append(document.doc_id)
+
+    # Les documents précédant l'erreur sont renvoyés, le sitemap n'est plus lu
+    assert doc_ids == [loc for loc, _ in _entries(10)]
+    assert len(consumed) < 100
+
+
+class _FakeResponse:
+    def __init__(self, url, status_code=200, content=b"", headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = {"Content-Type": "text/html", **(headers or {})}
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start : start + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeSession:
+    """Session HTTP simulée : réponses successives par URL, requêtes enregistrées."""
+
+    def __init__(self, responses):
+        self.responses = {url: list(items) for url, items in responses.items()}
+        self.requests = []
+
+    def get(self, url, timeout=None, headers=None, stream=False):
+        self.requests.append((url, dict(headers or {})))
+        items = self.responses[url]
+        response = items.pop(0) if len(items) > 1 else items[0]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def close(self):
+        pass
+
+
+def _fake_reader(monkeypatch, responses, **config):
+    """Reader utilisant une session simulée ; retourne aussi les délais d'attente."""
+    reader = AdvancedSitemapReader(
+        {"sitemap_url": "https://www.example.com/sitemap.xml", **config}
+    )
+    reader._session = _FakeSession(responses)
+    sleeps = []
+    monkeypatch.setattr(advanced_sitemap_reader.time, "sleep", sleeps.append)
+    return reader, sleeps
+
+
+def test_fetch_response_retries_server_errors(monkeypatch):
+    url = "https://www.example.com/page"
+    reader, sleeps = _fake_reader(
+        monkeypatch,
+        {url: [_FakeResponse(url, 503), _FakeResponse(url, 500), _FakeResponse(url)]},
+        retry_backoff=1,
+    )
+
+    response = reader._fetch_response(url)
+
+    assert response.status_code == 200
+    assert len(reader._session.requests) == 3
+    assert len(sleeps) == 2
+    assert 0.5 <= sleeps[0] <= 1 and 1 <= sleeps[1] <= 2
+
+
+def test_fetch_response_does_not_retry_missing_pages(monkeypatch):
+    url = "https://www.example.com/page"
+    reader, sleeps = _fake_reader(monkeypatch, {url: [_FakeResponse(url, 404)]})
+
+    assert reader._fetch_response(url) is None
+    assert len(reader._session.requests) == 1
+    assert sleeps == []
+
+
+def test_fetch_response_honours_retry_after(monkeypatch):
+    url = "https://www.example.com/page"
+    reader, sleeps = _fake_reader(
+        monkeypatch,
+        {url: [_FakeResponse(url, 429, headers={"Retry-After": "500"})]},
+        max_attempts=3,
+        max_retry_delay=30,
+    )
+
+    assert reader._fetch_response(url) is None
+    assert len(reader._session.requests) == 3
+    # Le délai demandé par le serveur est plafonné par max_retry_delay
+    assert sleeps == [30, 30]
+
+
+def test_session_is_shared_and_closed():
+    reader = AdvancedSitemapReader(
+        {"sitemap_url": "https://www.example.com/sitemap.xml", "keep_alive": False}
+    )
+    session = reader._get_session()
+    assert reader._get_session() is session
+    assert session.headers["Connection"] == "close"
+    assert isinstance(session.get_adapter("https://www.example.com"), PooledHTTPAdapter)
+
+    reader.close()
+    assert reader._session is None
+    assert reader._get_session() is not session
+
+
+SITEMAP_URL = "https://www.example.com/sitemap.xml"
+
+
+def _sitemap(*entries, root="urlset", tag="url"):
+    items = "".join(
+        f"<{tag}><loc>{loc}</loc>"
+        + (f"<lastmod>{lastmod}</lastmod>" if lastmod else "")
+        + f"</{tag}>"
+        for loc, lastmod in entries
+    )
+    return _FakeResponse(
+        SITEMAP_URL,
+        content=(
+            f'<?xml version="1.0" encoding="UTF-8"?><{root} '
+            f'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{items}</{root}>'
+        ).encode(),
+        headers={"Content-Type": "application/xml"},
+    )
+
+
+def _page(url, text, status_code=200, etag=None):
+    headers = {"ETag": etag} if etag else {}
+    return _FakeResponse(
+        url, status_code, f"<html><body><p>{text}</p></body></html>".encode(), headers
+    )
+
+
+def _crawl(tmp_path, responses, operation="cache"):
+    reader = AdvancedSitemapReader(
+        {
+            "sitemap_url": SITEMAP_URL,
+            "crawl_state_path": str(tmp_path / "crawl_state.json"),
+            "html_to_text": False,
+        }
+    )
+    reader.set_operation(operation)
+    reader._session = _FakeSession(responses)
+    return reader, [document.doc_id for document in reader.lazy_load_data()]
+
+
+def test_incremental_crawl(tmp_path):
+    page_a = "https://www.example.com/a"
+    page_b = "https://www.example.com/b"
+    page_c = "https://www.example.com/c"
+    sitemap = _sitemap((page_a, None), (page_b, "2024-01-01"), (page_c, None))
+    first_responses = {
+        SITEMAP_URL: [sitemap],
+        page_a: [_page(page_a, "A", etag='"a1"')],
+        page_b: [_page(page_b, "B")],
+        page_c: [_page(page_c, "C")],
+    }
+    reader, doc_ids = _crawl(tmp_path, first_responses)
+    assert doc_ids == [page_a, page_b, page_c]
+
+    # Seules les pages confirmées par l'appelant sont enregistrées dans l'état
+    reader.commit_docs([page_a, page_b])
+    reader, doc_ids = _crawl(
+        tmp_path,
+        {
+            SITEMAP_URL: [sitemap],
+            page_a: [_page(page_a, "A", status_code=304)],
+            page_b: [_page(page_b, "B")],
+            page_c: [_page(page_c, "C")],
+        },
+    )
+    requests = dict(reader._session.requests)
+    # Requête conditionnelle (304) pour a, aucune requête pour b (lastmod inchangé)
+    assert requests[page_a]["If-None-Match"] == '"a1"'
+    assert page_b not in requests
+    assert "If-None-Match" not in requests[page_c]
+    assert doc_ids == [page_c]
+    assert reader.get_unchanged_docs() == [page_a, page_b]
+
+    # Contenu identique : la page n'est pas renvoyée
+    reader.commit_docs(doc_ids)
+    reader, doc_ids = _crawl(
+        tmp_path,
+        {
+            SITEMAP_URL: [sitemap],
+            page_a: [_page(page_a, "A2", etag='"a2"')],
+            page_c: [_page(page_c, "C")],
+        },
+    )
+    assert doc_ids == [page_a]
+    assert reader.get_unchanged_docs() == [page_b, page_c]
+
+    # L'état de l'ingestion est distinct de celui du cache
+    _, doc_ids = _crawl(tmp_path, first_responses, operation="ingest")
+    assert doc_ids == [page_a, page_b, page_c]
+    assert (tmp_path / "crawl_state.cache.json").exists()
+
+
+def test_lazy_load_data_streams_pages():
+    pages = [f"https://www.example.com/{i}" for i in range(5)]
+    reader = AdvancedSitemapReader(
+        {
+            "sitemap_url": SITEMAP_URL,
+            "url_canonicalization": {"drop_query": True},
+        }
+    )
+    reader._session = _FakeSession(
+        {
+            SITEMAP_URL: [
+                _sitemap(
+                    (pages[0], None),
+                    (pages[1], None),
+                    (pages[0] + "?utm_source=x", None),
+                    *[(page, None) for page in pages[2:]],
+                )
+            ],
+            **{page: [_page(page, page)] for page in pages},
+        }
+    )
+
+    documents = reader.lazy_load_data()
+    first = next(documents)
+    # Les pages sont récupérées au fil de la consommation des documents
+    assert first.doc_id == pages[0]
+    assert len(reader._session.requests) == 2
+
+    rest = list(documents)
+    assert [document.doc_id for document in rest] == pages[1:]
+    # Alias trouvé après que le document a été renvoyé : ignoré
+    assert "aliases" not in first.metadata
+    # Seules les URLs des documents renvoyés sont conservées
+    assert set(reader._doc_metadata.values()) == {None}
+
+
+def test_lazy_load_data_sitemap_error():
+    reader = AdvancedSitemapReader({"sitemap_url": SITEMAP_URL})
+    reader._session = _FakeSession({SITEMAP_URL: [_FakeResponse(SITEMAP_URL, 404)]})
+
+    with pytest.raises(LoadDataError):
+        list(reader.lazy_load_data())
+    assert reader.load_data() is None
+
+
+def test_sitemap_index_fan_out():
+    child = "https://www.example.com/sitemap-{}.xml"
+    page = "https://www.example.com/page/{}"
+    index = _sitemap(
+        (child.format(1), None),
+        (child.format(2), None),
+        (child.format("nested"), None),
+        (child.format(1), None),
+        root="sitemapindex",
+        tag="sitemap",
+    )
+    responses = {
+        SITEMAP_URL: [index],
+        child.format(1): [_sitemap((page.format(1), None), (page.format(2), None))],
+        child.format(2): [_sitemap((page.format(2), None), (page.format(3), None))],
+        child.format("nested"): [
+            _sitemap((child.format(3), None), root="sitemapindex", tag="sitemap")
+        ],
+        child.format(3): [_sitemap((page.format(1), None), (page.format(4), None))],
+        **{page.format(i): [_page(page.format(i), str(i))] for i in range(1, 5)},
+    }
+    reader = AdvancedSitemapReader(
+        {"sitemap_url": SITEMAP_URL, "sitemap_workers": 2, "html_to_text": False}
+    )
+    reader._session = _FakeSession(responses)
+
+    doc_ids = [document.doc_id for document in reader.lazy_load_data()]
+
+    # Pages dans l'ordre de l'index, chaque sitemap et chaque page récupérés une fois
+    assert doc_ids == [page.format(i) for i in range(1, 5)]
+    requested = [url for url, _ in reader._session.requests]
+    assert sorted(requested) == sorted(responses)
+
+
+def test_sitemap_index_child_error():
+    child = "https://www.example.com/sitemap-1.xml"
+    reader = AdvancedSitemapReader({"sitemap_url": SITEMAP_URL})
+    reader._session = _FakeSession(
+        {
+            SITEMAP_URL: [_sitemap((child, None), root="sitemapindex", tag="sitemap")],
+            child: [_FakeResponse(child, 404)],
+        }
+    )
+
+    with pytest.raises(LoadDataError):
+        list(reader.lazy_load_data())
+
+
+def test_parse_workers_requires_async_mode():
+    with pytest.raises(ValueError):
+        AdvancedSitemapReader({"sitemap_url": SITEMAP_URL, "parse_workers": 2})
+
+
+def test_parse_and_convert_page():
+    reader = AdvancedSitemapReader({"sitemap_url": SITEMAP_URL, "embed_pdf": True})
+
+    text, _, pdf_urls = reader._parse_and_convert_page(
+        "https://www.example.com/", b"<html><body><p>**a** b</p></body></html>"
+    )
+    assert pdf_urls == []
+    assert text == reader._convert_page_text("**a** b")
+
+    # Le texte d'une page avec des PDFs est converti une fois les PDFs inclus
+    text, _, pdf_urls = reader._parse_and_convert_page(
+        "https://www.example.com/",
+        b"<html><body><p>**a** b</p><a href='/doc.pdf'>pdf</a></body></html>",
+    )
+    assert pdf_urls == ["https://www.example.com/doc.pdf"]
+    assert text == "**a** bpdf"
+
+
+def test_parse_workers_output():
+    pages = [f"https://www.example.com/{i}" for i in range(4)]
+    responses = {
+        SITEMAP_URL: [_sitemap(*[(page, None) for page in pages])],
+        **{page: [_page(page, f"<b>{page}</b>")] for page in pages},
+    }
+
+    texts = []
+    for parse_workers in (0, 2):
+        reader = AdvancedSitemapReader(
+            {
+                "sitemap_url": SITEMAP_URL,
+                "async_mode": True,
+                "parse_workers": parse_workers,
+            }
+        )
+        reader._session = _FakeSession(responses)
+        texts.append([document.text for document in reader.lazy_load_data()])
+
+    assert texts[0] == texts[1]
+    assert len(texts[1]) == 4
+
+
+def test_rejected_page_is_unsuccessful(monkeypatch):
+    image_url = "https://www.example.com/image"
+    large_url = "https://www.example.com/large"
+    reader, _ = _fake_reader(
+        monkeypatch,
+        {
+            image_url: [
+                _FakeResponse(image_url, headers={"Content-Type": "image/png"})
+            ],
+            large_url: [_FakeResponse(large_url, content=b"<p>x</p>" * 1024)],
+        },
+        max_page_size_mb=0.001,
+    )
+
+    assert reader._process_page(image_url) is None
+    assert reader._process_page(large_url) is None
+    assert reader.get_unsuccessful_docs() == [image_url, large_url]
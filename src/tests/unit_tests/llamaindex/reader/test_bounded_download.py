@@ -0,0 +1,54 @@
+import hashlib
+import io
+import os
+
+import pytest
+import requests
+
+from eurelis_llmatoolkit.llamaindex.readers.bounded_download import (
+    ResponseTooLargeError,
+    UnexpectedContentTypeError,
+    download_body,
+)
+
+
+def _response(body: bytes, content_type: str = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(body)
+    if content_type:
+        response.headers["Content-Type"] = content_type
+    return response
+
+
+def test_download_body_in_memory():
+    body = download_body(_response(b"<html></html>", "text/html; charset=utf-8"))
+
+    assert body.content == b"<html></html>"
+    assert body.source == b"<html></html>"
+    assert body.content_hash == hashlib.sha256(b"<html></html>").hexdigest()
+
+
+def test_download_body_spooled():
+    data = b"%PDF" + b"x" * 1000
+
+    with download_body(_response(data), spool_threshold=100, chunk_size=64) as body:
+        assert body.content is None
+        with open(body.source, "rb") as f:
+            assert f.read() == data
+        path = body.path
+
+    assert not os.path.exists(path)
+
+
+def test_download_body_too_large():
+    with pytest.raises(ResponseTooLargeError):
+        download_body(_response(b"x" * 1000), max_size=100, chunk_size=64)
+
+
+def test_download_body_unexpected_content_type():
+    with pytest.raises(UnexpectedContentTypeError):
+        download_body(
+            _response(b"\x00\x01", "application/octet-stream"),
+            accepted_types=("text/html",),
+        )
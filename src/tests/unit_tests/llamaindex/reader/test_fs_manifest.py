@@ -0,0 +1,92 @@
+import os
+
+from eurelis_llmatoolkit.llamaindex.readers.fs_manifest import FSManifest
+from eurelis_llmatoolkit.llamaindex.readers.streaming_txt_file_reader import (
+    StreamingTXTFileReader,
+)
+
+
+def test_fs_manifest_detects_changes(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    path = tmp_path / "a.txt"
+    path.write_text("content")
+
+    manifest = FSManifest(str(manifest_path))
+    assert not manifest.is_unchanged("a.txt", str(path), path.stat())
+    manifest.update("a.txt", path.stat(), path=str(path))
+    manifest.update("b.txt", path.stat(), content_hash="0" * 64)
+    assert manifest.prune(["a.txt"]) == ["b.txt"]
+    manifest.save()
+
+    manifest = FSManifest(str(manifest_path))
+    assert manifest.is_unchanged("a.txt", str(path), path.stat())
+
+    # Un fichier seulement "touché" reste inchangé, un contenu différent non
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 10**9))
+    assert manifest.is_unchanged("a.txt", str(path), path.stat())
+    path.write_text("CONTENT")
+    assert not manifest.is_unchanged("a.txt", str(path), path.stat())
+
+
+def _manifest_reader(tmp_path):
+    return StreamingTXTFileReader(
+        {
+            "base_dir": str(tmp_path / "data"),
+            "glob": "*.txt",
+            "section_size": 16,
+            "manifest_path": str(tmp_path / "manifest.json"),
+        }
+    )
+
+
+def test_fs_manifest_waits_for_commit(tmp_path):
+    (tmp_path / "data").mkdir()
+    for name in ("a", "b"):
+        (tmp_path / "data" / f"{name}.txt").write_text("0123456789abcde\n" * 2)
+
+    # Sans confirmation, les fichiers sont relus au chargement suivant
+    reader = _manifest_reader(tmp_path)
+    reader.set_operation("cache")
+    assert len(reader.load_data()) == 4
+    reader = _manifest_reader(tmp_path)
+    reader.set_operation("cache")
+    documents = reader.load_data()
+    assert len(documents) == 4
+
+    # Un fichier n'est enregistré qu'une fois toutes ses parties confirmées
+    reader.commit_docs(["a.txt#part-0", "a.txt#part-1", "b.txt#part-0"])
+    reader = _manifest_reader(tmp_path)
+    reader.set_operation("cache")
+    assert [doc.doc_id for doc in reader.load_data()] == [
+        "b.txt#part-0",
+        "b.txt#part-1",
+    ]
+
+    # Chaque opération a son propre manifeste
+    assert (tmp_path / "manifest.cache.json").exists()
+    reader = _manifest_reader(tmp_path)
+    reader.set_operation("ingest")
+    assert len(reader.load_data()) == 4
+
+
+def test_fs_manifest_commit_before_stage(tmp_path):
+    (tmp_path / "data").mkdir()
+    for name in ("a", "b"):
+        (tmp_path / "data" / f"{name}.txt").write_text("0123456789abcde\n" * 2)
+    reader = _manifest_reader(tmp_path)
+    reader.set_operation("ingest")
+    documents = reader.lazy_load_data()
+
+    # Le lot est confirmé avant que le reader n'ait fini de traiter a.txt
+    batch = [next(documents), next(documents)]
+    reader.commit_docs([doc.doc_id for doc in batch])
+    assert next(documents).doc_id == "b.txt#part-0"
+    documents.close()
+
+    # Chargement interrompu : a.txt est enregistré, b.txt est relu
+    reader = _manifest_reader(tmp_path)
+    reader.set_operation("ingest")
+    assert [doc.doc_id for doc in reader.load_data()] == [
+        "b.txt#part-0",
+        "b.txt#part-1",
+    ]
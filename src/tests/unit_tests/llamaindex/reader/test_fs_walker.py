@@ -0,0 +1,46 @@
+import pytest
+
+from eurelis_llmatoolkit.llamaindex.readers.fs_walker import FSWalker
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for relative_path in [
+        "a.txt",
+        "b.pdf",
+        "docs/c.txt",
+        "docs/draft-d.txt",
+        "docs/deep/e.txt",
+        "archive/f.txt",
+    ]:
+        path = tmp_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(relative_path)
+    return tmp_path
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_fs_walker_include_exclude(tree, workers):
+    walker = FSWalker(
+        include=["*.txt", "*.pdf"], exclude=["archive/", "draft-*"], workers=workers
+    )
+
+    files = list(walker.walk(tree))
+
+    assert [f.relative_path for f in files] == [
+        "a.txt",
+        "b.pdf",
+        "docs/c.txt",
+        "docs/deep/e.txt",
+    ]
+    assert files[0].stat.st_size == len("a.txt")
+
+
+def test_fs_walker_matches_like_rglob(tree):
+    walker = FSWalker(include="docs/*.txt")
+
+    relative_paths = [f.relative_path for f in walker.walk(tree)]
+
+    assert relative_paths == sorted(
+        p.relative_to(tree).as_posix() for p in tree.rglob("docs/*.txt")
+    )
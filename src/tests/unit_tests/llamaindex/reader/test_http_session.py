@@ -0,0 +1,132 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from eurelis_llmatoolkit.llamaindex.readers.advanced_sitemap_reader import (
+    AdvancedSitemapReader,
+)
+
+PAGE_COUNT = 8
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive : plusieurs requêtes par connexion
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        # Pages simultanées (la page en timeout reste active côté serveur)
+        is_page = self.path.startswith("/page/")
+        with server.lock:
+            server.hits.append(self.path)
+            server.active += is_page
+            server.max_active = max(server.max_active, server.active)
+        try:
+            if self.path == "/sitemap.xml":
+                base = f"http://127.0.0.1:{server.server_address[1]}"
+                locs = [f"/page/{i}" for i in range(PAGE_COUNT)] + ["/slow"]
+                urls = "".join(f"<url><loc>{base}{loc}</loc></url>" for loc in locs)
+                body = (
+                    '<?xml version="1.0" encoding="UTF-8"?><urlset xmlns='
+                    f'"http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+                ).encode()
+                content_type = "application/xml"
+            else:
+                time.sleep(0.5 if self.path == "/slow" else 0.05)
+                body = f"<html><body><p>{self.path}</p></body></html>".encode()
+                content_type = "text/html"
+
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client parti après un timeout
+        finally:
+            with server.lock:
+                server.active -= is_page
+
+
+@pytest.fixture
+def http_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.hits = []
+    server.active = 0
+    server.max_active = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _reader(server, **config):
+    return AdvancedSitemapReader(
+        {
+            "sitemap_url": f"http://127.0.0.1:{server.server_address[1]}/sitemap.xml",
+            "html_to_text": False,
+            "requests_timeout": 0.2,
+            "max_attempts": 2,
+            "retry_backoff": 0,
+            **config,
+        }
+    )
+
+
+def test_connections_are_reused(http_server):
+    reader = _reader(http_server)
+
+    documents = reader.load_data()
+
+    assert len(documents) == PAGE_COUNT
+    stats = reader.get_connection_stats()
+    # Sitemap, pages et deux tentatives pour la page en timeout
+    assert stats["requests"] == PAGE_COUNT + 3
+    # Une nouvelle connexion après chaque timeout, sinon la même connexion
+    assert stats["connections_opened"] <= 3
+    reader.close()
+
+
+def test_keep_alive_disabled(http_server):
+    reader = _reader(http_server, keep_alive=False)
+
+    reader.load_data()
+
+    stats = reader.get_connection_stats()
+    assert stats["connections_opened"] == stats["requests"]
+    assert stats["connections_reused"] == 0
+
+
+def test_per_host_limit(http_server):
+    reader = _reader(
+        http_server,
+        async_mode=True,
+        max_concurrent_requests=8,
+        max_concurrent_requests_per_host=2,
+    )
+
+    documents = reader.load_data()
+
+    assert len(documents) == PAGE_COUNT
+    assert http_server.max_active == 2
+    # Les connexions du pool sont réutilisées d'une page à l'autre
+    assert reader.get_connection_stats()["connections_opened"] <= 4
+
+
+def test_timeout_marks_page_unsuccessful(http_server):
+    reader = _reader(http_server)
+
+    doc_ids = [document.doc_id for document in reader.load_data()]
+
+    slow_url = f"http://127.0.0.1:{http_server.server_address[1]}/slow"
+    assert slow_url not in doc_ids
+    assert reader.get_unsuccessful_docs() == [slow_url]
+    assert http_server.hits.count("/slow") == 2
@@ -0,0 +1,44 @@
+import io
+
+import requests
+
+from eurelis_llmatoolkit.llamaindex.readers.bounded_download import download_body
+from eurelis_llmatoolkit.llamaindex.readers.pdf_cache import PDFExtractionCache
+
+
+def _content_hash(content: bytes) -> str:
+    # Clé calculée par le reader lors du téléchargement du PDF
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(content)
+    return download_body(response).content_hash
+
+
+def test_pdf_cache_roundtrip(tmp_path):
+    cache = PDFExtractionCache(str(tmp_path))
+    content_hash = _content_hash(b"%PDF-1.7 brochure")
+    cache.put(content_hash, "Brochure", "# Brochure")
+    cache.link_url("https://www.example.com/brochure.pdf", '"v1"', content_hash)
+    cache.save()
+
+    reloaded = PDFExtractionCache(str(tmp_path))
+    assert reloaded.get_url("https://www.example.com/brochure.pdf") == {
+        "etag": '"v1"',
+        "hash": content_hash,
+    }
+    assert reloaded.get(content_hash) == ("Brochure", "# Brochure")
+
+
+def test_pdf_cache_lru_eviction(tmp_path):
+    # Place pour deux extractions seulement
+    cache = PDFExtractionCache(str(tmp_path), max_size_mb=2500 / (1024 * 1024))
+    hashes = [_content_hash(bytes([i])) for i in range(3)]
+
+    cache.put(hashes[0], None, "a" * 1000)
+    cache.put(hashes[1], None, "b" * 1000)
+    cache.get(hashes[0])  # hashes[1] devient le moins récemment utilisé
+    cache.put(hashes[2], None, "c" * 1000)
+
+    assert cache.get(hashes[0]) is not None
+    assert cache.get(hashes[1]) is None
+    assert cache.get(hashes[2]) is not None
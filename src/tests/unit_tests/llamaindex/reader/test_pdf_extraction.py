@@ -0,0 +1,101 @@
+import io
+import threading
+import time
+
+import pymupdf
+import pytest
+import requests
+
+from eurelis_llmatoolkit.llamaindex.readers import pdf_extraction
+from eurelis_llmatoolkit.llamaindex.readers.advanced_sitemap_reader import (
+    AdvancedSitemapReader,
+)
+from eurelis_llmatoolkit.llamaindex.readers.pdf_file_reader import PDFFileReader
+
+
+def _pages_to_markdown(source, pages):
+    # Exécutée dans les processus du pool à la place de la conversion pymupdf4llm
+    time.sleep(60 if source == "lent.pdf" else 1)
+    return [f"{source} page {page}" for page in pages]
+
+
+def _blocked_pdf_to_markdown(source):
+    time.sleep(60)
+
+
+def _blocked_pages_to_markdown(source, pages):
+    time.sleep(60)
+
+
+def test_extract_pages_retries_after_timeout(monkeypatch):
+    monkeypatch.setattr(pdf_extraction, "pdf_pages_to_markdown", _pages_to_markdown)
+    extractor = pdf_extraction.PDFExtractor(workers=2, timeout=6)
+    errors = []
+    results = []
+
+    def extract_slow():
+        try:
+            list(extractor.extract_pages("lent.pdf", [[0]]))
+        except TimeoutError as e:
+            errors.append(e)
+
+    # Les lots du deuxième fichier sont en cours lors de l'arrêt du pool
+    slow = threading.Thread(target=extract_slow)
+    slow.start()
+    time.sleep(0.5)
+    first_pool = extractor._executor
+    results.extend(extractor.extract_pages("b.pdf", [[page] for page in range(8)]))
+    slow.join()
+
+    # Le fichier en timeout échoue, les lots interrompus sont convertis par un
+    # nouveau pool
+    assert len(errors) == 1
+    assert results == [[f"b.pdf page {page}"] for page in range(8)]
+    assert extractor._executor is not first_pool
+    extractor.close()
+
+
+@pytest.mark.parametrize("pages_per_section", [0, 2])
+def test_pdf_file_reader_timeout_is_unsuccessful(
+    tmp_path, monkeypatch, pages_per_section
+):
+    monkeypatch.setattr(pdf_extraction, "pdf_to_markdown", _blocked_pdf_to_markdown)
+    monkeypatch.setattr(
+        pdf_extraction, "pdf_pages_to_markdown", _blocked_pages_to_markdown
+    )
+    pdf = pymupdf.open()
+    pdf.new_page()
+    pdf.save(tmp_path / "lent.pdf")
+    reader = PDFFileReader(
+        {
+            "base_dir": str(tmp_path),
+            "glob": "*.pdf",
+            "pages_per_section": pages_per_section,
+            "pdf_workers": 1,
+            "pdf_timeout": 6,
+        }
+    )
+
+    assert reader.load_data() == []
+    assert reader.get_unsuccessful_docs() == ["lent.pdf"]
+
+
+def test_sitemap_pdf_timeout_is_unsuccessful(monkeypatch):
+    monkeypatch.setattr(pdf_extraction, "pdf_to_markdown", _blocked_pdf_to_markdown)
+    pdf_url = "https://www.example.com/lent.pdf"
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(b"%PDF-1.7")
+    response.headers["Content-Type"] = "application/pdf"
+    reader = AdvancedSitemapReader(
+        {
+            "sitemap_url": "https://www.example.com/sitemap.xml",
+            "pdf_workers": 1,
+            "pdf_timeout": 6,
+        }
+    )
+    monkeypatch.setattr(reader, "_fetch_response", lambda url, **kwargs: response)
+
+    assert reader._process_pdf(pdf_url) == ""
+    assert reader.get_unsuccessful_docs() == [pdf_url]
+    reader.close()
@@ -0,0 +1,79 @@
+import pymupdf
+from llama_index.core.schema import MetadataMode
+
+from eurelis_llmatoolkit.llamaindex.factories.cache_factory import CacheFactory
+from eurelis_llmatoolkit.llamaindex.readers import pdf_extraction
+from eurelis_llmatoolkit.llamaindex.readers.pdf_file_reader import PDFFileReader
+
+
+def _write_pdf(path, changed_page=None):
+    pdf = pymupdf.open()
+    for i in range(5):
+        page = pdf.new_page()
+        suffix = " modifiée" if i == changed_page else ""
+        page.insert_text((72, 72), f"Page {i}{suffix}")
+    pdf.save(path)
+
+
+def test_pdf_file_reader_sections_and_page_cache(tmp_path, monkeypatch):
+    base_dir = tmp_path / "pdfs"
+    base_dir.mkdir()
+    _write_pdf(base_dir / "manuel.pdf")
+    config = {
+        "base_dir": str(base_dir),
+        "glob": "*.pdf",
+        "pages_per_section": 2,
+        "pdf_cache_dir": str(tmp_path / "cache"),
+    }
+
+    documents = PDFFileReader(config).load_data()
+
+    assert [doc.doc_id for doc in documents] == [
+        "manuel.pdf#part-0",
+        "manuel.pdf#part-1",
+        "manuel.pdf#part-2",
+    ]
+    assert [
+        (doc.metadata["page_start"], doc.metadata["page_end"]) for doc in documents
+    ] == [(1, 2), (3, 4), (5, 5)]
+    assert "Page 2" in documents[1].text and "Page 3" in documents[1].text
+
+    # Seule la page modifiée est reconvertie
+    converted_pages = []
+    pages_to_markdown = pdf_extraction.pdf_pages_to_markdown
+
+    def record_pages(source, pages):
+        converted_pages.extend(pages)
+        return pages_to_markdown(source, pages)
+
+    monkeypatch.setattr(pdf_extraction, "pdf_pages_to_markdown", record_pages)
+    _write_pdf(base_dir / "manuel.pdf", changed_page=3)
+
+    documents = PDFFileReader(config).load_data()
+
+    assert converted_pages == [3]
+    assert "modifiée" in documents[1].text
+
+
+def test_pdf_sections_from_cache(tmp_path):
+    base_dir = tmp_path / "pdfs"
+    base_dir.mkdir()
+    _write_pdf(base_dir / "manuel.pdf")
+    documents = PDFFileReader(
+        {"base_dir": str(base_dir), "glob": "*.pdf", "pages_per_section": 2}
+    ).load_data()
+    cache = CacheFactory.create_cache(
+        {"provider": "FSCache", "base_dir": str(tmp_path / "cache")}
+    )
+    cache.to_cache("dataset", documents)
+
+    cached = {doc.doc_id: doc for doc in cache.load_data("dataset")}
+
+    # Les pages couvertes restent exclues de l'embedding, part aussi pour le LLM
+    for doc in documents:
+        embed_content = cached[doc.doc_id].get_content(MetadataMode.EMBED)
+        assert embed_content == doc.get_content(MetadataMode.EMBED)
+        assert "page_start" not in embed_content
+        llm_content = cached[doc.doc_id].get_content(MetadataMode.LLM)
+        assert llm_content == doc.get_content(MetadataMode.LLM)
+        assert "part:" not in llm_content and "page_start" in llm_content
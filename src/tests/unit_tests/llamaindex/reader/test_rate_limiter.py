@@ -0,0 +1,34 @@
+import time
+from email.utils import formatdate
+
+from eurelis_llmatoolkit.llamaindex.readers.rate_limiter import (
+    HostRateLimiter,
+    backoff_delay,
+    parse_retry_after,
+)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("invalid") is None
+    assert 25 < parse_retry_after(formatdate(time.time() + 30, usegmt=True)) <= 30
+
+
+def test_backoff_delay():
+    for attempt in range(10):
+        delay = backoff_delay(attempt, 2, 60)
+        expected = min(60, 2 * 2**attempt)
+        assert expected / 2 <= delay <= expected
+
+
+def test_host_rate_limiter_burst():
+    limiter = HostRateLimiter(rate=1, burst=3)
+
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.acquire("https://www.example.com/page")
+    limiter.acquire("https://other.example.com/page")
+
+    # Le burst et l'autre hôte ne sont pas limités
+    assert time.monotonic() - start < 0.5
@@ -0,0 +1,22 @@
+import pytest
+
+from eurelis_llmatoolkit.llamaindex.readers.raw_response_cache import RawResponseCache
+
+
+def test_raw_response_cache_roundtrip(tmp_path):
+    cache = RawResponseCache(str(tmp_path), mode="replay")
+    url = "https://www.example.com/page?id=1"
+
+    assert cache.get(url) is None
+
+    cache.put(url, {"Content-Type": "text/html", "ETag": '"v1"'}, b"<html></html>")
+    cached = cache.get(url)
+
+    assert cached.url == url
+    assert cached.headers["ETag"] == '"v1"'
+    assert cached.body == b"<html></html>"
+
+
+def test_raw_response_cache_invalid_mode(tmp_path):
+    with pytest.raises(ValueError):
+        RawResponseCache(str(tmp_path), mode="offline")
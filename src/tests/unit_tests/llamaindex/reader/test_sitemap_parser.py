@@ -0,0 +1,74 @@
+import gzip
+import io
+
+import requests
+
+from eurelis_llmatoolkit.llamaindex.readers.sitemap_parser import (
+    SitemapEntry,
+    SpooledResponseStream,
+    parse_sitemap,
+)
+
+URLSET = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">
+    <url>
+        <loc> https://www.example.com/page1 </loc>
+        <lastmod>2024-01-01</lastmod>
+        <image:image><image:loc>https://www.example.com/image.png</image:loc></image:image>
+    </url>
+    <url>
+        <loc>https://www.example.com/page2</loc>
+    </url>
+</urlset>
+"""
+
+SITEMAP_INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+    <sitemap><loc>https://www.example.com/sitemap1.xml</loc></sitemap>
+    <sitemap><loc>https://www.example.com/sitemap2.xml.gz</loc></sitemap>
+</sitemapindex>
+"""
+
+
+def _response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(body)
+    return response
+
+
+def test_parse_urlset():
+    root_name, entries = parse_sitemap(io.BytesIO(URLSET))
+
+    assert root_name == "urlset"
+    assert list(entries) == [
+        SitemapEntry("https://www.example.com/page1", "2024-01-01"),
+        SitemapEntry("https://www.example.com/page2", ""),
+    ]
+
+
+def test_parse_sitemap_index():
+    root_name, entries = parse_sitemap(io.BytesIO(SITEMAP_INDEX))
+
+    assert root_name == "sitemapindex"
+    assert [entry.loc for entry in entries] == [
+        "https://www.example.com/sitemap1.xml",
+        "https://www.example.com/sitemap2.xml.gz",
+    ]
+
+
+def test_spooled_response_stream_gzip():
+    with SpooledResponseStream(_response(gzip.compress(URLSET)), 16) as stream:
+        root_name, entries = parse_sitemap(stream)
+        assert root_name == "urlset"
+        assert len(list(entries)) == 2
+
+
+def test_spooled_response_stream_plain():
+    chunks = []
+    with SpooledResponseStream(_response(URLSET), 16) as stream:
+        while chunk := stream.read(100):
+            chunks.append(chunk)
+
+    assert b"".join(chunks) == URLSET
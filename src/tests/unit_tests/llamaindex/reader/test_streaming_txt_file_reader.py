@@ -0,0 +1,71 @@
+import pytest
+from llama_index.core.schema import MetadataMode
+
+from eurelis_llmatoolkit.llamaindex.factories.cache_factory import CacheFactory
+from eurelis_llmatoolkit.llamaindex.readers.streaming_txt_file_reader import (
+    StreamingTXTFileReader,
+)
+
+
+def test_streaming_txt_file_reader_sections(tmp_path):
+    content = "".join(f"ligne {i} éèà\n" for i in range(200)) + "x" * 300 + "é" * 100
+    (tmp_path / "big.txt").write_text(content, encoding="utf-8")
+    reader = StreamingTXTFileReader(
+        {"base_dir": str(tmp_path), "glob": "*.txt", "section_size": 256}
+    )
+
+    documents = reader.load_data()
+
+    assert len(documents) > 1
+    assert "".join(doc.text for doc in documents) == content
+    assert [doc.doc_id for doc in documents[:2]] == ["big.txt#part-0", "big.txt#part-1"]
+    raw = content.encode("utf-8")
+    for doc in documents:
+        assert doc.metadata["source"] == "big.txt"
+        start, end = doc.metadata["start_byte"], doc.metadata["end_byte"]
+        assert raw[start:end].decode("utf-8") == doc.text
+        assert "start_byte" not in doc.get_metadata_str(MetadataMode.EMBED)
+
+
+@pytest.mark.parametrize("provider", ["FSCache", "ShardCache", "SQLiteCache"])
+def test_streaming_txt_sections_from_cache(tmp_path, provider):
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "big.txt").write_text(
+        "".join(f"ligne {i}\n" for i in range(100)), encoding="utf-8"
+    )
+    reader = StreamingTXTFileReader(
+        {"base_dir": str(tmp_path / "docs"), "glob": "*.txt", "section_size": 256}
+    )
+    documents = reader.load_data()
+    cache = CacheFactory.create_cache(
+        {"provider": provider, "base_dir": str(tmp_path / "cache")}
+    )
+    cache.to_cache("dataset", documents)
+
+    cached = {doc.doc_id: doc for doc in cache.load_data("dataset")}
+
+    assert len(cached) == len(documents) > 1
+    for doc in documents:
+        for mode in (MetadataMode.EMBED, MetadataMode.LLM):
+            content = cached[doc.doc_id].get_content(mode)
+            assert content == doc.get_content(mode)
+            assert "start_byte" not in content and "part" not in content
+
+
+def test_streaming_txt_file_reader_whole_files(tmp_path):
+    (tmp_path / "a.txt").write_text("ligne 1\nligne 2\n", encoding="utf-8")
+    reader = StreamingTXTFileReader(
+        {
+            "base_dir": str(tmp_path),
+            "glob": "*.txt",
+            "section_size": 0,
+            "workers": 1,
+            "worker_type": "process",
+        }
+    )
+
+    (document,) = reader.load_data()
+
+    assert document.doc_id == "a.txt"
+    assert document.text == "ligne 1\nligne 2\n"
+    assert "part" not in document.metadata
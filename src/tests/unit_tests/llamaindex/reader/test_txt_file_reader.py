@@ -0,0 +1,20 @@
+import pytest
+
+from eurelis_llmatoolkit.llamaindex.readers.txt_file_reader import TXTFileReader
+
+
+@pytest.mark.parametrize("workers", [0, 3])
+def test_txt_file_reader_workers(tmp_path, workers):
+    for i in range(10):
+        (tmp_path / f"f{i}.txt").write_text(f"fichier {i}", encoding="utf-8")
+    (tmp_path / "f5.txt").write_bytes(b"\xff\xfe")
+    reader = TXTFileReader(
+        {"base_dir": str(tmp_path), "glob": "*.txt", "workers": workers}
+    )
+
+    documents = reader.load_data()
+
+    assert [doc.doc_id for doc in documents] == [
+        f"f{i}.txt" for i in range(10) if i != 5
+    ]
+    assert reader.get_unsuccessful_docs() == ["f5.txt"]
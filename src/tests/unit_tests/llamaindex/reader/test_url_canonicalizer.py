@@ -0,0 +1,48 @@
+from eurelis_llmatoolkit.llamaindex.readers.url_canonicalizer import URLCanonicalizer
+
+
+def test_canonicalize_defaults():
+    canonicalizer = URLCanonicalizer()
+
+    assert (
+        canonicalizer.canonicalize("HTTPS://WWW.Example.com:443/Page?b=2&a=1#top")
+        == "https://www.example.com/Page?a=1&b=2"
+    )
+    assert canonicalizer.canonicalize("https://www.example.com") == (
+        "https://www.example.com/"
+    )
+
+
+def test_canonicalize_rules():
+    canonicalizer = URLCanonicalizer.from_config(
+        {
+            "url_canonicalization": {
+                "force_scheme": "https",
+                "strip_query_params": ["utm_*", "fbclid"],
+                "trailing_slash": "strip",
+                "rewrites": [{"pattern": "/en-gb/", "replacement": "/en/"}],
+            }
+        }
+    )
+
+    assert (
+        canonicalizer.canonicalize(
+            "http://www.example.com/en-gb/page/?utm_source=x&UTM_medium=y&id=3&fbclid=z"
+        )
+        == "https://www.example.com/en/page?id=3"
+    )
+
+
+def test_canonicalize_add_trailing_slash():
+    canonicalizer = URLCanonicalizer(trailing_slash="add")
+
+    assert canonicalizer.canonicalize("https://example.com/page") == (
+        "https://example.com/page/"
+    )
+    assert canonicalizer.canonicalize("https://example.com/doc.pdf") == (
+        "https://example.com/doc.pdf"
+    )
+
+
+def test_no_canonicalization_configured():
+    assert URLCanonicalizer.from_config({}) is None
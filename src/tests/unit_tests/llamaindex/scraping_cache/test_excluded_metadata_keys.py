@@ -0,0 +1,32 @@
+import pytest
+from llama_index.core import Document
+from llama_index.core.schema import MetadataMode
+
+from eurelis_llmatoolkit.llamaindex.factories.cache_factory import CacheFactory
+
+
+@pytest.mark.parametrize("provider", ["FSCache", "ShardCache", "SQLiteCache"])
+def test_cache_keeps_excluded_metadata_keys(tmp_path, provider):
+    cache = CacheFactory.create_cache({"provider": provider, "base_dir": str(tmp_path)})
+    document = Document(
+        text="contenu",
+        doc_id="https://www.example.com/page#part-1",
+        metadata={"source": "https://www.example.com/page", "part": 1},
+        excluded_embed_metadata_keys=["part"],
+        excluded_llm_metadata_keys=["part", "source"],
+    )
+    cache.to_cache("dataset", [document])
+
+    (cached,) = cache.load_data("dataset")
+
+    assert cached.excluded_embed_metadata_keys == ["part"]
+    assert cached.excluded_llm_metadata_keys == ["part", "source"]
+    assert cached.get_content(MetadataMode.EMBED) == document.get_content(
+        MetadataMode.EMBED
+    )
+    # Les clés exclues font partie du contenu comparé : le document est réécrit
+    document.excluded_llm_metadata_keys = ["part"]
+    cache.to_cache("dataset", [document])
+    assert cache.get_write_stats()["written"] == 2
+    (cached,) = cache.load_data("dataset")
+    assert cached.excluded_llm_metadata_keys == ["part"]
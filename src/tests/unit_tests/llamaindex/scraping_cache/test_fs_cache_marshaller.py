@@ -0,0 +1,129 @@
+import os
+import time
+
+from llama_index.core import Document
+
+from eurelis_llmatoolkit.llamaindex.factories.cache_factory import CacheFactory
+
+
+def _documents(count, version="v1"):
+    return [
+        Document(
+            text=f"contenu {i} {version}",
+            doc_id=f"https://www.example.com/page/{i}",
+            metadata={"source": f"https://www.example.com/page/{i}"},
+        )
+        for i in range(count)
+    ]
+
+
+def _create_cache(tmp_path):
+    return CacheFactory.create_cache(
+        {"provider": "FSCache", "base_dir": str(tmp_path), "write_workers": 4}
+    )
+
+
+def test_fs_cache_skips_unchanged_documents(tmp_path):
+    cache = _create_cache(tmp_path)
+    cache.to_cache("dataset", _documents(20))
+    assert cache.get_write_stats()["written"] == 20
+
+    # Seuls les documents modifiés sont réécrits, y compris par une nouvelle instance
+    cache = _create_cache(tmp_path)
+    cache.to_cache("dataset", _documents(5, version="v2") + _documents(20)[5:])
+    stats = cache.get_write_stats()
+    assert stats["written"] == 5
+    assert stats["unchanged"] == 15
+
+    documents = cache.load_data("dataset")
+    assert len(documents) == 20
+    texts = {doc.doc_id: doc.text for doc in documents}
+    assert texts["https://www.example.com/page/3"] == "contenu 3 v2"
+    assert texts["https://www.example.com/page/12"] == "contenu 12 v1"
+    assert cache.get_unsuccessful_docs() == []
+
+    # Aucun fichier temporaire ne subsiste
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_fs_cache_rewrites_deleted_file(tmp_path):
+    cache = _create_cache(tmp_path)
+    cache.to_cache("dataset", _documents(3))
+    for path in tmp_path.rglob("*.json"):
+        path.unlink()
+
+    cache = _create_cache(tmp_path)
+    cache.to_cache("dataset", _documents(3))
+    assert cache.get_write_stats()["written"] == 3
+    assert len(cache.load_data("dataset")) == 3
+
+
+def test_fs_cache_prune(tmp_path):
+    cache = CacheFactory.create_cache(
+        {
+            "provider": "FSCache",
+            "base_dir": str(tmp_path),
+            "dataset_ttl_days": {"dataset": 1},
+        }
+    )
+    documents = _documents(6)
+    cache.to_cache("dataset", documents)
+    path_of = {
+        doc.doc_id: tmp_path / "dataset" / "www.example.com" / "page" / f"{i}.json"
+        for i, doc in enumerate(documents)
+    }
+
+    # Un document enregistré il y a plus d'un jour est expiré : il n'est plus relu
+    expired = time.time() - 2 * 24 * 3600
+    os.utime(path_of[documents[0].doc_id], (expired, expired))
+    assert len(cache.load_data("dataset")) == 5
+
+    # Les documents absents du dernier crawl sont supprimés
+    stats = cache.prune("dataset", [doc.doc_id for doc in documents[:4]])
+    assert stats == {"expired": 1, "removed": 2, "evicted": 0}
+    assert sorted(doc.doc_id for doc in cache.load_data("dataset")) == sorted(
+        doc.doc_id for doc in documents[1:4]
+    )
+
+    # Un document supprimé du cache est réécrit
+    cache.to_cache("dataset", documents[4:5])
+    assert path_of[documents[4].doc_id].exists()
+
+
+def test_fs_cache_evicts_least_recently_used(tmp_path):
+    cache = CacheFactory.create_cache(
+        {"provider": "FSCache", "base_dir": str(tmp_path), "max_size_mb": 0.001}
+    )
+    documents = [
+        Document(text="x" * 300, doc_id=f"https://www.example.com/page/{i}")
+        for i in range(6)
+    ]
+    cache.to_cache("dataset", documents)
+    files = sorted((tmp_path / "dataset").rglob("*.json"))
+    for i, path in enumerate(files):
+        os.utime(path, ns=(i * 10**9, path.stat().st_mtime_ns))
+
+    stats = cache.prune("dataset")
+    remaining = sorted((tmp_path / "dataset").rglob("*.json"))
+    assert stats["evicted"] == len(files) - len(remaining)
+    assert sum(path.stat().st_size for path in remaining) <= 0.001 * 1024 * 1024
+    assert remaining == files[-len(remaining) :]
+
+
+def test_fs_cache_keeps_file_parts_apart(tmp_path):
+    cache = _create_cache(tmp_path)
+    documents = [
+        Document(text=f"partie {part}", doc_id=f"docs/big.txt#part-{part}")
+        for part in range(3)
+    ]
+    cache.to_cache(
+        "dataset", documents + [Document(text="entier", doc_id="docs/big.txt")]
+    )
+
+    loaded = {doc.doc_id: doc.text for doc in cache.load_data("dataset")}
+    assert loaded == {
+        "docs/big.txt#part-0": "partie 0",
+        "docs/big.txt#part-1": "partie 1",
+        "docs/big.txt#part-2": "partie 2",
+        "docs/big.txt": "entier",
+    }
@@ -0,0 +1,109 @@
+import gzip
+import json
+
+from llama_index.core import Document
+
+from eurelis_llmatoolkit.llamaindex.factories.cache_factory import CacheFactory
+
+
+def _documents(count, version="v1"):
+    return [
+        Document(
+            text=f"contenu {i} {version}",
+            doc_id=f"https://www.example.com/page/{i}",
+            metadata={"source": f"https://www.example.com/page/{i}"},
+        )
+        for i in range(count)
+    ]
+
+
+def test_shard_cache_roundtrip(tmp_path):
+    cache = CacheFactory.create_cache(
+        {"provider": "ShardCache", "base_dir": str(tmp_path), "shard_size_mb": 0.0001}
+    )
+
+    cache.to_cache("dataset", _documents(20))
+    cache.to_cache("dataset", _documents(5, version="v2"))
+
+    dataset_dir = tmp_path / "dataset"
+    assert len(list(dataset_dir.glob("shard-*.jsonl.gz"))) > 1
+    documents = cache.load_data("dataset")
+    assert len(documents) == 20
+    texts = {doc.doc_id: doc.text for doc in documents}
+    assert texts["https://www.example.com/page/3"] == "contenu 3 v2"
+    assert texts["https://www.example.com/page/12"] == "contenu 12 v1"
+    assert documents[0].metadata["source"] == documents[0].doc_id
+
+    document = cache.get_document("dataset", "https://www.example.com/page/7")
+    assert document.text == "contenu 7 v1"
+    assert cache.get_document("dataset", "https://www.example.com/absent") is None
+
+    # Les shards restent des fichiers gzip lisibles
+    shard = sorted(dataset_dir.glob("shard-*.jsonl.gz"))[0]
+    assert gzip.decompress(shard.read_bytes()).count(b"\n") >= 1
+
+    cache.compact("dataset")
+    assert {doc.doc_id: doc.text for doc in cache.load_data("dataset")} == texts
+
+
+def test_shard_cache_compact_removes_unreferenced_shards(tmp_path):
+    cache = CacheFactory.create_cache(
+        {"provider": "ShardCache", "base_dir": str(tmp_path), "shard_size_mb": 0.0001}
+    )
+    cache.to_cache("dataset", _documents(10))
+    cache.to_cache("dataset", _documents(10, version="v2"))
+    dataset_dir = tmp_path / "dataset"
+    # Shard laissé par une compaction interrompue, absent de l'index
+    (dataset_dir / "shard-00900.jsonl.gz").write_bytes(b"")
+    assert cache.get_document("dataset", "https://www.example.com/page/1").text == (
+        "contenu 1 v2"
+    )
+
+    cache.compact("dataset")
+
+    index = json.loads((dataset_dir / "index.json").read_text(encoding="utf-8"))
+    referenced = {f"shard-{shard:05d}.jsonl.gz" for shard, *_ in index["docs"].values()}
+    assert min(referenced) > "shard-00900.jsonl.gz"
+    assert {path.name for path in dataset_dir.iterdir()} == referenced | {"index.json"}
+    # L'index gardé en mémoire est remplacé par celui de la compaction
+    assert cache.get_document("dataset", "https://www.example.com/page/1").text == (
+        "contenu 1 v2"
+    )
+    assert len(cache.load_data("dataset")) == 10
+
+
+def test_shard_cache_journal_skips_unchanged_and_prunes(tmp_path):
+    config = {"provider": "ShardCache", "base_dir": str(tmp_path)}
+    cache = CacheFactory.create_cache(config)
+    dataset_dir = tmp_path / "dataset"
+
+    # Chaque lot n'ajoute que ses entrées au journal, index.json n'est pas réécrit
+    cache.to_cache("dataset", _documents(4))
+    cache.to_cache("dataset", _documents(4)[:2])
+    assert not (dataset_dir / "index.json").exists()
+    journal = (dataset_dir / "index.log").read_text(encoding="utf-8").splitlines()
+    assert len(journal) == 4
+    assert cache.get_write_stats()["unchanged"] == 2
+
+    # Le journal est rejoué par une autre instance, même si sa dernière ligne est
+    # tronquée
+    with open(dataset_dir / "index.log", "a", encoding="utf-8") as f:
+        f.write('["https://www.example.com/page/9",0,')
+    other = CacheFactory.create_cache(config)
+    assert len(other.load_data("dataset")) == 4
+
+    # Les versions remplacées dépassent le volume des versions à jour : compaction
+    other.to_cache("dataset", _documents(4, version="v2"))
+    other.to_cache("dataset", _documents(4, version="v3"))
+    keep = [f"https://www.example.com/page/{i}" for i in range(3)]
+    assert other.prune("dataset", keep) == {"removed": 1, "compacted": True}
+
+    assert {path.name for path in dataset_dir.iterdir()} == {
+        "index.json",
+        "shard-00001.jsonl.gz",
+    }
+    texts = {
+        doc.doc_id: doc.text
+        for doc in CacheFactory.create_cache(config).load_data("dataset")
+    }
+    assert texts == {doc_id: f"contenu {doc_id[-1]} v3" for doc_id in keep}
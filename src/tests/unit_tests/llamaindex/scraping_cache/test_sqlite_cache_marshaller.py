@@ -0,0 +1,86 @@
+import sqlite3
+import time
+from contextlib import closing
+
+from llama_index.core import Document
+
+from eurelis_llmatoolkit.llamaindex.factories.cache_factory import CacheFactory
+
+
+def test_sqlite_cache_filtered_loads(tmp_path):
+    cache = CacheFactory.create_cache(
+        {"provider": "SQLiteCache", "base_dir": str(tmp_path), "batch_size": 3}
+    )
+    # Deux URLs ne différant que par la query string restent distinctes
+    documents = [
+        Document(text=f"page {i}", doc_id=f"https://www.example.com/p?id={i}")
+        for i in range(10)
+    ]
+    documents[0].metadata = {"source": documents[0].doc_id, "lastmod": "2024-01-01"}
+
+    cache.to_cache("dataset", documents)
+    since = time.time()
+    time.sleep(0.01)
+    cache.to_cache(
+        "dataset", [Document(text="page 2 v2", doc_id="https://www.example.com/p?id=2")]
+    )
+
+    loaded = cache.load_data("dataset")
+    assert len(loaded) == 10
+    assert loaded[0].metadata == documents[0].metadata
+
+    updated = cache.load_data("dataset", since=since)
+    assert [(doc.doc_id, doc.text) for doc in updated] == [
+        ("https://www.example.com/p?id=2", "page 2 v2")
+    ]
+
+    ids = ["https://www.example.com/p?id=5", "https://www.example.com/p?id=7"]
+    assert [doc.doc_id for doc in cache.load_data("dataset", ids=ids)] == ids
+    assert cache.load_data("other") == []
+
+
+def test_sqlite_cache_skips_unchanged_documents(tmp_path):
+    config = {"provider": "SQLiteCache", "base_dir": str(tmp_path), "batch_size": 4}
+    documents = [
+        Document(text=f"page {i}", doc_id=f"https://www.example.com/{i}")
+        for i in range(10)
+    ]
+    cache = CacheFactory.create_cache(config)
+    cache.to_cache("dataset", documents)
+    assert cache.get_write_stats()["written"] == 10
+    since = time.time()
+    time.sleep(0.01)
+
+    # Seuls les documents dont le texte ou les métadonnées ont changé sont réécrits
+    documents[1] = Document(text="page 1 v2", doc_id=documents[1].doc_id)
+    documents[2].metadata = {"lastmod": "2024-01-01"}
+    cache = CacheFactory.create_cache(config)
+    cache.to_cache("dataset", documents)
+    stats = cache.get_write_stats()
+    assert (stats["written"], stats["unchanged"]) == (2, 8)
+    assert [doc.doc_id for doc in cache.load_data("dataset", since=since)] == [
+        "https://www.example.com/1",
+        "https://www.example.com/2",
+    ]
+
+
+def test_sqlite_cache_migrates_existing_database(tmp_path):
+    # Base créée avant l'ajout de la colonne excluded_metadata_keys
+    with closing(sqlite3.connect(tmp_path / "scraping_cache.sqlite3")) as connection:
+        connection.execute(
+            "CREATE TABLE documents (dataset TEXT NOT NULL, doc_id TEXT NOT NULL,"
+            " text TEXT NOT NULL, metadata TEXT NOT NULL, content_hash TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL, PRIMARY KEY (dataset, doc_id))"
+        )
+        connection.execute(
+            "INSERT INTO documents VALUES ('dataset', 'a', 'texte', '{}', 'hash', 0)"
+        )
+        connection.commit()
+
+    cache = CacheFactory.create_cache(
+        {"provider": "SQLiteCache", "base_dir": str(tmp_path)}
+    )
+
+    (document,) = cache.load_data("dataset")
+    assert document.text == "texte"
+    assert document.excluded_embed_metadata_keys == []
@@ -0,0 +1,180 @@
+import pytest
+
+from eurelis_llmatoolkit.llamaindex.factories.cache_factory import CacheFactory
+from eurelis_llmatoolkit.llamaindex.ingestion_checkpoint import IngestionCheckpoint
+from eurelis_llmatoolkit.llamaindex.ingestion_wrapper import IngestionWrapper
+from eurelis_llmatoolkit.llamaindex.readers.streaming_txt_file_reader import (
+    StreamingTXTFileReader,
+)
+
+
+def test_checkpoint_save_and_load(tmp_path):
+    checkpoint = IngestionCheckpoint.from_config(
+        {"scraping_cache": {"base_dir": str(tmp_path)}}, "dataset", "ingest"
+    )
+    assert not checkpoint.load()
+
+    checkpoint.mark_failed(["a", "b"])
+    checkpoint.mark_completed(["b", "c"])
+    checkpoint.mark_failed(["c", "d"])
+    checkpoint.mark_sources_completed(["file.txt"])
+    checkpoint.save()
+
+    loaded = IngestionCheckpoint(tmp_path / "dataset.ingest.checkpoint.json")
+    assert loaded.load()
+    assert loaded.completed == {"b", "c"}
+    assert loaded.failed == {"a", "d"}
+    assert loaded.get_skip_doc_ids() == {"b", "c", "file.txt"}
+
+    loaded.delete()
+    assert not loaded.load()
+    assert not list(tmp_path.iterdir())
+
+
+def test_checkpoint_requires_a_directory():
+    assert IngestionCheckpoint.from_config({}, "dataset", "cache") is None
+
+
+def test_resume_skips_completed_files(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for name in ("a", "b", "c"):
+        (data_dir / f"{name}.txt").write_text("0123456789abcde\n" * 3)
+    config = {
+        "project": "test",
+        "scraping_cache": {"provider": "FSCache", "base_dir": str(tmp_path / "cache")},
+    }
+    dataset_config = {
+        "id": "dataset",
+        "batch_size": 4,
+        "reader": {
+            "provider": "StreamingTXTFileReader",
+            "base_dir": str(data_dir),
+            "glob": "*.txt",
+            "section_size": 16,
+        },
+    }
+    processed_files = []
+    process_file_documents = StreamingTXTFileReader._process_file_documents
+
+    def recording_process_file_documents(reader, path):
+        processed_files.append(path.name)
+        return process_file_documents(reader, path)
+
+    monkeypatch.setattr(
+        StreamingTXTFileReader,
+        "_process_file_documents",
+        recording_process_file_documents,
+    )
+
+    # Interruption pendant l'écriture du deuxième lot (b.txt#part-1 à c.txt#part-1)
+    indexation_wrapper = IngestionWrapper(config)
+    generate_cache = indexation_wrapper._generate_cache
+    calls = []
+
+    def interrupted_generate_cache(dataset_name, documents, cache=None):
+        calls.append(len(documents))
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        return generate_cache(dataset_name, documents, cache)
+
+    monkeypatch.setattr(
+        indexation_wrapper, "_generate_cache", interrupted_generate_cache
+    )
+    with pytest.raises(KeyboardInterrupt):
+        indexation_wrapper._generate_dataset_cache(dataset_config)
+
+    checkpoint = IngestionCheckpoint.from_config(config, "dataset", "cache")
+    assert checkpoint.load()
+    assert checkpoint.completed == {
+        "a.txt#part-0",
+        "a.txt#part-1",
+        "a.txt#part-2",
+        "b.txt#part-0",
+    }
+    assert checkpoint.completed_sources == {"a.txt"}
+
+    # La reprise ne relit pas a.txt et n'écrit pas à nouveau b.txt#part-0
+    processed_files.clear()
+    indexation_wrapper = IngestionWrapper(config)
+    assert indexation_wrapper._generate_dataset_cache(dataset_config, resume=True)
+    assert processed_files == ["b.txt", "c.txt"]
+
+    cache = CacheFactory.create_cache(config["scraping_cache"])
+    doc_ids = sorted(doc.doc_id for doc in cache.load_data("dataset"))
+    assert doc_ids == [f"{name}.txt#part-{part}" for name in "abc" for part in range(3)]
+    assert not checkpoint.load()
+
+
+def test_resume_retries_file_failed_midway(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for name in ("a", "b", "c", "d"):
+        (data_dir / f"{name}.txt").write_text("0123456789abcde\n" * 3)
+    config = {
+        "project": "test",
+        "scraping_cache": {"provider": "FSCache", "base_dir": str(tmp_path / "cache")},
+    }
+    dataset_config = {
+        "id": "dataset",
+        "batch_size": 4,
+        "reader": {
+            "provider": "StreamingTXTFileReader",
+            "base_dir": str(data_dir),
+            "glob": "*.txt",
+            "section_size": 16,
+        },
+    }
+    processed_files = []
+    failures = ["b.txt"]
+    process_file_documents = StreamingTXTFileReader._process_file_documents
+
+    def failing_process_file_documents(reader, path):
+        processed_files.append(path.name)
+        documents = process_file_documents(reader, path)
+        if path.name in failures:
+            # La première lecture de b.txt échoue après sa première section
+            failures.remove(path.name)
+            yield next(documents)
+            raise OSError("lecture interrompue")
+        yield from documents
+
+    monkeypatch.setattr(
+        StreamingTXTFileReader,
+        "_process_file_documents",
+        failing_process_file_documents,
+    )
+
+    # Lots : a.txt + b.txt#part-0, c.txt + d.txt#part-0, puis interruption
+    indexation_wrapper = IngestionWrapper(config)
+    generate_cache = indexation_wrapper._generate_cache
+    calls = []
+
+    def interrupted_generate_cache(dataset_name, documents, cache=None):
+        calls.append(len(documents))
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        return generate_cache(dataset_name, documents, cache)
+
+    monkeypatch.setattr(
+        indexation_wrapper, "_generate_cache", interrupted_generate_cache
+    )
+    with pytest.raises(KeyboardInterrupt):
+        indexation_wrapper._generate_dataset_cache(dataset_config)
+
+    checkpoint = IngestionCheckpoint.from_config(config, "dataset", "cache")
+    assert checkpoint.load()
+    assert checkpoint.completed_sources == {"a.txt", "c.txt"}
+    assert checkpoint.failed == {"b.txt"}
+
+    # b.txt, en échec au milieu du fichier, est relu à la reprise
+    processed_files.clear()
+    indexation_wrapper = IngestionWrapper(config)
+    assert indexation_wrapper._generate_dataset_cache(dataset_config, resume=True)
+    assert processed_files == ["b.txt", "d.txt"]
+
+    cache = CacheFactory.create_cache(config["scraping_cache"])
+    doc_ids = sorted(doc.doc_id for doc in cache.load_data("dataset"))
+    assert doc_ids == [
+        f"{name}.txt#part-{part}" for name in "abcd" for part in range(3)
+    ]
@@ -1,5 +1,19 @@
+import os
+import time
+
+import pytest
+from llama_index.core import Document
+from llama_index.core.embeddings import MockEmbedding
+from llama_index.core.storage.docstore import SimpleDocumentStore
+from llama_index.core.vector_stores import SimpleVectorStore
+
 from eurelis_llmatoolkit.llamaindex.ingestion_wrapper import IngestionWrapper
 from eurelis_llmatoolkit.llamaindex.config_loader import ConfigLoader
+from eurelis_llmatoolkit.llamaindex.factories.cache_factory import CacheFactory
+from eurelis_llmatoolkit.llamaindex.ingestion_checkpoint import IngestionCheckpoint
+from eurelis_llmatoolkit.llamaindex.readers.abstract_reader_adapter import (
+    LoadDataError,
+)
 
 
 def test_simple_init():
@@ -19,3 +33,286 @@ def test_run_simple_ingestion():
 
     indexation_wrapper = IngestionWrapper(config)
     indexation_wrapper.run()
+
+
+def test_filter_unchanged_documents():
+    indexation_wrapper = IngestionWrapper({"project": "test"})
+    unchanged = Document(text="unchanged", doc_id="a")
+    changed = Document(text="changed", doc_id="b")
+    new = Document(text="new", doc_id="c")
+    stored_hashes = {"a": unchanged.hash, "b": "old hash"}
+    counts = {"skipped": 0, "changed": 0, "new": 0}
+
+    documents = indexation_wrapper._filter_unchanged_documents(
+        [unchanged, changed, new], stored_hashes, counts
+    )
+
+    assert documents == [changed, new]
+    assert counts == {"skipped": 1, "changed": 1, "new": 1}
+    assert indexation_wrapper._filter_unchanged_documents([unchanged], None) == [
+        unchanged
+    ]
+
+
+class _RecordingSource:
+    def __init__(self):
+        self.committed = []
+
+    def commit_docs(self, doc_ids):
+        self.committed.append(list(doc_ids))
+
+    def get_unsuccessful_docs(self):
+        return []
+
+
+def test_batches_are_committed_once_processed():
+    indexation_wrapper = IngestionWrapper({"project": "test"})
+    source = _RecordingSource()
+    documents = [Document(text=str(i), doc_id=str(i)) for i in range(3)]
+
+    batches = indexation_wrapper._iter_checkpointed_batches(
+        iter(documents), 2, source, None
+    )
+    assert next(batches) == documents[:2]
+    # Le lot n'est confirmé qu'une fois traité (reprise du générateur)
+    assert source.committed == []
+    assert next(batches) == documents[2:]
+    assert source.committed == [["0", "1"]]
+    assert list(batches) == []
+    assert source.committed == [["0", "1"], ["2"]]
+
+
+class _RecordingPipeline:
+    def __init__(self):
+        self.runs = []
+
+    def run(self, documents, show_progress=False):
+        self.runs.append([document.doc_id for document in documents])
+
+
+def test_run_pipeline_in_batches():
+    indexation_wrapper = IngestionWrapper({"project": "test"})
+    pipeline = _RecordingPipeline()
+    source = _RecordingSource()
+    documents = [Document(text=str(i), doc_id=str(i)) for i in range(5)]
+    counts = {"skipped": 0, "changed": 0, "new": 0}
+
+    doc_ids = indexation_wrapper._run_pipeline_in_batches(
+        pipeline,
+        iter(documents),
+        2,
+        source,
+        stored_hashes={"0": documents[0].hash},
+        counts=counts,
+    )
+
+    assert doc_ids == ["0", "1", "2", "3", "4"]
+    assert pipeline.runs == [["1"], ["2", "3"], ["4"]]
+    assert source.committed == [["0", "1"], ["2", "3"], ["4"]]
+    assert counts == {"skipped": 1, "changed": 0, "new": 4}
+
+
+def test_generate_dataset_cache_aborts_on_load_error(tmp_path, monkeypatch):
+    config = {
+        "project": "test",
+        "scraping_cache": {"provider": "FSCache", "base_dir": str(tmp_path)},
+    }
+    indexation_wrapper = IngestionWrapper(config)
+    source = _RecordingSource()
+
+    def failing_documents():
+        for i in range(3):
+            yield Document(text=str(i), doc_id=f"https://www.example.com/{i}")
+        raise LoadDataError("Failed to fetch sitemap content")
+
+    monkeypatch.setattr(
+        indexation_wrapper,
+        "_lazy_load_documents",
+        lambda *args, **kwargs: (failing_documents(), source),
+    )
+
+    assert not indexation_wrapper._generate_dataset_cache(
+        {"id": "dataset", "batch_size": 2}
+    )
+    # Le premier lot est en cache et confirmé, le checkpoint permet la reprise
+    done = ["https://www.example.com/0", "https://www.example.com/1"]
+    assert source.committed == [done]
+    checkpoint = IngestionCheckpoint.from_config(config, "dataset", "cache")
+    assert checkpoint.load()
+    assert checkpoint.completed == set(done)
+    cache = CacheFactory.create_cache(config["scraping_cache"])
+    assert sorted(doc.doc_id for doc in cache.load_data("dataset")) == done
+
+
+def test_unchanged_documents_do_not_expire(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for name in ("a", "b"):
+        (data_dir / f"{name}.txt").write_text(f"contenu {name}")
+    config = {
+        "project": "test",
+        "scraping_cache": {
+            "provider": "FSCache",
+            "base_dir": str(tmp_path / "cache"),
+            "ttl_days": 1,
+        },
+    }
+    dataset_config = {
+        "id": "dataset",
+        "reader": {
+            "provider": "TXTFileReader",
+            "base_dir": str(data_dir),
+            "glob": "*.txt",
+            "manifest_path": str(tmp_path / "manifest.json"),
+        },
+    }
+    indexation_wrapper = IngestionWrapper(config)
+    assert indexation_wrapper._generate_dataset_cache(dataset_config, prune=True)
+
+    # Documents en cache depuis deux jours ; seul a.txt est modifié à la source
+    expired = time.time() - 2 * 24 * 3600
+    for path in (tmp_path / "cache" / "dataset").rglob("*.json"):
+        os.utime(path, (expired, expired))
+    (data_dir / "a.txt").write_text("contenu a v2")
+    assert indexation_wrapper._generate_dataset_cache(dataset_config, prune=True)
+
+    # b.txt, inchangé et non relu par le reader, n'est ni expiré ni supprimé
+    cache = CacheFactory.create_cache(config["scraping_cache"])
+    assert {doc.doc_id: doc.text for doc in cache.load_data("dataset")} == {
+        "a.txt": "contenu a v2",
+        "b.txt": "contenu b",
+    }
+
+
+def test_single_crawl_fills_cache_and_ingests(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for name in "abcd":
+        (data_dir / f"{name}.txt").write_text(f"contenu {name}")
+    config = {
+        "project": "test",
+        "scraping_cache": {
+            "provider": "FSCache",
+            "base_dir": str(tmp_path / "cache"),
+            "ttl_days": 1,
+        },
+    }
+    dataset_config = {
+        "id": "dataset",
+        "batch_size": 2,
+        "reader": {
+            "provider": "TXTFileReader",
+            "base_dir": str(data_dir),
+            "glob": "*.txt",
+            "manifest_path": str(tmp_path / "manifest.json"),
+        },
+    }
+    indexation_wrapper = IngestionWrapper(config)
+    indexation_wrapper._vector_store = SimpleVectorStore()
+    document_store = indexation_wrapper._document_store = SimpleDocumentStore()
+    monkeypatch.setattr(
+        indexation_wrapper,
+        "_get_transformations",
+        lambda dataset_config: [MockEmbedding(embed_dim=2)],
+    )
+
+    def cached_texts():
+        cache = CacheFactory.create_cache(config["scraping_cache"])
+        return {doc.doc_id: doc.text for doc in cache.load_data("dataset")}
+
+    # Interruption pendant l'ingestion du deuxième lot, déjà écrit dans le cache
+    filter_unchanged_documents = indexation_wrapper._filter_unchanged_documents
+    calls = []
+
+    def interrupted_filter(documents, stored_hashes, counts=None):
+        calls.append(documents)
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        return filter_unchanged_documents(documents, stored_hashes, counts)
+
+    monkeypatch.setattr(
+        indexation_wrapper, "_filter_unchanged_documents", interrupted_filter
+    )
+    with pytest.raises(KeyboardInterrupt):
+        indexation_wrapper._ingest_dataset(dataset_config, write_cache=True)
+
+    checkpoint = IngestionCheckpoint.from_config(config, "dataset", "ingest")
+    assert checkpoint.load()
+    assert checkpoint.completed == {"a.txt", "b.txt"}
+    assert sorted(document_store.docs) == ["a.txt", "b.txt"]
+    assert sorted(cached_texts()) == ["a.txt", "b.txt", "c.txt", "d.txt"]
+
+    # La reprise ingère le deuxième lot, inchangé dans le cache
+    monkeypatch.setattr(
+        indexation_wrapper, "_filter_unchanged_documents", filter_unchanged_documents
+    )
+    indexation_wrapper._ingest_dataset(dataset_config, resume=True, write_cache=True)
+    assert sorted(document_store.docs) == ["a.txt", "b.txt", "c.txt", "d.txt"]
+    assert not checkpoint.load()
+
+    # Crawl suivant : a.txt modifié, d.txt supprimé, b.txt et c.txt inchangés et
+    # non relus alors que leurs fichiers de cache ont dépassé le TTL
+    expired = time.time() - 2 * 24 * 3600
+    for name in ("b", "c"):
+        os.utime(tmp_path / "cache" / "dataset" / f"{name}.json", (expired, expired))
+    (data_dir / "a.txt").write_text("contenu a v2")
+    (data_dir / "d.txt").unlink()
+    indexation_wrapper._ingest_dataset(dataset_config, delete=True, write_cache=True)
+
+    assert sorted(document_store.docs) == ["a.txt", "b.txt", "c.txt"]
+    assert cached_texts() == {
+        "a.txt": "contenu a v2",
+        "b.txt": "contenu b",
+        "c.txt": "contenu c",
+    }
+
+
+def test_document_hashes_of_equal_documents():
+    indexation_wrapper = IngestionWrapper({"project": "test"})
+    document_store = indexation_wrapper._document_store = SimpleDocumentStore()
+    metadata = {"namespace": "test/dataset"}
+    # Deux pages au contenu identique (ex: même page sous deux URLs)
+    documents = [
+        Document(text="identique", doc_id=doc_id, metadata=metadata)
+        for doc_id in ("https://www.example.com/a", "https://www.example.com/b")
+    ]
+    document_store.add_documents(documents)
+    document_store.set_document_hashes({doc.doc_id: doc.hash for doc in documents})
+
+    stored_documents = indexation_wrapper._get_documents_from_document_store("dataset")
+    stored_hashes = indexation_wrapper._get_document_hashes(stored_documents)
+
+    assert stored_hashes == {doc.doc_id: doc.hash for doc in documents}
+    assert (
+        indexation_wrapper._filter_unchanged_documents(documents, stored_hashes) == []
+    )
+
+
+def test_ingest_without_document_store(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for name in "ab":
+        (data_dir / f"{name}.txt").write_text(f"contenu {name}")
+    dataset_config = {
+        "id": "dataset",
+        "reader": {
+            "provider": "TXTFileReader",
+            "base_dir": str(data_dir),
+            "glob": "*.txt",
+        },
+    }
+    # Configuration sans documentstore : seul le vector store est alimenté
+    indexation_wrapper = IngestionWrapper({"project": "test"})
+    vector_store = indexation_wrapper._vector_store = SimpleVectorStore()
+    monkeypatch.setattr(
+        indexation_wrapper,
+        "_get_transformations",
+        lambda dataset_config: [MockEmbedding(embed_dim=2)],
+    )
+
+    assert indexation_wrapper._get_documents_from_document_store("dataset") == {}
+    assert indexation_wrapper._get_document_hashes({}) is None
+
+    indexation_wrapper._ingest_dataset(dataset_config)
+
+    assert len(vector_store.data.embedding_dict) == 2